@@ -0,0 +1,276 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from algorithm.mdp.tabular import ACTIONS, ACTION_WALLS, CellStates, TabularMDP
+from maze.batch import MazeBatch
+from maze.dead_ends import fill_dead_ends
+from maze.maze import Maze
+from maze.walls import steps
+from utils.types import CoordinateType
+from utils.utils import get_path_from_policy
+
+# One parameter setting: (gamma, move_cost, goal_reward).
+Setting = Tuple[float, float, float]
+
+
+class BatchedVI(CellStates):
+    """
+    Value iteration for many parameter settings of one maze at once.
+
+    The maze's TabularMDP is compiled once with move cost 0 and goal reward
+    1, so its reward array just marks the moves that enter the goal, and
+    every setting's rewards are move_cost + (goal_reward - move_cost) * that
+    mark. Values live in one (P x states) matrix, and a sweep backs up all
+    settings still running with a few array operations per action. Each
+    setting stops as soon as its own largest change drops below epsilon,
+    and finished rows leave the working matrix so they cost nothing more.
+    Greedy actions are only worked out for the sweep a setting finishes in.
+
+    Per setting, the values, actions and sweep counts are those of
+    ``VI_MDP.value_iteration(mode="vectorized")`` with the same parameters.
+    """
+
+    def __init__(
+        self, maze: Maze, settings: Sequence[Setting], prune_dead_ends: bool = False
+    ) -> None:
+        """
+        Parameters:
+        - maze: the maze, solved towards maze.goal.
+        - settings: (gamma, move_cost, goal_reward) per setting, e.g. every
+          combination from itertools.product(gammas, move_costs, goal_rewards).
+        - prune_dead_ends: only back up live cells left by dead-end filling,
+          as VI_MDP does.
+        """
+        super().__init__(maze.height, maze.width)
+        self.maze: Maze = maze
+        self.settings: List[Setting] = [tuple(setting) for setting in settings]
+        params = np.array(self.settings, dtype=float).reshape(-1, 3)
+        self.gamma, self.move_cost, self.goal_reward = params[:, 0], params[:, 1], params[:, 2]
+        self.live: Optional[bytearray] = fill_dead_ends(maze) if prune_dead_ends else None
+        self.model = TabularMDP(maze, maze.goal, 0.0, 1.0, self.live)
+
+        count, size = len(self.settings), self.model.size
+        self.values = np.zeros((count, size))
+        self.actions = np.full((count, size), -1, dtype=np.int64)
+        self.iterations = np.zeros(count, dtype=np.int64)  # sweeps per setting
+        self.delta = np.zeros(count)  # largest change in each setting's last sweep
+
+    def value_iteration(self, epsilon: float = 0.001, max_iter: int = 1000) -> None:
+        """Run every setting until its largest value change is below epsilon, or max_iter sweeps."""
+        model = self.model
+        size = model.size
+        updatable = (model.has_action & ~model.terminal)[:, None]
+        # Disallowed moves lead to an extra row of -inf values, so a sweep
+        # needs no separate penalty pass. fmax skips the NaN that gamma = 0
+        # makes of them.
+        next_state = [np.where(model.valid[:, a], model.next_state[:, a], size) for a in range(len(ACTIONS))]
+        entering = [np.nonzero(model.reward[:, a] > 0)[0] for a in range(len(ACTIONS))]
+
+        # Working copies of the settings still running, states x settings so
+        # that gathering successor values copies whole rows; column j is
+        # setting running[j].
+        running = np.arange(len(self.settings))
+        values = np.vstack([self.values.T, np.full((1, len(running)), -np.inf)])
+        values[model.goal] = 0.0
+        gamma = self.gamma[None, :]
+        move_cost = self.move_cost[None, :]
+        goal_bonus = self.goal_reward - self.move_cost
+
+        sweeps = 0
+        while running.size and sweeps < max_iter:
+            # max_a(gamma * V(s') + goal bonus) + move_cost, as the move cost is the same for every action.
+            best = np.full((size, running.size), -np.inf)
+            for a in range(len(ACTIONS)):
+                q = values[next_state[a]]
+                with np.errstate(invalid="ignore"):
+                    q *= gamma
+                q[entering[a]] += goal_bonus
+                np.fmax(best, q, out=best)
+            best += move_cost
+            new_values = values.copy()
+            np.copyto(new_values[:size], best, where=updatable)
+            new_values[model.goal] = 0.0
+            # The goal is the only terminal state and stays 0, so it adds no change.
+            delta = np.abs(new_values[:size] - values[:size]).max(axis=0, initial=0.0)
+            sweeps += 1
+
+            done = (delta < epsilon) | (sweeps >= max_iter)
+            if done.any():
+                finished = running[done]
+                # The greedy actions of this sweep, i.e. with respect to the values before it.
+                self.actions[finished] = self._greedy_actions(values[:size, done].T, finished)
+                self.values[finished] = new_values[:size, done].T
+                self.iterations[finished] = sweeps
+                self.delta[finished] = delta[done]
+                keep = ~done
+                running, new_values = running[keep], new_values[:, keep]
+                gamma, move_cost, goal_bonus = gamma[:, keep], move_cost[:, keep], goal_bonus[keep]
+            values = new_values
+
+    def _greedy_actions(self, values: np.ndarray, settings: np.ndarray) -> np.ndarray:
+        """First best action of every state for the given settings' rows of values, -1 where none."""
+        model = self.model
+        into_goal = model.reward > 0
+        actions = np.empty(values.shape, dtype=np.int64)
+        for row, setting in enumerate(settings):
+            reward = np.where(into_goal, self.goal_reward[setting], self.move_cost[setting])
+            q = reward + self.gamma[setting] * values[row][model.next_state] + model.penalty
+            actions[row] = q.argmax(axis=1)
+        actions[:, ~(model.has_action & ~model.terminal)] = -1
+        return actions
+
+    def get_policy(self, index: int) -> Dict[CoordinateType, Optional[CoordinateType]]:
+        """{(r, c): action} policy of one setting, as VI_MDP.get_policy returns it."""
+        return self.policy_to_dict(self.actions[index])
+
+    def get_value_function(self, index: int) -> Dict[CoordinateType, float]:
+        """{(r, c): value} of one setting."""
+        return self.values_to_dict(self.values[index])
+
+    def get_path(self, index: int) -> List[CoordinateType]:
+        """Path from maze.start following one setting's policy."""
+        live_states = self.model.size if self.live is None else sum(self.live)
+        return get_path_from_policy(self.get_policy(index), self.maze.start, self.maze.goal, live_states)
+
+
+class MazeBatchVI(CellStates):
+    """
+    Value iteration for every maze of a MazeBatch at once, with one
+    parameter setting.
+
+    Values live in one (K x states) matrix and each sweep backs up all mazes
+    still running with a few array operations per action, instead of one
+    TabularMDP and one sweep loop per maze. Each maze stops as soon as its own
+    largest change drops below epsilon, and finished rows leave the working
+    matrix. Per maze, the values, actions and sweep counts are those of
+    ``VI_MDP.value_iteration(mode="vectorized")`` with the same parameters.
+    """
+
+    def __init__(
+        self,
+        batch: MazeBatch,
+        gamma: float = 0.9,
+        move_cost: float = -1,
+        goal_reward: float = 10,
+        prune_dead_ends: bool = False,
+    ) -> None:
+        """
+        Parameters:
+        - batch: the mazes, each solved towards its own goal.
+        - gamma, move_cost, goal_reward: as for VI_MDP, shared by all mazes.
+        - prune_dead_ends: only back up live cells left by dead-end filling,
+          as VI_MDP does.
+        """
+        super().__init__(batch.height, batch.width)
+        self.batch: MazeBatch = batch
+        self.gamma: float = gamma
+        self.move_cost: float = move_cost
+        self.goal_reward: float = goal_reward
+        count, size = len(batch), batch.width * batch.height
+
+        # next_state[a] is each state's successor under action a, or the
+        # index ``size`` of a -inf sentinel column when the move is not allowed.
+        walls = batch.walls.reshape(count, size)
+        cells = np.arange(size)
+        step = steps(batch.width)
+        self.live: Optional[np.ndarray] = None
+        if prune_dead_ends:
+            filled = [np.frombuffer(fill_dead_ends(maze), dtype=np.uint8) for maze in batch.mazes]
+            self.live = np.array(filled) > 0
+        self.next_state = []
+        for wall in ACTION_WALLS:
+            allowed = (walls & wall) == 0
+            target = np.where(allowed, cells + step[wall], size)
+            if self.live is not None:
+                live = np.hstack([self.live, np.zeros((count, 1), dtype=bool)])
+                allowed &= self.live & np.take_along_axis(live, target, axis=1)
+                target = np.where(allowed, target, size)
+            self.next_state.append(target)
+        self.terminal = np.zeros((count, size), dtype=bool)
+        self.terminal[np.arange(count), batch.goals] = True
+        self.updatable = (np.stack(self.next_state) < size).any(axis=0) & ~self.terminal
+
+        self.values = np.zeros((count, size))
+        self.actions = np.full((count, size), -1, dtype=np.int64)
+        self.iterations = np.zeros(count, dtype=np.int64)  # sweeps per maze
+        self.delta = np.zeros(count)  # largest change in each maze's last sweep
+
+    def value_iteration(self, epsilon: float = 0.001, max_iter: int = 1000) -> None:
+        """Run every maze until its largest value change is below epsilon, or max_iter sweeps."""
+        count, size = self.values.shape
+        goals = self.batch.goals
+        running = np.arange(count)
+        values = np.hstack([self.values, np.full((count, 1), -np.inf)])
+        values[running, goals] = 0.0
+        entering = [target == goals[:, None] for target in self.next_state]
+        updatable = self.updatable
+        # Successors as indices into the flattened working values.
+        gather = [target + (size + 1) * running[:, None] for target in self.next_state]
+
+        sweeps = 0
+        while running.size and sweeps < max_iter:
+            best = np.full((running.size, size), -np.inf)
+            for a in range(len(ACTIONS)):
+                q = values.ravel()[gather[a]]
+                with np.errstate(invalid="ignore"):
+                    q *= self.gamma
+                q += self.move_cost
+                # The goal's value is 0, so entering it is worth the goal reward alone.
+                q[entering[a]] = self.goal_reward
+                np.fmax(best, q, out=best)
+            new_values = values.copy()
+            np.copyto(new_values[:, :size], best, where=updatable)
+            new_values[np.arange(running.size), goals] = 0.0
+            delta = np.abs(new_values[:, :size] - values[:, :size]).max(axis=1, initial=0.0)
+            sweeps += 1
+
+            done = (delta < epsilon) | (sweeps >= max_iter)
+            if done.any():
+                finished = running[done]
+                # The greedy actions of this sweep, i.e. with respect to the values before it.
+                self.actions[finished] = self._greedy_actions(values[done], finished)
+                self.values[finished] = new_values[done, :size]
+                self.iterations[finished] = sweeps
+                self.delta[finished] = delta[done]
+                keep = ~done
+                running, new_values, goals, updatable = (
+                    running[keep], new_values[keep], goals[keep], updatable[keep]
+                )
+                rows = (size + 1) * np.arange(running.size)[:, None]
+                gather = [self.next_state[a][running] + rows for a in range(len(ACTIONS))]
+                entering = [mask[keep] for mask in entering]
+            values = new_values
+
+    def _greedy_actions(self, values: np.ndarray, mazes: np.ndarray) -> np.ndarray:
+        """First best action of every state for the given mazes' rows of values, -1 where none."""
+        size = self.values.shape[1]
+        goals = self.batch.goals[mazes][:, None]
+        q = []
+        for target in self.next_state:
+            target = target[mazes]
+            reward = np.where(target == goals, self.goal_reward, self.move_cost)
+            with np.errstate(invalid="ignore"):
+                value = reward + self.gamma * np.take_along_axis(values, target, axis=1)
+            q.append(np.where(target < size, value, -np.inf))
+        actions = np.stack(q, axis=2).argmax(axis=2)
+        actions[~self.updatable[mazes]] = -1
+        return actions
+
+    def backups(self) -> np.ndarray:
+        """(K,) Bellman backups per maze, counted as VI_MDP's vectorized mode does."""
+        return self.iterations * self.updatable.sum(axis=1)
+
+    def get_policy(self, index: int) -> Dict[CoordinateType, Optional[CoordinateType]]:
+        """{(r, c): action} policy of one maze, as VI_MDP.get_policy returns it."""
+        return self.policy_to_dict(self.actions[index])
+
+    def get_value_function(self, index: int) -> Dict[CoordinateType, float]:
+        """{(r, c): value} of one maze."""
+        return self.values_to_dict(self.values[index])
+
+    def get_path(self, index: int) -> List[CoordinateType]:
+        """Path from one maze's start following its policy."""
+        maze = self.batch.mazes[index]
+        live_states = self.values.shape[1] if self.live is None else int(self.live[index].sum())
+        return get_path_from_policy(self.get_policy(index), maze.start, maze.goal, live_states)
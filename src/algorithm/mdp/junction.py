@@ -0,0 +1,191 @@
+from typing import Tuple
+
+import numpy as np
+
+from algorithm.mdp.tabular import CellStates
+from maze.maze import Maze
+
+# ACTIONS index of the first move out of each junction graph slot (up, down, left, right).
+SLOT_ACTIONS = np.array([3, 2, 1, 0])
+
+
+class JunctionMDP(CellStates):
+    """
+    Semi-MDP over the junction graph of a maze (see maze/junction_graph.py).
+
+    States are graph nodes and each action follows one corridor to its far
+    end. A corridor of k moves into node v pays the per-move rewards
+    discounted along the way,
+    move_cost * (1 + gamma + ... + gamma^(k-2)) + gamma^(k-1) * r,
+    with r the goal reward if v is the goal and the move cost otherwise, and
+    discounts v's value by gamma^k. A corridor cannot be left half-way, so
+    the node values only match the cell MDP when a shortest route to the goal
+    is optimal (see ``shortest_route_optimal``): such a route never turns
+    round inside a corridor. ``expand`` then gives every corridor cell the
+    better of heading to either end of its corridor. With a low goal reward
+    the cell MDP would rather pace back and forth, which a corridor action
+    cannot, so the solvers fall back to cell iteration there.
+
+    Arrays are indexed by node, and by arc for the per-action data: an arc is
+    one direction of an edge, taken from its source node.
+    """
+
+    def __init__(self, maze: Maze, move_cost: float, goal_reward: float, gamma: float) -> None:
+        super().__init__(maze.height, maze.width)
+        graph = maze.junction_graph()
+        self.graph = graph
+        self.width: int = maze.width
+        self.size: int = maze.width * maze.height
+        self.move_cost: float = move_cost
+        self.goal_reward: float = goal_reward
+        self.gamma: float = gamma
+        self.node_cells = np.array(graph.cells, dtype=np.int64)
+        self.goal: int = graph.goal
+
+        neighbour = np.array(graph.neighbour, dtype=np.int64)
+        slots = np.nonzero(neighbour >= 0)[0]
+        slots = slots[slots // 4 != graph.goal]  # the goal is terminal
+        # Within a node, arcs follow the ACTIONS order so ties break like the cell solvers.
+        slots = slots[np.lexsort((SLOT_ACTIONS[slots % 4], slots // 4))]
+        lengths = np.array(graph.length, dtype=np.int64)[slots]
+
+        self.arc_source = slots // 4
+        self.arc_action = SLOT_ACTIONS[slots % 4]
+        self.arc_target = neighbour[slots]
+        self.arc_reward = self.corridor_reward(lengths, self.arc_target == graph.goal)
+        self.arc_discount = float(gamma) ** lengths
+        # Nodes with at least one arc, and where each one's arcs start.
+        self.movers, self.arc_start = np.unique(self.arc_source, return_index=True)
+        self.arc_mover = np.repeat(
+            np.arange(self.movers.size), np.diff(np.append(self.arc_start, slots.size))
+        )
+
+    def corridor_reward(self, steps: np.ndarray, into_goal: np.ndarray) -> np.ndarray:
+        """Discounted reward of walking ``steps`` moves whose last move enters the goal where into_goal."""
+        gamma = float(self.gamma)
+        if gamma == 1.0:
+            leading = self.move_cost * (steps - 1)
+        else:
+            leading = self.move_cost * (1.0 - gamma ** (steps - 1)) / (1.0 - gamma)
+        return leading + gamma ** (steps - 1) * np.where(into_goal, self.goal_reward, self.move_cost)
+
+    def greedy(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        One synchronous backup over the nodes.
+        Returns the backed-up node values and each node's chosen arc, -1 for
+        the goal and nodes without arcs, which keep their value.
+        """
+        new_values = values.copy()
+        new_values[self.goal] = 0.0
+        choice = np.full(len(values), -1, dtype=np.int64)
+        if self.movers.size == 0:
+            return new_values, choice
+        q = self.arc_reward + self.arc_discount * values[self.arc_target]
+        best = np.maximum.reduceat(q, self.arc_start)
+        arcs = np.arange(q.size)
+        first_best = np.minimum.reduceat(
+            np.where(q == best[self.arc_mover], arcs, q.size), self.arc_start
+        )
+        new_values[self.movers] = best
+        choice[self.movers] = first_best
+        return new_values, choice
+
+    def value_iteration(
+        self, values: np.ndarray, epsilon: float, max_iter: int
+    ) -> Tuple[np.ndarray, np.ndarray, int, float]:
+        """Synchronous value iteration on the nodes. Returns (values, choice, sweeps, delta)."""
+        values = values.astype(float)
+        values[self.goal] = 0.0
+        choice = np.full(len(values), -1, dtype=np.int64)
+        iterations = 0
+        delta = 0.0
+        while iterations < max_iter:
+            new_values, choice = self.greedy(values)
+            delta = float(np.abs(new_values - values).max()) if values.size else 0.0
+            values = new_values
+            iterations += 1
+            if delta < epsilon:
+                break
+        return values, choice, iterations, delta
+
+    def policy_iteration(
+        self, values: np.ndarray, threshold: float
+    ) -> Tuple[np.ndarray, np.ndarray, int, int]:
+        """
+        Policy iteration on the nodes, starting from the policy greedy in values.
+        Each evaluation sweeps until the largest change is below threshold, and
+        improvement keeps a node's arc unless another is strictly better.
+        Returns (values, choice, rounds, evaluation sweeps).
+        """
+        values = values.astype(float)
+        values[self.goal] = 0.0
+        _, choice = self.greedy(values)
+        movers = self.movers
+        rounds = sweeps = 0
+        while True:
+            rounds += 1
+            arcs = choice[movers]
+            reward, discount, target = self.arc_reward[arcs], self.arc_discount[arcs], self.arc_target[arcs]
+            while movers.size:
+                new_values = reward + discount * values[target]
+                delta = np.abs(new_values - values[movers]).max()
+                values[movers] = new_values
+                sweeps += 1
+                if delta < threshold:
+                    break
+
+            best_values, candidate = self.greedy(values)
+            current = self.arc_reward[arcs] + self.arc_discount[arcs] * values[self.arc_target[arcs]]
+            candidate[movers] = np.where(current >= best_values[movers], arcs, candidate[movers])
+            if np.array_equal(candidate, choice):
+                return values, choice, rounds, sweeps
+            choice = candidate
+
+    def expand(
+        self, node_values: np.ndarray, choice: np.ndarray, cell_values: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-cell values and action indices from a node solution, in the layout
+        of TabularMDP.greedy. Cells on no edge keep their value from cell_values.
+        """
+        values = cell_values.astype(float)
+        actions = np.full(self.size, -1, dtype=np.int64)
+        values[self.node_cells] = node_values
+        chosen = choice >= 0
+        actions[self.node_cells[chosen]] = self.arc_action[choice[chosen]]
+
+        graph = self.graph
+        interior = np.array(graph.corridor_cells, dtype=np.int64)
+        if interior.size == 0:
+            return values, actions
+        offsets = np.array(graph.corridor_offsets, dtype=np.int64)
+        counts = np.diff(offsets)
+        edge = np.repeat(np.arange(counts.size), counts)
+        index = np.arange(interior.size)
+        position = index - offsets[edge] + 1  # moves from the edge's first end
+        length = counts[edge] + 1
+        ends = np.array(graph.edge_ends, dtype=np.int64).reshape(-1, 2)
+        first, second = ends[edge, 0], ends[edge, 1]
+
+        previous_cell = np.where(position == 1, self.node_cells[first], np.roll(interior, 1))
+        next_cell = np.where(position == length - 1, self.node_cells[second], np.roll(interior, -1))
+        to_first = (
+            self.corridor_reward(position, first == self.goal)
+            + float(self.gamma) ** position * node_values[first]
+        )
+        to_second = (
+            self.corridor_reward(length - position, second == self.goal)
+            + float(self.gamma) ** (length - position) * node_values[second]
+        )
+        action_first = self._action(interior, previous_cell)
+        action_second = self._action(interior, next_cell)
+        pick_second = (to_second > to_first) | ((to_second == to_first) & (action_second < action_first))
+        values[interior] = np.where(pick_second, to_second, to_first)
+        actions[interior] = np.where(pick_second, action_second, action_first)
+        return values, actions
+
+    def _action(self, cells: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """ACTIONS index of the move from each cell to its neighbouring target."""
+        dr = targets // self.width - cells // self.width
+        dc = targets % self.width - cells % self.width
+        return np.select([dc == 1, dc == -1, dr == 1], [0, 1, 2], 3)
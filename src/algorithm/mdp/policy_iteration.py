@@ -1,11 +1,19 @@
 from typing import Dict, List, Optional
+from algorithm.mdp.junction import JunctionMDP
+from algorithm.mdp.tabular import TabularMDP, build_model, shortest_route_optimal, warm_start
+from maze.dead_ends import fill_dead_ends
 from maze.maze import Maze
+from maze.cell import TOP, RIGHT, BOTTOM, LEFT
+from utils.stats import MDPStats
 from utils.types import CoordinateType
 
 
 class PI_MDP:
     def __init__(
-        self, maze: Maze, gamma: float = 0.9, move_cost: int = -1, goal_reward=10
+        self, maze: Maze, gamma: float = 0.9, move_cost: int = -1, goal_reward=10,
+        stats: Optional[MDPStats] = None, prune_dead_ends: bool = False,
+        initial_values: Optional[Dict[CoordinateType, float]] = None,
+        initial_policy: Optional[Dict[CoordinateType, Optional[CoordinateType]]] = None,
     ):
         """
         Initialize the MDP for maze solving.
@@ -15,11 +23,21 @@ class PI_MDP:
         - gamma: discount factor for future rewards.
         - move_cost: cost for each move (usually a negative value).
         - goal_reward: reward for reaching the goal state.
+        - stats: optional MDPStats filled in by policy_iteration.
+        - prune_dead_ends: only evaluate and improve live cells left by
+          dead-end filling (see maze/dead_ends.py). Filled cells keep value 0
+          and no action, and moves into them are not offered. Ignored by the
+          "junction" mode.
+        - initial_values, initial_policy: warm start from an earlier solution,
+          e.g. get_value_function() / get_policy() of a solve with other
+          parameters or before a wall edit, or shortest_path_policy(maze).
+          See tabular.warm_start.
         """
         self.maze: Maze = maze
         self.gamma: float = gamma
         self.move_cost: int = move_cost
         self.goal_reward = goal_reward
+        self.stats = stats
 
         self.values: Dict[CoordinateType, float] = {}
         self.policy: Dict[CoordinateType, Optional[CoordinateType]] = {}
@@ -29,7 +47,22 @@ class PI_MDP:
                 self.values[(r, c)] = 0.0
                 self.policy[(r, c)] = None
 
-        self.goal: CoordinateType = (self.maze.height - 1, self.maze.width - 1)
+        self.goal: CoordinateType = self.maze.goal
+        # Live-cell mask from dead-end filling, or None to use every cell.
+        self.live: Optional[bytearray] = fill_dead_ends(maze) if prune_dead_ends else None
+        # States that get updated, in row-major order.
+        self.states: List[CoordinateType] = [
+            state for i, state in enumerate(self.values) if self.live is None or self.live[i]
+        ]
+        if initial_values is not None or initial_policy is not None:
+            warm_start(self, initial_values, initial_policy)
+        self._model: Optional[TabularMDP] = None
+
+    def _get_model(self) -> TabularMDP:
+        """Array form of this MDP, compiled on first use."""
+        if self._model is None:
+            self._model = build_model(self)
+        return self._model
 
     def is_terminal(self, state: tuple[int, int]) -> bool:
         """Check if a state is terminal (goal state)."""
@@ -43,21 +76,24 @@ class PI_MDP:
         """
         actions: List[CoordinateType] = []
         r, c = state
-        cell = self.maze.grid[r][c]
+        cell_walls = self.maze.walls[r * self.maze.width + c]
 
         # Check right movement (column +1)
 
-        if c < self.maze.width - 1 and not cell.walls.get("right", True):
+        if c < self.maze.width - 1 and not cell_walls & RIGHT:
             actions.append((0, 1))
         # Check left movement (column -1)
-        if c > 0 and not cell.walls.get("left", True):
+        if c > 0 and not cell_walls & LEFT:
             actions.append((0, -1))
         # Check down movement (row +1)
-        if r < self.maze.height - 1 and not cell.walls.get("bottom", True):
+        if r < self.maze.height - 1 and not cell_walls & BOTTOM:
             actions.append((1, 0))
         # Check up movement (row -1)
-        if r > 0 and not cell.walls.get("top", True):
+        if r > 0 and not cell_walls & TOP:
             actions.append((-1, 0))
+        if self.live is not None:
+            width = self.maze.width
+            actions = [(dr, dc) for dr, dc in actions if self.live[(r + dr) * width + c + dc]]
         return actions
 
     def get_next_state(
@@ -70,13 +106,46 @@ class PI_MDP:
         dr, dc = action
         return (r + dr, c + dc)
 
-    def policy_evaluation(self, threshold: float = 1e-4) -> None:
-        """Evaluates the current policy until values converge."""
+    def policy_evaluation(self, threshold: float = 1e-4, method: str = "direct") -> None:
+        """
+        Evaluates the current policy.
+
+        Parameters:
+        - threshold: convergence threshold for the "iterative" method.
+        - method: "direct" computes the exact values of the policy in one pass
+          over its functional graph, solving policy cycles in closed form.
+          "iterative" sweeps all states until the largest change is below threshold.
+        """
+        if method not in ("direct", "iterative"):
+            raise ValueError(f"Unknown policy evaluation method: {method}")
+        stats = self.stats
+        if stats is not None:
+            stats.evaluation_rounds += 1
+            # Each pass backs up every non-terminal state that has an action.
+            movers = sum(
+                1 for state, action in self.policy.items()
+                if action is not None and not self.is_terminal(state)
+            )
+
+        if method == "direct":
+            model = self._get_model()
+            values = model.evaluate_policy(
+                model.policy_from_dict(self.policy),
+                self.gamma,
+                model.values_from_dict(self.values),
+            )
+            self.values = model.values_to_dict(values)
+            if stats is not None:
+                stats.sweeps += 1
+                stats.backups += movers
+                stats.final_delta = 0.0
+            return
+
         while True:
             delta: float = 0  # Track max change in value function
-            new_values = self.values.copy()
+            new_values = {}
 
-            for state in self.values:
+            for state in self.states:
                 if self.is_terminal(state):
                     continue  # Terminal states remain unchanged
 
@@ -94,7 +163,11 @@ class PI_MDP:
 
                 delta = max(delta, abs(new_values[state] - self.values[state]))
 
-            self.values = new_values  # Update state values
+            self.values.update(new_values)  # Update state values
+            if stats is not None:
+                stats.sweeps += 1
+                stats.backups += movers
+                stats.final_delta = float(delta)
 
             if delta < threshold:
                 break  # Stop when values converge
@@ -103,7 +176,7 @@ class PI_MDP:
         """Improves the policy based on updated values."""
         policy_stable = True
 
-        for state in self.values:
+        for state in self.states:
             if self.is_terminal(state):
                 continue  # Terminal state has no policy to update
 
@@ -126,16 +199,67 @@ class PI_MDP:
             if old_action != best_action:
                 policy_stable = False  # Policy changed, not stable
 
+        if self.stats is not None:
+            self.stats.improvement_rounds += 1
+            self.stats.backups += sum(
+                1 for state, action in self.policy.items()
+                if action is not None and not self.is_terminal(state)
+            )
         return policy_stable
 
 
-    def policy_iteration(self):
-        """Runs the policy iteration algorithm until convergence."""
+    def policy_iteration(self, mode: str = "loop", evaluation: str = "direct"):
+        """
+        Runs the policy iteration algorithm until convergence.
+
+        Parameters:
+        - mode: "loop" alternates evaluation and improvement. "exact" fills values
+          and policy from one traversal rooted at the goal, falling back to
+          "loop" when the rewards make the shortest route non-optimal.
+          "junction" runs policy iteration on the corridor-contracted junction
+          graph of the maze, with iterative evaluation, and expands the result
+          back to every cell. Like "exact" it falls back to "loop" when the
+          shortest route is not optimal.
+        - evaluation: policy evaluation method, "direct" or "iterative".
+        """
+        self._model = None  # recompile in case the maze changed since the last solve
+        if mode == "junction":
+            if shortest_route_optimal(self.move_cost, self.goal_reward, self.gamma):
+                return self._policy_iteration_junction()
+        elif mode == "exact":
+            model = self._get_model()
+            solution = model.solve_exact(self.gamma, model.values_from_dict(self.values))
+            if solution is not None:
+                values, actions = solution
+                self.values = model.values_to_dict(values)
+                self.policy = model.policy_to_dict(actions)
+                return
+        elif mode != "loop":
+            raise ValueError(f"Unknown policy iteration mode: {mode}")
+
         while True:
-            self.policy_evaluation()
+            self.policy_evaluation(method=evaluation)
             if self.policy_improvement():
                 break  # Stop if policy does not change
 
+    def _policy_iteration_junction(self, threshold: float = 1e-4) -> None:
+        """Policy iteration over junction graph nodes (see JunctionMDP)."""
+        model = JunctionMDP(self.maze, self.move_cost, self.goal_reward, self.gamma)
+        cell_values = model.values_from_dict(self.values)
+        node_values, choice, rounds, sweeps = model.policy_iteration(
+            cell_values[model.node_cells], threshold
+        )
+        values, actions = model.expand(node_values, choice, cell_values)
+        self.values = model.values_to_dict(values)
+        self.policy = model.policy_to_dict(actions)
+        if self.stats is not None:
+            movers = int(model.movers.size)
+            self.stats.evaluation_rounds += rounds
+            self.stats.improvement_rounds += rounds
+            self.stats.sweeps += sweeps
+            self.stats.backups += (sweeps + rounds) * movers
+            self.stats.final_delta = 0.0
+
     def get_policy(self):
         """Return the computed policy after value iteration."""
         return self.policy
@@ -0,0 +1,334 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from maze.distance_field import distance_field, policy_from_field
+from maze.maze import Maze
+from maze.cell import TOP, RIGHT, BOTTOM, LEFT
+from utils.types import CoordinateType
+
+# Action order matches get_actions in the MDP solvers: right, left, down, up.
+ACTIONS: List[CoordinateType] = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+ACTION_WALLS: List[int] = [RIGHT, LEFT, BOTTOM, TOP]
+
+
+def shortest_route_optimal(move_cost: float, goal_reward: float, gamma: float) -> bool:
+    """
+    Whether reaching the goal in fewer moves is always worth more, so that
+    every state's best policy follows a shortest route to the goal. With
+    0 < gamma < 1 that needs goal_reward > move_cost / (1 - gamma), the value
+    of never arriving; with gamma == 1 every move must cost something.
+    """
+    if not 0.0 < gamma <= 1.0:
+        return False
+    if gamma < 1.0:
+        return goal_reward > move_cost / (1.0 - gamma)
+    return move_cost < 0.0
+
+
+class CellStates:
+    """
+    Row-major numbering of maze cells as MDP states, with conversions between
+    the solvers' {(r, c): ...} dicts and state-indexed arrays.
+    """
+
+    def __init__(self, height: int, width: int) -> None:
+        self.coordinates: List[CoordinateType] = [
+            (r, c) for r in range(height) for c in range(width)
+        ]
+
+    def values_from_dict(self, values: dict) -> np.ndarray:
+        """Gather a {(r, c): value} dict into a state-indexed array."""
+        return np.array([values[state] for state in self.coordinates], dtype=float)
+
+    def values_to_dict(self, values: np.ndarray) -> dict:
+        """Convert a state-indexed value array back to a {(r, c): value} dict."""
+        return dict(zip(self.coordinates, values.tolist()))
+
+    def policy_to_dict(self, actions: np.ndarray) -> dict:
+        """
+        Convert a state-indexed array of action indices to a {(r, c): action} dict.
+        Negative indices mean no action (terminal or dead-end states).
+        """
+        return {
+            state: ACTIONS[a] if a >= 0 else None
+            for state, a in zip(self.coordinates, actions.tolist())
+        }
+
+    def policy_from_dict(self, policy: dict) -> np.ndarray:
+        """Gather a {(r, c): action} dict into an array of action indices (-1 for None)."""
+        index = {action: a for a, action in enumerate(ACTIONS)}
+        return np.array(
+            [index[policy[state]] if policy[state] is not None else -1 for state in self.coordinates],
+            dtype=np.int64,
+        )
+
+
+class TabularMDP(CellStates):
+    """
+    Array form of the maze MDP, compiled once from the packed wall array.
+
+    States are cells in row-major order. For every state and each of the four
+    actions it stores the next state index, whether the move is allowed and
+    the reward, so a Bellman backup over all states is a few array operations.
+    Disallowed actions point back at their own state and carry a -inf penalty.
+    With a ``live`` mask from dead-end filling, moves into or out of filled
+    cells are disallowed as well.
+    """
+
+    def __init__(
+        self,
+        maze: Maze,
+        goal: CoordinateType,
+        move_cost: float,
+        goal_reward: float,
+        live: Optional[bytearray] = None,
+    ) -> None:
+        height, width = maze.height, maze.width
+        n = height * width
+        walls = np.frombuffer(maze.walls, dtype=np.uint8).reshape(height, width)
+        rows, cols = np.indices((height, width))
+        ids = rows * width + cols
+
+        self.size: int = n
+        self.next_state = np.empty((n, len(ACTIONS)), dtype=np.int64)
+        self.valid = np.zeros((n, len(ACTIONS)), dtype=bool)
+        for a, ((dr, dc), wall) in enumerate(zip(ACTIONS, ACTION_WALLS)):
+            inside = (
+                (rows + dr >= 0) & (rows + dr < height)
+                & (cols + dc >= 0) & (cols + dc < width)
+            )
+            allowed = (inside & ((walls & wall) == 0)).ravel()
+            self.valid[:, a] = allowed
+            self.next_state[:, a] = np.where(allowed, (ids + dr * width + dc).ravel(), ids.ravel())
+        if live is not None:
+            # Dead-end filled cells get no actions and cannot be moved into.
+            is_live = np.frombuffer(live, dtype=np.uint8).astype(bool)
+            self.valid &= is_live[self.next_state] & is_live[:, None]
+            self.next_state = np.where(self.valid, self.next_state, ids.reshape(-1, 1))
+
+        self.maze: Maze = maze
+        self.live: Optional[bytearray] = live
+        self.goal: int = goal[0] * width + goal[1]
+        self.terminal = np.zeros(n, dtype=bool)
+        self.terminal[self.goal] = True
+        self.has_action = self.valid.any(axis=1)
+
+        self.move_cost: float = move_cost
+        self.goal_reward: float = goal_reward
+        self.reward = np.where(self.next_state == self.goal, goal_reward, move_cost).astype(float)
+        self.penalty = np.where(self.valid, 0.0, -np.inf)
+
+        super().__init__(height, width)
+
+    def q_values(self, values: np.ndarray, gamma: float) -> np.ndarray:
+        """Return the (states x actions) array of R + gamma * V(s'), -inf where not allowed."""
+        return self.reward + gamma * values[self.next_state] + self.penalty
+
+    def greedy(self, values: np.ndarray, gamma: float) -> "tuple[np.ndarray, np.ndarray]":
+        """
+        One synchronous Bellman backup.
+        Returns the backed-up values and the greedy action index per state.
+        Terminal states get value 0 and dead ends keep their value; both get action -1.
+        """
+        q = self.q_values(values, gamma)
+        actions = q.argmax(axis=1)
+        best = q[np.arange(self.size), actions]
+        updatable = self.has_action & ~self.terminal
+        new_values = np.where(updatable, best, values)
+        new_values[self.terminal] = 0.0
+        actions = np.where(updatable, actions, -1)
+        return new_values, actions
+
+    def goal_distances(self) -> np.ndarray:
+        """
+        Number of moves from every state to the goal, from the maze's distance
+        field (see maze/distance_field.py). -1 marks states that cannot reach
+        the goal. Dead-end filling never cuts a live cell's shortest route,
+        so filled cells are simply marked -1 as they have no actions.
+        """
+        distance = distance_field(self.maze, [divmod(self.goal, self.maze.width)])[0]
+        distance = distance.ravel().astype(np.int64)
+        if self.live is not None:
+            distance[np.frombuffer(self.live, dtype=np.uint8) == 0] = -1
+        return distance
+
+    def solve_exact(
+        self, gamma: float, values: np.ndarray
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Closed-form optimal values and policy for the deterministic maze MDP.
+
+        Moving costs ``move_cost`` per step and entering the goal pays
+        ``goal_reward``, so reaching the goal in k moves is worth
+        L + gamma^(k-1) * (goal_reward - L) with L = move_cost / (1 - gamma),
+        the value of never arriving. When that is strictly decreasing in k the
+        shortest route is optimal and each state's value only depends on its
+        distance to the goal. Otherwise longer (or endless) walks win and None
+        is returned so the caller can fall back to iteration.
+
+        ``values`` supplies the values kept by states that have no action.
+        Returns (values, action indices) in the same layout as ``greedy``.
+        """
+        move_cost, goal_reward = float(self.move_cost), float(self.goal_reward)
+        if not shortest_route_optimal(move_cost, goal_reward, gamma):
+            return None
+
+        distance = self.goal_distances()
+        reachable = distance > 0
+        stranded = self.has_action & (distance < 0)
+        if gamma == 1.0 and stranded.any():
+            return None  # wandering forever has no finite value
+
+        new_values = values.astype(float)
+        steps = np.maximum(distance - 1, 0)
+        if gamma < 1.0:
+            never = move_cost / (1.0 - gamma)
+            new_values[reachable] = never + gamma ** steps[reachable] * (goal_reward - never)
+            new_values[stranded] = never
+        else:
+            new_values[reachable] = move_cost * steps[reachable] + goal_reward
+        new_values[self.goal] = 0.0
+
+        # Pick the first action (in ACTIONS order) that moves one step closer,
+        # which is the tie-break value iteration converges to as well.
+        closer = self.valid & (distance[self.next_state] == (distance - 1)[:, None])
+        actions = np.full(self.size, -1, dtype=np.int64)
+        actions[reachable] = closer[reachable].argmax(axis=1)
+        actions[stranded] = self.valid[stranded].argmax(axis=1)
+        return new_values, actions
+
+    def evaluate_policy(
+        self, actions: np.ndarray, gamma: float, values: np.ndarray
+    ) -> np.ndarray:
+        """
+        Exact value of a fixed deterministic policy, without sweeping.
+
+        Following the policy, every state has exactly one successor, so the
+        policy is a functional graph. Its roots are the terminal state and
+        states without an action, which keep their value from ``values``.
+        Every other state either drains into a root or into a cycle. Roots are
+        resolved first, each cycle is solved in closed form from the geometric
+        series of its rewards, and values then flow backwards along reversed
+        policy edges: V(s) = R(s, pi(s)) + gamma * V(pi(s)).
+        """
+        n = self.size
+        states = np.arange(n)
+        rooted = (actions < 0) | self.terminal
+        chosen = np.where(rooted, 0, actions)
+        successor = np.where(rooted, -1, self.next_state[states, chosen])
+        reward = self.reward[states, chosen].tolist()
+
+        movers = np.nonzero(~rooted)[0]
+        offsets, children = reverse_adjacency(movers, successor[movers], n)
+        successor = successor.tolist()
+        result = values.astype(float).tolist()
+        done = rooted.tolist()
+
+        def propagate(seeds: List[int]) -> None:
+            stack = list(seeds)
+            while stack:
+                state = stack.pop()
+                for i in range(offsets[state], offsets[state + 1]):
+                    child = children[i]
+                    if not done[child]:
+                        result[child] = reward[child] + gamma * result[state]
+                        done[child] = True
+                        stack.append(child)
+
+        propagate(np.nonzero(rooted)[0].tolist())
+
+        # Whatever is left drains into a cycle, since anything draining into a
+        # solved state was solved by propagate. Walk successors from each
+        # unsolved state until the walk repeats itself to find the cycle.
+        walk_mark = [-1] * n
+        for start in range(n):
+            if done[start]:
+                continue
+            state = start
+            while walk_mark[state] != start:
+                walk_mark[state] = start
+                state = successor[state]
+
+            cycle = [state]
+            node = successor[state]
+            while node != state:
+                cycle.append(node)
+                node = successor[node]
+
+            # V(c0) = sum_i gamma^i r_i + gamma^k V(c0) around a cycle of length k.
+            total, discount = 0.0, 1.0
+            for node in cycle:
+                total += discount * reward[node]
+                discount *= gamma
+            if discount < 1.0:
+                head_value = total / (1.0 - discount)
+            elif total == 0.0:
+                head_value = 0.0
+            else:
+                head_value = total * float("inf")  # undiscounted cycle diverges
+
+            result[cycle[0]] = head_value
+            for node in reversed(cycle[1:]):
+                result[node] = reward[node] + gamma * result[successor[node]]
+            for node in cycle:
+                done[node] = True
+            propagate(cycle)
+
+        return np.array(result, dtype=float)
+
+
+def reverse_adjacency(
+    sources: np.ndarray, targets: np.ndarray, size: int
+) -> Tuple[List[int], List[int]]:
+    """
+    Group edge sources by target.
+    Returns CSR-style (offsets, sources) lists, where the sources pointing at
+    state t are sources[offsets[t]:offsets[t + 1]].
+    """
+    order = np.argsort(targets, kind="stable")
+    offsets = np.searchsorted(targets[order], np.arange(size + 1))
+    return offsets.tolist(), sources[order].tolist()
+
+
+def build_model(mdp) -> TabularMDP:
+    """Compile the TabularMDP for a VI_MDP or PI_MDP instance."""
+    return TabularMDP(mdp.maze, mdp.goal, mdp.move_cost, mdp.goal_reward, mdp.live)
+
+
+def shortest_path_policy(maze: Maze) -> Dict[CoordinateType, CoordinateType]:
+    """
+    Policy moving every cell one step along a shortest route to maze.goal,
+    i.e. the BFS tree rooted at the goal (see maze/distance_field.py). It is
+    optimal whenever the shortest route is, so it makes a strong warm start.
+    """
+    return policy_from_field(distance_field(maze, [maze.goal])[1])
+
+
+def warm_start(
+    mdp,
+    initial_values: Optional[Dict[CoordinateType, float]] = None,
+    initial_policy: Optional[Dict[CoordinateType, Optional[CoordinateType]]] = None,
+) -> None:
+    """
+    Seed a VI_MDP or PI_MDP with a previous solution instead of zeros.
+
+    Only the updated states (mdp.states) are seeded, and only with actions
+    their walls still allow, so a solution from before a wall edit or from
+    another parameter setting can be passed as is. Missing states keep 0.0
+    and no action; the goal keeps value 0. Given only a policy, the values
+    start as that policy's exact values, so value iteration starts from it too.
+    """
+    for state in mdp.states:
+        if mdp.is_terminal(state):
+            continue
+        if initial_values is not None and state in initial_values:
+            mdp.values[state] = float(initial_values[state])
+        if initial_policy is not None and initial_policy.get(state) in mdp.get_actions(state):
+            mdp.policy[state] = initial_policy[state]
+    if initial_policy is not None and initial_values is None:
+        model = build_model(mdp)
+        values = model.evaluate_policy(
+            model.policy_from_dict(mdp.policy), mdp.gamma, model.values_from_dict(mdp.values)
+        )
+        mdp.values = model.values_to_dict(values)
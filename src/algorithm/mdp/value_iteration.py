@@ -1,11 +1,26 @@
-from typing import List
+import heapq
+import math
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from algorithm.mdp.junction import JunctionMDP
+from algorithm.mdp.tabular import (
+    TabularMDP, reverse_adjacency, build_model, shortest_route_optimal, warm_start,
+)
+from maze.dead_ends import fill_dead_ends
 from maze.maze import Maze
+from maze.cell import TOP, RIGHT, BOTTOM, LEFT
+from utils.stats import MDPStats
 from utils.types import CoordinateType
 
 
 class VI_MDP:
     def __init__(
-        self, maze: Maze, gamma: float = 0.9, move_cost: int = -1, goal_reward=10, max_iter = 1000
+        self, maze: Maze, gamma: float = 0.9, move_cost: int = -1, goal_reward=10, max_iter = 1000,
+        stats: Optional[MDPStats] = None, prune_dead_ends: bool = False,
+        initial_values: Optional[Dict[CoordinateType, float]] = None,
+        initial_policy: Optional[Dict[CoordinateType, Optional[CoordinateType]]] = None,
     ):
         """
         Initialize the MDP for maze solving.
@@ -15,12 +30,24 @@ class VI_MDP:
         - gamma: discount factor for future rewards.
         - move_cost: cost for each move (usually a negative value).
         - goal_reward: reward for reaching the goal state.
+        - stats: optional MDPStats filled in by value_iteration.
+        - prune_dead_ends: only back up live cells left by dead-end filling
+          (see maze/dead_ends.py). Filled cells keep value 0 and no action,
+          and moves into them are not offered. Ignored by the "junction" mode.
+        - initial_values, initial_policy: warm start from an earlier solution,
+          e.g. get_value_function() / get_policy() of a solve with other
+          parameters or before a wall edit, or shortest_path_policy(maze).
+          See tabular.warm_start.
         """
         self.maze: Maze = maze
         self.gamma: float = gamma
         self.move_cost: int = move_cost
         self.goal_reward = goal_reward
         self.max_iter = max_iter
+        self.iterations = 0  # sweeps performed by the last value_iteration call
+        self.backups = 0  # Bellman backups performed by the last value_iteration call
+        self.delta = 0.0  # largest value change in the last sweep
+        self.stats = stats  # accumulates the counters above when given
 
         self.values = {}
         self.policy = {}
@@ -30,7 +57,15 @@ class VI_MDP:
                 self.values[(r, c)] = 0.0
                 self.policy[(r, c)] = None
 
-        self.goal: CoordinateType = (self.maze.height - 1, self.maze.width - 1)
+        self.goal: CoordinateType = self.maze.goal
+        # Live-cell mask from dead-end filling, or None to use every cell.
+        self.live: Optional[bytearray] = fill_dead_ends(maze) if prune_dead_ends else None
+        # States that get updated, in row-major order.
+        self.states: List[CoordinateType] = [
+            state for i, state in enumerate(self.values) if self.live is None or self.live[i]
+        ]
+        if initial_values is not None or initial_policy is not None:
+            warm_start(self, initial_values, initial_policy)
 
     def is_terminal(self, state: tuple[int, int]) -> bool:
         """Check if a state is terminal (goal state)."""
@@ -44,21 +79,24 @@ class VI_MDP:
         """
         actions: List[CoordinateType] = []
         r, c = state
-        cell = self.maze.grid[r][c]
+        cell_walls = self.maze.walls[r * self.maze.width + c]
 
         # Check right movement (column +1)
 
-        if c < self.maze.width - 1 and not cell.walls.get("right", True):
+        if c < self.maze.width - 1 and not cell_walls & RIGHT:
             actions.append((0, 1))
         # Check left movement (column -1)
-        if c > 0 and not cell.walls.get("left", True):
+        if c > 0 and not cell_walls & LEFT:
             actions.append((0, -1))
         # Check down movement (row +1)
-        if r < self.maze.height - 1 and not cell.walls.get("bottom", True):
+        if r < self.maze.height - 1 and not cell_walls & BOTTOM:
             actions.append((1, 0))
         # Check up movement (row -1)
-        if r > 0 and not cell.walls.get("top", True):
+        if r > 0 and not cell_walls & TOP:
             actions.append((-1, 0))
+        if self.live is not None:
+            width = self.maze.width
+            actions = [(dr, dc) for dr, dc in actions if self.live[(r + dr) * width + c + dc]]
         return actions
 
     def get_next_state(
@@ -78,21 +116,67 @@ class VI_MDP:
         """
         if next_state == self.goal:
             return self.goal_reward
-        return -1
+        return self.move_cost
 
-    def value_iteration(self, epsilon=0.001):
+    def value_iteration(
+        self,
+        epsilon=0.001,
+        mode: str = "loop",
+        order: Union[str, Sequence[CoordinateType]] = "row_major",
+    ):
         """
         Perform value iteration untill the change in values is less than epsilon or
         the max_iterations is exhausted
+
+        Afterwards self.iterations holds the number of sweeps and self.backups the
+        number of Bellman backups of states that have at least one action.
+
+        Parameters:
+        - epsilon: convergence threshold on the largest value change in a sweep.
+        - mode: "loop" backs up one state at a time in Python, "vectorized" runs
+          each sweep as array operations on a precompiled TabularMDP. Both give
+          the same values, policy and iteration count. "exact" fills values and
+          policy from one traversal rooted at the goal, falling back to
+          "vectorized" when the rewards make the shortest route non-optimal.
+          "gauss_seidel" updates values in place in the given state order, and
+          "prioritized" only backs up states whose successors changed, largest
+          change first. "junction" iterates on the corridor-contracted junction
+          graph of the maze and expands the result back to every cell, falling
+          back to "vectorized" like "exact" does.
+        - order: state order for "gauss_seidel": "row_major", "goal_bfs"
+          (nearest to the goal first) or an explicit sequence of (row, col) cells.
         """
+        if mode == "loop":
+            self._value_iteration_loop(epsilon)
+        elif mode == "exact":
+            self._value_iteration_exact(epsilon)
+        elif mode == "vectorized":
+            self._value_iteration_vectorized(epsilon)
+        elif mode == "gauss_seidel":
+            self._value_iteration_gauss_seidel(epsilon, order)
+        elif mode == "prioritized":
+            self._value_iteration_prioritized(epsilon)
+        elif mode == "junction":
+            self._value_iteration_junction(epsilon)
+        else:
+            raise ValueError(f"Unknown value iteration mode: {mode}")
+
+        if self.stats is not None:
+            self.stats.sweeps += self.iterations
+            self.stats.backups += self.backups
+            self.stats.final_delta = self.delta
 
+    def _value_iteration_loop(self, epsilon: float) -> None:
+        """Synchronous value iteration, one state at a time over the value dict."""
         iterations = 0
+        backups = 0
+        delta = 0.0
         while iterations < self.max_iter:
             delta = 0  # Maximum change in the value function in this iteration.
-            new_values = self.values.copy()  # copy of the initialized values
+            new_values = {}  # values backed up in this sweep
 
-            # iterate over all states and update it's values
-            for state in self.values:
+            # iterate over all (live) states and update it's values
+            for state in self.states:
                 if self.is_terminal(state):
                     new_values[state] = 0.0  # Terminal state value is 0
                     self.policy[state] = None
@@ -112,17 +196,223 @@ class VI_MDP:
                 # if we reach a dead end
                 if best_value == float("-inf"):
                     best_value = self.values[state]
+                else:
+                    backups += 1
 
                 new_values[state] = best_value
                 self.policy[state] = best_action
                 delta = max(delta, abs(new_values[state] - self.values[state]))
 
-            self.values = new_values
+            self.values.update(new_values)
             iterations += 1
 
             if delta < epsilon:
                 break
 
+        self.iterations = iterations
+        self.backups = backups
+        self.delta = float(delta)
+
+    def _value_iteration_exact(self, epsilon: float) -> None:
+        """Solve in closed form from goal distances when that is valid, else iterate."""
+        model = build_model(self)
+        solution = model.solve_exact(self.gamma, model.values_from_dict(self.values))
+        if solution is None:
+            return self._value_iteration_vectorized(epsilon)
+
+        values, actions = solution
+        self.iterations = 0
+        self.backups = 0
+        self.delta = 0.0
+        self.values = model.values_to_dict(values)
+        self.policy = model.policy_to_dict(actions)
+
+    def _value_iteration_vectorized(self, epsilon: float) -> None:
+        """Synchronous value iteration with every sweep done as array max/argmax."""
+        model = build_model(self)
+        values = model.values_from_dict(self.values)
+        actions = np.full(model.size, -1)
+        non_terminal = ~model.terminal
+        updatable = int((model.has_action & non_terminal).sum())
+
+        iterations = 0
+        delta = 0.0
+        while iterations < self.max_iter:
+            new_values, actions = model.greedy(values, self.gamma)
+            changes = np.abs(new_values - values)[non_terminal]
+            delta = changes.max() if changes.size else 0.0
+            values = new_values
+            iterations += 1
+
+            if delta < epsilon:
+                break
+
+        self.iterations = iterations
+        self.backups = iterations * updatable
+        self.delta = float(delta)
+        self.values = model.values_to_dict(values)
+        self.policy = model.policy_to_dict(actions)
+
+    def _value_iteration_gauss_seidel(
+        self, epsilon: float, order: Union[str, Sequence[CoordinateType]]
+    ) -> None:
+        """
+        In-place (Gauss-Seidel) value iteration: each backup immediately sees
+        values updated earlier in the same sweep, so with a goal-outward order
+        information crosses a whole corridor in one sweep instead of one cell.
+        """
+        model = build_model(self)
+        if isinstance(order, str):
+            if order == "row_major":
+                ordering = range(model.size)
+            elif order == "goal_bfs":
+                distance = model.goal_distances()
+                # Unreachable states (-1) go last.
+                ordering = np.argsort(np.where(distance < 0, model.size, distance), kind="stable").tolist()
+            else:
+                raise ValueError(f"Unknown state order: {order}")
+        else:
+            ordering = [r * self.maze.width + c for r, c in order]
+
+        values = model.values_from_dict(self.values).tolist()
+        values[model.goal] = 0.0
+        actions = [-1] * model.size
+        schedule = self._backup_schedule(model, ordering)
+
+        iterations = 0
+        delta = 0.0
+        gamma = self.gamma
+        while iterations < self.max_iter:
+            delta = 0.0
+            for state, options in schedule:
+                best_value = -math.inf
+                best_action = -1
+                for action, next_state, reward in options:
+                    value = reward + gamma * values[next_state]
+                    if value > best_value:
+                        best_value = value
+                        best_action = action
+                change = abs(best_value - values[state])
+                if change > delta:
+                    delta = change
+                values[state] = best_value
+                actions[state] = best_action
+            iterations += 1
+
+            if delta < epsilon:
+                break
+
+        self.iterations = iterations
+        self.backups = iterations * len(schedule)
+        self.delta = delta
+        self.values = model.values_to_dict(np.array(values))
+        self.policy = model.policy_to_dict(np.array(actions))
+
+    def _value_iteration_prioritized(self, epsilon: float) -> None:
+        """
+        Prioritized sweeping: back up the state with the largest pending change
+        first, then queue its predecessors with priority gamma * |change|, the
+        most their own value can move. Stops when no queued change reaches epsilon.
+        """
+        model = build_model(self)
+        values_array = model.values_from_dict(self.values)
+        values_array[model.goal] = 0.0
+        # One synchronous backup gives every state its initial priority.
+        backed_up, _ = model.greedy(values_array, self.gamma)
+        residuals = np.abs(backed_up - values_array).tolist()
+
+        schedule = dict(self._backup_schedule(model, range(model.size)))
+        sources, action_ids = np.nonzero(model.valid)
+        offsets, predecessors = reverse_adjacency(
+            sources, model.next_state[sources, action_ids], model.size
+        )
+        values = values_array.tolist()
+        gamma = self.gamma
+        backups = len(schedule)
+        max_backups = self.max_iter * max(len(schedule), 1)
+
+        priority = [0.0] * model.size
+        queue = []
+        for state in schedule:
+            if residuals[state] >= epsilon:
+                priority[state] = residuals[state]
+                queue.append((-residuals[state], state))
+        heapq.heapify(queue)
+
+        while queue and backups < max_backups:
+            negative_priority, state = heapq.heappop(queue)
+            if -negative_priority != priority[state]:
+                continue  # superseded by a later, larger priority
+            priority[state] = 0.0
+
+            best_value = max(reward + gamma * values[next_state] for _, next_state, reward in schedule[state])
+            change = abs(best_value - values[state])
+            values[state] = best_value
+            backups += 1
+
+            pending = gamma * change
+            if pending < epsilon:
+                continue
+            for i in range(offsets[state], offsets[state + 1]):
+                predecessor = predecessors[i]
+                if predecessor in schedule and pending > priority[predecessor]:
+                    priority[predecessor] = pending
+                    heapq.heappush(queue, (-pending, predecessor))
+
+        values_array = np.array(values)
+        # The policy is read off the final values; that greedy pass is not counted.
+        _, actions = model.greedy(values_array, self.gamma)
+        self.backups = backups
+        self.iterations = math.ceil(backups / len(schedule)) if schedule else 0
+        # Largest change still pending; 0 when the queue drained below epsilon.
+        self.delta = max((-p for p, state in queue if -p == priority[state]), default=0.0)
+        self.values = model.values_to_dict(values_array)
+        self.policy = model.policy_to_dict(actions)
+
+    def _value_iteration_junction(self, epsilon: float) -> None:
+        """
+        Synchronous value iteration over junctions, dead ends, start and goal
+        only (see JunctionMDP). Sweeps and backups count graph nodes.
+        Falls back to cell iteration when a shortest route is not optimal,
+        as the junction graph then gives wrong values.
+        """
+        if not shortest_route_optimal(self.move_cost, self.goal_reward, self.gamma):
+            return self._value_iteration_vectorized(epsilon)
+        model = JunctionMDP(self.maze, self.move_cost, self.goal_reward, self.gamma)
+        cell_values = model.values_from_dict(self.values)
+        node_values, choice, iterations, delta = model.value_iteration(
+            cell_values[model.node_cells], epsilon, self.max_iter
+        )
+        values, actions = model.expand(node_values, choice, cell_values)
+        self.iterations = iterations
+        self.backups = iterations * model.movers.size
+        self.delta = delta
+        self.values = model.values_to_dict(values)
+        self.policy = model.policy_to_dict(actions)
+
+    @staticmethod
+    def _backup_schedule(model: TabularMDP, ordering) -> list:
+        """
+        List (state, [(action, next_state, reward), ...]) for every state in
+        ordering that gets Bellman backups, i.e. non-terminal with an action.
+        """
+        next_states = model.next_state.tolist()
+        rewards = model.reward.tolist()
+        valid = model.valid.tolist()
+        terminal = model.terminal.tolist()
+        schedule = []
+        for state in ordering:
+            if terminal[state]:
+                continue
+            options = [
+                (a, next_states[state][a], rewards[state][a])
+                for a in range(len(valid[state]))
+                if valid[state][a]
+            ]
+            if options:
+                schedule.append((state, options))
+        return schedule
+
     def get_policy(self):
         """Return the computed policy after value iteration."""
         return self.policy
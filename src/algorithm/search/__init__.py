@@ -1,3 +1,7 @@
 from .bfs import BFS
 from .dfs import DFS
 from .astar import AStar
+from .bidirectional_bfs import BidirectionalBFS
+from .junction_search import JunctionSearch
+from .path_oracle import PathOracle
+from .lpa_star import LPAStar
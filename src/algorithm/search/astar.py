@@ -1,65 +1,197 @@
-from collections import deque
-from typing import Optional, Tuple, List, Dict
+from array import array
+from typing import Optional, Tuple, List
 from maze import Maze
-from utils.utils import reconstruct_path
-from utils import Heuristic
+from utils.utils import reconstruct_index_path
+from utils import Heuristic, LandmarkHeuristic
+from utils.stats import SearchStats
 import heapq
 
 CoordinateType = Tuple[int, int]
 
 
+OPEN_LISTS = ("heap", "bucket")
+
+
 class AStar:
-    def __init__(self, maze: Maze):
+    def __init__(
+        self,
+        maze: Maze,
+        stats: Optional[SearchStats] = None,
+        open_list: str = "heap",
+        heuristic: Optional[LandmarkHeuristic] = None,
+    ):
+        """
+        Parameters:
+        - maze: the maze to solve between maze.start and maze.goal.
+        - stats: optional SearchStats filled in by solve().
+        - open_list: "heap" keeps the open list in a binary heap ordered by
+          (f, cell). "bucket" uses one bucket per integer f value (Dial's
+          algorithm), with O(1) pushes, and prefers the entry with the
+          highest g among equal f. Each bucket is sorted once when the
+          search reaches it, so a bucket of k entries costs O(k log k).
+        - heuristic: a LandmarkHeuristic for the maze, e.g. from
+          LandmarkHeuristic.for_maze, to share its tables between queries.
+          Defaults to the Manhattan distance.
+        """
+        if open_list not in OPEN_LISTS:
+            raise ValueError(f"Unknown open list: {open_list}")
         self.maze = maze
-        self.heuristic = Heuristic()
+        self.heuristic = heuristic if heuristic is not None else Heuristic()
+        self.stats = stats  # filled in by solve() when given
+        self.open_list = open_list
 
     def solve(self) -> List[CoordinateType]:
-        start: CoordinateType = (0, 0)
-        goal: CoordinateType = (self.maze.height - 1, self.maze.width - 1)
+        if self.open_list == "bucket":
+            return self._solve_buckets()
+        return self._solve_heap()
 
-        open_set: List[Tuple[float, CoordinateType]] = []
+    def _solve_heap(self) -> List[CoordinateType]:
+        maze = self.maze
+        # Cells are flat row-major ids; the path is converted to (row, column) at the end.
+        # Ids order like (row, column) pairs, so heap ties break the same way.
+        width = maze.width
+        start = maze.index(*maze.start)
+        goal = maze.index(*maze.goal)
+        # Heuristic estimate of every cell, looked up once per push.
+        estimate = self.heuristic.estimates(maze, goal)
+        adjacency = maze.adjacency()
+        offsets, neighbours = adjacency.offsets, adjacency.neighbours
+
+        open_set: List[Tuple[int, int]] = []
         heapq.heappush(open_set, (0, start))  # (f, node)
 
-        # To reconstruct the path
-        came_from: Dict[CoordinateType, Optional[CoordinateType]] = {start: None}
+        # To reconstruct the path; -1 while a cell has no predecessor
+        came_from = array(offsets.typecode, [-1]) * adjacency.size
+        came_from[start] = start
 
-        # Cost from start to each node
-        g_score: Dict[CoordinateType, float] = {start: 0}
+        # Cost from start to each node, -1 while unknown
+        g_score = array(offsets.typecode, [-1]) * adjacency.size
+        g_score[start] = 0
 
-        # Heuristic estimates from node to goal
-        f_score: Dict[CoordinateType, float] = {start: self.heuristic.manhattan_heuristic(start, goal)}
+        # Nodes already evaluated
+        closed_set = bytearray(adjacency.size)
 
-        # Set of nodes already evaluated
-        closed_set: set[CoordinateType] = set()
+        stats = self.stats
+        pushes = 1
+        reached = 1
 
         while open_set:
             # Get the node in the open set with the lowest f_score
             _, current = heapq.heappop(open_set)
-            
+            if closed_set[current]:
+                continue  # stale entry, the node was expanded with a lower f
+
             if current == goal:
-                return reconstruct_path(came_from, start, goal)
-
-            closed_set.add(current)
-
-            r, c = current
-            cell = self.maze.grid[r][c]
-            
-            for dr, dc, wall_key in [
-                (-1, 0, "top"),    # up
-                (1, 0, "bottom"),  # down
-                (0, -1, "left"),   # left
-                (0, 1, "right"),   # right
-            ]:
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < self.maze.height and 0 <= nc < self.maze.width:
-                    if not cell.walls.get(wall_key, True) and (nr, nc) not in closed_set:
-                        tentative_g_score = g_score[current] + 1  # Assume uniform cost of 1 for each move
-                        
-                        if (nr, nc) not in g_score or tentative_g_score < g_score[(nr, nc)]:
-                            came_from[(nr, nc)] = current
-                            g_score[(nr, nc)] = tentative_g_score
-                            f_score[(nr, nc)] = g_score[(nr, nc)] + self.heuristic.manhattan_heuristic((nr, nc), goal)
-                            heapq.heappush(open_set, (f_score[(nr, nc)], (nr, nc)))
+                if stats is not None:
+                    stats.nodes_generated = pushes
+                    stats.peak_came_from = reached
+                return reconstruct_index_path(came_from, start, goal, width)
+
+            closed_set[current] = 1
+            tentative_g_score = g_score[current] + 1  # Assume uniform cost of 1 for each move
+
+            # Neighbours come in up, down, left, right order.
+            for neighbour in neighbours[offsets[current]:offsets[current + 1]]:
+                if closed_set[neighbour]:
+                    continue
+                known_g_score = g_score[neighbour]
+                if known_g_score < 0 or tentative_g_score < known_g_score:
+                    if known_g_score < 0:
+                        reached += 1
+                    came_from[neighbour] = current
+                    g_score[neighbour] = tentative_g_score
+                    f_score = tentative_g_score + estimate[neighbour]
+                    heapq.heappush(open_set, (f_score, neighbour))
+                    pushes += 1
+
+            if stats is not None:
+                stats.nodes_expanded += 1
+                stats.peak_frontier = max(stats.peak_frontier, len(open_set))
+
+        if stats is not None:
+            stats.nodes_generated = pushes
+            stats.peak_came_from = reached
+        return []
+
+    def _solve_buckets(self) -> List[CoordinateType]:
+        """
+        A* with a bucket queue: moves cost 1 and the heuristics are
+        integers, so f is a small integer and buckets[f] holds the open
+        entries with that f. Entries are ints g * size + cell. Each bucket
+        is sorted once when the search reaches it, so popping from its end
+        yields the highest g first: the entry closest to the goal among
+        equal f. Both the Manhattan and the landmark heuristic are
+        consistent, so f never decreases and the current bucket only moves
+        forward. An entry pushed into the bucket being drained has g one
+        above the entry just popped, which is the highest left, so appending
+        keeps the bucket ordered by g. g_score is the only score array;
+        entries whose g no longer matches it are stale and skipped.
+        """
+        maze = self.maze
+        width = maze.width
+        start = maze.index(*maze.start)
+        goal = maze.index(*maze.goal)
+        # Heuristic estimate of every cell, looked up once per push.
+        estimate = self.heuristic.estimates(maze, goal)
+        adjacency = maze.adjacency()
+        offsets, neighbours = adjacency.offsets, adjacency.neighbours
+        size = adjacency.size
+
+        came_from = array(offsets.typecode, [-1]) * size
+        came_from[start] = start
+        g_score = array(offsets.typecode, [-1]) * size
+        g_score[start] = 0
+        closed_set = bytearray(size)
+
+        current_f = estimate[start]
+        buckets: List[List[int]] = [[] for _ in range(current_f)] + [[start]]
+        open_entries = 1
+        stats = self.stats
+        pushes = 1
+        reached = 1
+
+        while open_entries:
+            bucket = buckets[current_f]
+            if not bucket:
+                current_f += 1
+                if current_f < len(buckets):
+                    buckets[current_f].sort()
+                continue
+            entry = bucket.pop()
+            open_entries -= 1
+            g, current = divmod(entry, size)
+            if closed_set[current] or g != g_score[current]:
+                continue  # stale entry superseded by a shorter route
+            if current == goal:
+                if stats is not None:
+                    stats.nodes_generated = pushes
+                    stats.peak_came_from = reached
+                return reconstruct_index_path(came_from, start, goal, width)
+
+            closed_set[current] = 1
+            tentative_g_score = g + 1
+            for neighbour in neighbours[offsets[current]:offsets[current + 1]]:
+                if closed_set[neighbour]:
+                    continue
+                known_g_score = g_score[neighbour]
+                if known_g_score < 0 or tentative_g_score < known_g_score:
+                    if known_g_score < 0:
+                        reached += 1
+                    came_from[neighbour] = current
+                    g_score[neighbour] = tentative_g_score
+                    f_score = tentative_g_score + estimate[neighbour]
+                    while len(buckets) <= f_score:
+                        buckets.append([])
+                    entry = tentative_g_score * size + neighbour
+                    buckets[f_score].append(entry)
+                    open_entries += 1
+                    pushes += 1
 
+            if stats is not None:
+                stats.nodes_expanded += 1
+                stats.peak_frontier = max(stats.peak_frontier, open_entries)
 
+        if stats is not None:
+            stats.nodes_generated = pushes
+            stats.peak_came_from = reached
         return []
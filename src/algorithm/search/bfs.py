@@ -1,40 +1,50 @@
+from array import array
 from collections import deque
-from typing import Dict, List, Optional, Tuple
+from typing import List, Optional, Tuple
 
 from maze import Maze
-from utils.utils import reconstruct_path
+from utils.stats import SearchStats
+from utils.utils import reconstruct_index_path
 
 class BFS:
-    def __init__(self, maze: Maze):
+    def __init__(self, maze: Maze, stats: Optional[SearchStats] = None):
         self.maze = maze
+        self.stats = stats  # filled in by solve() when given
 
     def solve(self) -> Optional[List[Tuple[int, int]]]:
-        start = (0, 0)  # (row, column)
-        goal = (self.maze.height - 1, self.maze.width - 1)
+        maze = self.maze
+        # Cells are flat row-major ids; the path is converted to (row, column) at the end.
+        start = maze.index(*maze.start)
+        goal = maze.index(*maze.goal)
+        adjacency = maze.adjacency()
+        offsets, neighbours = adjacency.offsets, adjacency.neighbours
 
-        frontier: deque[Tuple[int, int]] = deque([start])
-        came_from: dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
+        frontier: deque[int] = deque([start])
+        visited = bytearray(adjacency.size)
+        visited[start] = 1
+        # Predecessor id of every reached cell.
+        came_from = array(offsets.typecode, [-1]) * adjacency.size
+        reached = 1
+        stats = self.stats
 
         while frontier:
-            r, c = frontier.popleft()
-            if (r, c) == goal:
-                return reconstruct_path(came_from, start, goal)
-            
-            cell = self.maze.grid[r][c]
-            # Neighbors: (dr, dc) offsets with corresponding wall keys
-            for dr, dc, wall_key in [
-                (-1, 0, "top"),    # up
-                (1, 0, "bottom"),  # down
-                (0, -1, "left"),   # left
-                (0, 1, "right"),   # right
-            ]:
-                nr, nc = r + dr, c + dc
-                # Check bounds
-                if 0 <= nr < self.maze.height and 0 <= nc < self.maze.width:
-                    # Check that there is no wall in the current cell in the direction we're moving
-                    if not cell.walls[wall_key]:
-                        if (nr, nc) not in came_from:
-                            came_from[(nr, nc)] = (r, c)
-                            frontier.append((nr, nc))
-        return [] 
+            cell = frontier.popleft()
+            if cell == goal:
+                if stats is not None:
+                    # Every generated node gets exactly one came_from entry.
+                    stats.nodes_generated = stats.peak_came_from = reached
+                return reconstruct_index_path(came_from, start, goal, maze.width)
 
+            # Neighbours come in up, down, left, right order.
+            for neighbour in neighbours[offsets[cell]:offsets[cell + 1]]:
+                if not visited[neighbour]:
+                    visited[neighbour] = 1
+                    came_from[neighbour] = cell
+                    frontier.append(neighbour)
+                    reached += 1
+            if stats is not None:
+                stats.nodes_expanded += 1
+                stats.peak_frontier = max(stats.peak_frontier, len(frontier))
+        if stats is not None:
+            stats.nodes_generated = stats.peak_came_from = reached
+        return [] 
@@ -0,0 +1,98 @@
+from typing import Dict, List, Optional, Tuple
+
+from maze import Maze, TOP, BOTTOM, LEFT, RIGHT
+from utils.stats import SearchStats
+from utils.utils import reconstruct_path
+
+CoordinateType = Tuple[int, int]
+
+
+class BidirectionalBFS:
+    """
+    Breadth-first search grown from the start and the goal at the same time.
+
+    Each step expands one whole level of the side with the smaller frontier.
+    The search stops as soon as a newly reached cell was already reached by
+    the other side, and the two predecessor maps are joined into one path.
+    In a maze each side only explores a ball around its own end, so far
+    fewer cells are visited than by BFS from the start alone.
+    """
+
+    def __init__(self, maze: Maze, stats: Optional[SearchStats] = None):
+        self.maze = maze
+        self.stats = stats  # filled in by solve() when given
+
+    def solve(self) -> Optional[List[CoordinateType]]:
+        start = self.maze.start
+        goal = self.maze.goal
+        stats = self.stats
+
+        # Predecessor towards the start, and successor towards the goal.
+        forward: Dict[CoordinateType, Optional[CoordinateType]] = {start: None}
+        backward: Dict[CoordinateType, Optional[CoordinateType]] = {goal: None}
+        forward_frontier: List[CoordinateType] = [start]
+        backward_frontier: List[CoordinateType] = [goal]
+
+        meeting = start if start == goal else None
+        while meeting is None and forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting = self._expand_level(forward_frontier, forward, backward)
+            else:
+                backward_frontier, meeting = self._expand_level(backward_frontier, backward, forward)
+            if stats is not None:
+                stats.peak_frontier = max(
+                    stats.peak_frontier, len(forward_frontier) + len(backward_frontier)
+                )
+
+        if stats is not None:
+            # Every generated node gets exactly one predecessor entry.
+            stats.nodes_generated = stats.peak_came_from = len(forward) + len(backward)
+        if meeting is None:
+            return []
+
+        path = reconstruct_path(forward, start, meeting)
+        current = backward[meeting]
+        while current is not None:
+            path.append(current)
+            current = backward[current]
+        return path
+
+    def _expand_level(
+        self,
+        frontier: List[CoordinateType],
+        came_from: Dict[CoordinateType, Optional[CoordinateType]],
+        other: Dict[CoordinateType, Optional[CoordinateType]],
+    ) -> Tuple[List[CoordinateType], Optional[CoordinateType]]:
+        """
+        Expand every cell of one frontier level.
+        Returns the next level and the first cell also reached by the other
+        side, or None. Moves are symmetric, so while no meeting has happened
+        yet every meeting found in this level lies on the other side's current
+        frontier: all of them close paths of the same, shortest, length and
+        the first one can be taken.
+        """
+        walls = self.maze.walls
+        width = self.maze.width
+        height = self.maze.height
+        stats = self.stats
+        next_frontier: List[CoordinateType] = []
+
+        for r, c in frontier:
+            if stats is not None:
+                stats.nodes_expanded += 1
+            cell_walls = walls[r * width + c]
+            for dr, dc, wall_bit in [
+                (-1, 0, TOP),     # up
+                (1, 0, BOTTOM),   # down
+                (0, -1, LEFT),    # left
+                (0, 1, RIGHT),    # right
+            ]:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < height and 0 <= nc < width and not cell_walls & wall_bit:
+                    neighbor = (nr, nc)
+                    if neighbor not in came_from:
+                        came_from[neighbor] = (r, c)
+                        if neighbor in other:
+                            return next_frontier, neighbor
+                        next_frontier.append(neighbor)
+        return next_frontier, None
@@ -1,46 +1,53 @@
 
-from collections import deque
-from typing import Optional, Set, Tuple, List
+from array import array
+from typing import Optional, List
 from maze import Maze
+from utils.stats import SearchStats
 from utils.types import CoordinateType
-from utils.utils import reconstruct_path
+from utils.utils import reconstruct_index_path
 
 
 class DFS:
-    def __init__(self, maze: Maze):
+    def __init__(self, maze: Maze, stats: Optional[SearchStats] = None):
         self.maze: Maze = maze
+        self.stats = stats  # filled in by solve() when given
 
     def solve(self) -> List[CoordinateType]:
-        start: CoordinateType = (0,0)
-        goal: CoordinateType = (self.maze.height - 1, self.maze.width - 1)
+        maze = self.maze
+        # Cells are flat row-major ids; the path is converted to (row, column) at the end.
+        start = maze.index(*maze.start)
+        goal = maze.index(*maze.goal)
+        adjacency = maze.adjacency()
+        offsets, neighbours = adjacency.offsets, adjacency.neighbours
 
-        stack: List[CoordinateType] = [start]
-        visited: Set[CoordinateType] = {start}
-        came_from: dict[CoordinateType, Optional[CoordinateType]] = {start: None}
+        stack: List[int] = [start]
+        visited = bytearray(adjacency.size)
+        visited[start] = 1
+        came_from = array(offsets.typecode, [-1]) * adjacency.size
+        reached = 1
+        stats = self.stats
 
 
         while stack:
-            r, c = stack.pop() 
-            if (r,c) == goal:
-                return reconstruct_path(came_from, start, goal)
-
-            cell = self.maze.grid[r][c]
-
-            for dr, dc, wall_key in [
-                (-1, 0, "top"),    # up
-                (1, 0, "bottom"),  # down
-                (0, -1, "left"),   # left
-                (0, 1, "right"),   # right
-            ]:
-                nr, nc = r + dr, c + dc
-
-                if 0 <= nr < self.maze.height and 0 <= nc < self.maze.width:
-                    if not cell.walls[wall_key]:
-                        neighbour = (nr, nc) 
-                        if neighbour not in visited:
-                            visited.add(neighbour)
-                            stack.append(neighbour)
-                            came_from[neighbour] = (r, c)
+            cell = stack.pop() 
+            if cell == goal:
+                if stats is not None:
+                    # Every generated node gets exactly one came_from entry.
+                    stats.nodes_generated = stats.peak_came_from = reached
+                return reconstruct_index_path(came_from, start, goal, maze.width)
+
+            # Neighbours come in up, down, left, right order.
+            for neighbour in neighbours[offsets[cell]:offsets[cell + 1]]:
+                if not visited[neighbour]:
+                    visited[neighbour] = 1
+                    stack.append(neighbour)
+                    came_from[neighbour] = cell
+                    reached += 1
+            if stats is not None:
+                stats.nodes_expanded += 1
+                stats.peak_frontier = max(stats.peak_frontier, len(stack))
+        if stats is not None:
+            stats.nodes_generated = stats.peak_came_from = reached
         return [] 
 
 
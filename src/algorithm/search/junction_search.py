@@ -0,0 +1,115 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from maze import Maze
+from utils import Heuristic
+from utils.stats import SearchStats
+
+CoordinateType = Tuple[int, int]
+
+STRATEGIES = ("bfs", "dfs", "astar")
+
+
+class JunctionSearch:
+    """
+    Search on the maze's corridor-contracted junction graph instead of cells.
+
+    - "bfs": uniform-cost search, since edges are weighted by corridor
+      length; returns a shortest path like BFS on cells.
+    - "dfs": depth-first search over junctions, any path like DFS.
+    - "astar": A* with the Manhattan distance between node cells.
+
+    The node path is expanded back to cells, so solve() returns the same kind
+    of (row, col) path as the cell-based solvers. Stats count graph nodes.
+    """
+
+    def __init__(self, maze: Maze, strategy: str = "bfs", stats: Optional[SearchStats] = None):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown junction search strategy: {strategy}")
+        self.maze = maze
+        self.strategy = strategy
+        self.heuristic = Heuristic()
+        self.stats = stats  # filled in by solve() when given
+
+    def solve(self) -> List[CoordinateType]:
+        graph = self.maze.junction_graph()
+        if self.strategy == "dfs":
+            came_from = self._depth_first(graph)
+        else:
+            came_from = self._best_first(graph)
+        if self.stats is not None:
+            self.stats.peak_came_from = len(came_from)
+        if graph.goal not in came_from:
+            return []
+
+        # Walk the (node, edge) predecessors back from the goal.
+        nodes, edges = [graph.goal], []
+        while came_from[nodes[-1]] is not None:
+            previous, edge = came_from[nodes[-1]]
+            nodes.append(previous)
+            edges.append(edge)
+        nodes.reverse()
+        edges.reverse()
+        return graph.expand_path(nodes, edges)
+
+    def _depth_first(self, graph) -> Dict[int, Optional[Tuple[int, int]]]:
+        stats = self.stats
+        neighbour, edge_of = graph.neighbour, graph.edge
+        stack = [graph.start]
+        came_from: Dict[int, Optional[Tuple[int, int]]] = {graph.start: None}
+        while stack:
+            node = stack.pop()
+            if node == graph.goal:
+                break
+            for slot in range(4 * node, 4 * node + 4):
+                other = neighbour[slot]
+                if other >= 0 and other not in came_from:
+                    came_from[other] = (node, edge_of[slot])
+                    stack.append(other)
+            if stats is not None:
+                stats.nodes_expanded += 1
+                stats.peak_frontier = max(stats.peak_frontier, len(stack))
+        if stats is not None:
+            stats.nodes_generated = len(came_from)
+        return came_from
+
+    def _best_first(self, graph) -> Dict[int, Optional[Tuple[int, int]]]:
+        stats = self.stats
+        neighbour, length, edge_of = graph.neighbour, graph.length, graph.edge
+        goal = graph.goal
+        goal_cell = graph.coordinate(goal)
+        use_heuristic = self.strategy == "astar"
+
+        def estimate(node: int) -> int:
+            if not use_heuristic:
+                return 0
+            return self.heuristic.manhattan_heuristic(graph.coordinate(node), goal_cell)
+
+        g_score: Dict[int, int] = {graph.start: 0}
+        came_from: Dict[int, Optional[Tuple[int, int]]] = {graph.start: None}
+        open_set: List[Tuple[int, int]] = [(estimate(graph.start), graph.start)]
+        closed = set()
+        pushes = 1
+        while open_set:
+            _, node = heapq.heappop(open_set)
+            if node in closed:
+                continue  # stale entry superseded by a shorter route
+            if node == goal:
+                break
+            closed.add(node)
+            for slot in range(4 * node, 4 * node + 4):
+                other = neighbour[slot]
+                if other < 0 or other in closed:
+                    continue
+                tentative = g_score[node] + length[slot]
+                if tentative < g_score.get(other, float("inf")):
+                    g_score[other] = tentative
+                    came_from[other] = (node, edge_of[slot])
+                    heapq.heappush(open_set, (tentative + estimate(other), other))
+                    pushes += 1
+            if stats is not None:
+                stats.nodes_expanded += 1
+                stats.peak_frontier = max(stats.peak_frontier, len(open_set))
+        if stats is not None:
+            stats.nodes_generated = pushes
+        return came_from
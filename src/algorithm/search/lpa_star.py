@@ -0,0 +1,150 @@
+import heapq
+from array import array
+from typing import List, Optional, Tuple
+
+from maze import Maze, TOP, BOTTOM, LEFT, RIGHT
+from utils.stats import SearchStats
+
+CoordinateType = Tuple[int, int]
+
+
+class LPAStar:
+    """
+    Lifelong Planning A* (Koenig and Likhachev) between maze.start and
+    maze.goal, kept alive across wall changes.
+
+    Every cell has g, its current distance from the start, and rhs, the
+    one-step lookahead min(g(neighbour) + 1). Cells where the two differ are
+    inconsistent and sit in a priority queue keyed by
+    (min(g, rhs) + h, min(g, rhs)), with h the Manhattan distance to the goal.
+    The first solve() is an ordinary A*. Later calls read the walls opened or
+    closed since the last call from ``maze.changes``, recompute rhs at both
+    ends of every changed wall, and then only process the cells whose
+    distances the edits can affect. The walls are read directly rather than
+    through ``Maze.adjacency()``, which every change would force to rebuild.
+
+    The planner starts over when the maze is regenerated or its start or
+    goal move. Walls must change through ``Maze.open_wall`` and
+    ``Maze.close_wall``; edits through set_wall or the grid view are not
+    recorded and are missed. Stats accumulate over all solve() calls.
+    """
+
+    def __init__(self, maze: Maze, stats: Optional[SearchStats] = None):
+        self.maze = maze
+        self.stats = stats  # filled in by solve() when given
+        self._changes = None  # maze.changes list the search state follows
+        self._seen = 0  # entries of that list already applied
+
+    def solve(self) -> List[CoordinateType]:
+        maze = self.maze
+        if (
+            self._changes is not maze.changes
+            or (self._start, self._goal) != (maze.index(*maze.start), maze.index(*maze.goal))
+        ):
+            self._reset()
+        else:
+            for change in maze.changes[self._seen:]:
+                self._update(change.cell)
+                self._update(change.neighbour)
+        self._seen = len(maze.changes)
+        self._compute_shortest_path()
+        return self._path()
+
+    def _reset(self) -> None:
+        maze = self.maze
+        n = maze.width * maze.height
+        self._changes = maze.changes
+        self._start = maze.index(*maze.start)
+        self._goal = maze.index(*maze.goal)
+        self._width, self._height = maze.width, maze.height
+        self._goal_r, self._goal_c = maze.goal
+        self._inf = n  # longer than any path
+        typecode = "i" if n < 2**31 else "q"
+        self.g = array(typecode, [n]) * n
+        self.rhs = array(typecode, [n]) * n
+        self.rhs[self._start] = 0
+        self._reached = 0  # cells with a finite g
+        self._queue: List[Tuple[int, int, int]] = []
+        self._push(self._start)
+
+    def _neighbours(self, cell: int) -> List[int]:
+        """Open neighbours of a cell in up, down, left, right order."""
+        width = self._width
+        walls = self.maze.walls[cell]
+        r, c = divmod(cell, width)
+        found = []
+        if r > 0 and not walls & TOP:
+            found.append(cell - width)
+        if r < self._height - 1 and not walls & BOTTOM:
+            found.append(cell + width)
+        if c > 0 and not walls & LEFT:
+            found.append(cell - 1)
+        if c < width - 1 and not walls & RIGHT:
+            found.append(cell + 1)
+        return found
+
+    def _key(self, cell: int) -> Tuple[int, int, int]:
+        best = min(self.g[cell], self.rhs[cell])
+        r, c = divmod(cell, self._width)
+        return best + abs(r - self._goal_r) + abs(c - self._goal_c), best, cell
+
+    def _push(self, cell: int) -> None:
+        heapq.heappush(self._queue, self._key(cell))
+        if self.stats is not None:
+            self.stats.nodes_generated += 1
+            self.stats.peak_frontier = max(self.stats.peak_frontier, len(self._queue))
+
+    def _update(self, cell: int) -> None:
+        """Recompute a cell's rhs and queue it if it became inconsistent."""
+        if cell != self._start:
+            g = self.g
+            self.rhs[cell] = min(
+                [g[neighbour] + 1 for neighbour in self._neighbours(cell)] + [self._inf]
+            )
+        if self.g[cell] != self.rhs[cell]:
+            self._push(cell)  # older queue entries are skipped as stale
+
+    def _compute_shortest_path(self) -> None:
+        g, rhs, queue = self.g, self.rhs, self._queue
+        goal, inf = self._goal, self._inf
+        stats = self.stats
+        while queue:
+            key = queue[0]
+            cell = key[2]
+            if g[cell] == rhs[cell]:
+                heapq.heappop(queue)  # stale: the cell is consistent again
+                continue
+            current = self._key(cell)
+            if key != current:
+                heapq.heapreplace(queue, current)  # stale key, requeue with the current one
+                continue
+            # Done once the goal is consistent and no queued cell could still improve it.
+            if current[:2] >= self._key(goal)[:2] and rhs[goal] == g[goal]:
+                break
+            heapq.heappop(queue)
+            if stats is not None:
+                stats.nodes_expanded += 1
+            if g[cell] > rhs[cell]:
+                if g[cell] == inf:
+                    self._reached += 1
+                g[cell] = rhs[cell]  # overconsistent: the cell got closer
+            else:
+                g[cell] = inf  # underconsistent: its route got longer or cut
+                self._reached -= 1
+                self._update(cell)
+            for neighbour in self._neighbours(cell):
+                self._update(neighbour)
+        if stats is not None:
+            stats.peak_came_from = max(stats.peak_came_from, self._reached)
+
+    def _path(self) -> List[CoordinateType]:
+        """Walk back from the goal, always to a neighbour one move closer to the start."""
+        g, start, goal = self.g, self._start, self._goal
+        if g[goal] >= self._inf:
+            return []
+        cells = [goal]
+        while cells[-1] != start:
+            cell = cells[-1]
+            cells.append(next(other for other in self._neighbours(cell) if g[other] == g[cell] - 1))
+        cells.reverse()
+        return [divmod(cell, self._width) for cell in cells]
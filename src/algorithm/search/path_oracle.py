@@ -0,0 +1,148 @@
+from array import array
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from maze import Maze
+from maze.walls import DIRECTIONS, bounded_walls, steps
+
+CoordinateType = Tuple[int, int]
+
+
+class PathOracle:
+    """
+    Shortest-path index for a perfect maze, answering any (start, goal) query.
+
+    The passages of a perfect maze form a spanning tree, so the path between
+    two cells runs up from each of them to their lowest common ancestor.
+    The tree is rooted at cell (0, 0), and one depth-first traversal records
+    parents, depths and the Euler tour of the tree. A sparse table of range
+    minima over the depths along the tour then gives the depth of any LCA in
+    O(1): it is the smallest depth between the two cells' first visits.
+
+    - distance / distances: number of moves between cells in O(1) each,
+      ``distances`` for whole arrays of queries at once.
+    - path / paths: the cells of the route in O(path length).
+
+    Building takes O(N) for the traversal and O(N log N) time and memory for
+    the sparse table. Use ``PathOracle.for_maze`` to share one index per maze.
+    """
+
+    def __init__(self, maze: Maze) -> None:
+        width, height = maze.width, maze.height
+        n = width * height
+        walls = bounded_walls(maze)
+        step = steps(width)
+        self.width: int = width
+
+        typecode = "i" if 2 * n < 2**31 else "q"
+        self.parent = array(typecode, [-1]) * n
+        self.depth = array(typecode, [0]) * n
+        first = array(typecode, [-1]) * n
+        tour = array(typecode, [0])
+        first[0] = 0
+
+        # Iterative depth-first traversal; next_direction[cell] is the index
+        # into DIRECTIONS of the next wall to try from that cell.
+        next_direction = bytearray(n)
+        stack = [0]
+        parent, depth = self.parent, self.depth
+        while stack:
+            cell = stack[-1]
+            d = next_direction[cell]
+            if d == len(DIRECTIONS):
+                stack.pop()
+                if stack:
+                    tour.append(stack[-1])
+                continue
+            next_direction[cell] = d + 1
+            wall = DIRECTIONS[d]
+            if walls[cell] & wall:
+                continue
+            child = cell + step[wall]
+            if child == parent[cell]:
+                continue
+            if first[child] >= 0:
+                raise ValueError("The maze has a loop, so it is not a perfect maze")
+            parent[child] = cell
+            depth[child] = depth[cell] + 1
+            first[child] = len(tour)
+            tour.append(child)
+            stack.append(child)
+        if len(tour) != 2 * n - 1:
+            raise ValueError("The maze is not connected, so it is not a perfect maze")
+
+        self.first = np.frombuffer(first, dtype=np.dtype(typecode))
+        self._depth = np.frombuffer(self.depth, dtype=np.dtype(typecode))
+        # table[k][i] is the smallest depth in tour[i:i + 2**k].
+        tour_depth = self._depth[np.frombuffer(tour, dtype=np.dtype(typecode))]
+        self.table: List[np.ndarray] = [tour_depth]
+        span = 1
+        while 2 * span <= tour_depth.size:
+            previous = self.table[-1]
+            self.table.append(np.minimum(previous[:-span], previous[span:]))
+            span *= 2
+
+    @classmethod
+    def for_maze(cls, maze: Maze) -> "PathOracle":
+        """The oracle of a maze, built on first use and cached until its walls change."""
+        return maze.cached("path_oracle", lambda: cls(maze))
+
+    def distance(self, start: CoordinateType, goal: CoordinateType) -> int:
+        """Number of moves on the path between two cells."""
+        a = start[0] * self.width + start[1]
+        b = goal[0] * self.width + goal[1]
+        return self.depth[a] + self.depth[b] - 2 * self._lca_depth(a, b)
+
+    def distances(
+        self, starts: Sequence[CoordinateType], goals: Sequence[CoordinateType]
+    ) -> np.ndarray:
+        """Number of moves for each (starts[i], goals[i]) pair, as one array."""
+        starts = np.asarray(starts, dtype=np.int64).reshape(-1, 2)
+        goals = np.asarray(goals, dtype=np.int64).reshape(-1, 2)
+        a = starts[:, 0] * self.width + starts[:, 1]
+        b = goals[:, 0] * self.width + goals[:, 1]
+        left = np.minimum(self.first[a], self.first[b])
+        right = np.maximum(self.first[a], self.first[b])
+        levels = np.zeros(left.size, dtype=np.int64)
+        lengths = right - left + 1
+        if lengths.size:
+            levels = np.floor(np.log2(lengths)).astype(np.int64)
+        lca_depth = np.empty(left.size, dtype=self._depth.dtype)
+        for level in np.unique(levels):
+            chosen = levels == level
+            row = self.table[level]
+            lca_depth[chosen] = np.minimum(
+                row[left[chosen]], row[right[chosen] - (1 << int(level)) + 1]
+            )
+        return self._depth[a] + self._depth[b] - 2 * lca_depth
+
+    def path(self, start: CoordinateType, goal: CoordinateType) -> List[CoordinateType]:
+        """Cells on the path from start to goal, both included."""
+        parent, depth = self.parent, self.depth
+        a = start[0] * self.width + start[1]
+        b = goal[0] * self.width + goal[1]
+        up, down = [a], [b]
+        while depth[a] > depth[b]:
+            a = parent[a]
+            up.append(a)
+        while depth[b] > depth[a]:
+            b = parent[b]
+            down.append(b)
+        while a != b:
+            a, b = parent[a], parent[b]
+            up.append(a)
+            down.append(b)
+        # Both walks end at the common ancestor; keep it once.
+        up.extend(reversed(down[:-1]))
+        return [divmod(cell, self.width) for cell in up]
+
+    def paths(self, pairs: Sequence[Tuple[CoordinateType, CoordinateType]]) -> List[List[CoordinateType]]:
+        """Paths for a batch of (start, goal) pairs."""
+        return [self.path(start, goal) for start, goal in pairs]
+
+    def _lca_depth(self, a: int, b: int) -> int:
+        left, right = sorted((int(self.first[a]), int(self.first[b])))
+        level = (right - left + 1).bit_length() - 1
+        row = self.table[level]
+        return int(min(row[left], row[right - (1 << level) + 1]))
@@ -1,75 +1,665 @@
 #!/usr/bin/env python3
+import argparse
 import csv
+import itertools
+import os
+import random
 import time
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 # Import your Maze and solver classes.
-from maze import Maze
+from maze import BOTTOM, RIGHT, Maze, MazeBatch
+from maze.corpus import MazeCorpus, generate
 from algorithm.search.bfs import BFS
+from algorithm.search.bidirectional_bfs import BidirectionalBFS
+from algorithm.search.junction_search import JunctionSearch
 from algorithm.search.dfs import DFS
-from algorithm.search.astar import AStar
+from algorithm.search.astar import OPEN_LISTS, AStar
+from algorithm.search.lpa_star import LPAStar
 from algorithm.mdp.value_iteration import VI_MDP
+from algorithm.mdp.batched import BatchedVI, MazeBatchVI
 from algorithm.mdp.policy_iteration import PI_MDP
+from algorithm.mdp.tabular import shortest_path_policy
+from utils.heuristics import LandmarkHeuristic
+from utils.profiling import MemoryProfile
+from utils.results import ResultLog, job_key, merge_logs
+from utils.stats import MDPStats, SearchStats
 from utils.types import CoordinateType
 from utils.utils import get_path_from_policy
 
+DEFAULT_CORPUS_DIR = "../data/maze_corpus"
+DEFAULT_OUTPUT = "../data/batch_experiment_results.csv"
+MEMORY_COLUMNS = ["Gen_Peak_Traced_KB", "Gen_Peak_RSS_KB", "Solve_Peak_Traced_KB", "Solve_Peak_RSS_KB"]
+# Algorithms that --batch solves for all trials of a size at once.
+BATCHED_ALGORITHMS = ("bfs", "vi")
+# Row entry carrying a job's top allocation sites; reported, not written to the CSV.
+TOP_ALLOCATIONS_KEY = "_top_allocations"
+
+
+def solve_mdp(
+    algorithm: str,
+    maze: Maze,
+    maze_size: int,
+    mdp_args,
+    stats: Optional[MDPStats] = None,
+    junctions: bool = False,
+    initial_values: Optional[Dict[CoordinateType, float]] = None,
+    initial_policy: Optional[Dict[CoordinateType, Optional[CoordinateType]]] = None,
+) -> Union[VI_MDP, PI_MDP]:
+    """Build the "vi" or "pi" solver for mdp_args, optionally warm-started, and run it."""
+    if algorithm == "vi":
+        solver = VI_MDP(
+            maze,
+            gamma=mdp_args.get("gamma", 0.9),
+            move_cost=mdp_args.get("reward_step", -1),
+            goal_reward=mdp_args.get("reward_goal", 10) * maze_size,
+            max_iter=int(mdp_args.get("max_iter", 100000)),
+            stats=stats,
+            prune_dead_ends=mdp_args.get("prune_dead_ends", False),
+            initial_values=initial_values,
+            initial_policy=initial_policy,
+        )
+        solver.value_iteration(mode="junction" if junctions else "loop")
+    else:
+        solver = PI_MDP(
+            maze,
+            gamma=mdp_args.get("gamma", 0.9),
+            move_cost=mdp_args.get("reward_step", -1),
+            goal_reward=mdp_args.get("reward_goal", 10),
+            stats=stats,
+            prune_dead_ends=mdp_args.get("prune_dead_ends", False),
+            initial_values=initial_values,
+            initial_policy=initial_policy,
+        )
+        solver.policy_iteration(mode="junction" if junctions else "loop")
+    return solver
+
+
 def run_experiment(
     algorithm: str, 
     maze_size: int, 
-    mdp_args
-) -> Tuple[float, Optional[List[CoordinateType]]]:
+    mdp_args,
+    maze: Optional[Maze] = None,
+    seed: int = 0,
+    generator: str = "kruskal",
+    corpus: Optional[MazeCorpus] = None,
+    collect_stats: bool = False,
+    memory: Optional[MemoryProfile] = None,
+    junctions: bool = False,
+    open_list: str = "heap",
+    landmarks: int = 0,
+) -> Tuple[float, Optional[List[CoordinateType]], Dict[str, float]]:
     """
     Run a specific algorithm on a maze of given size.
     
     Parameters:
-    - algorithm: one of "bfs", "dfs", "astar", "vi", or "pi".
+    - algorithm: one of "bfs", "bibfs", "dfs", "astar", "vi", or "pi".
     - maze_size: the dimension (N x N) of the maze.
-    - mdp_args: parameters for MDP algorithms (gamma, reward_goal, reward_step, max_iter).
+    - mdp_args: parameters for MDP algorithms (gamma, reward_goal, reward_step, max_iter,
+      prune_dead_ends).
+    - maze: an existing maze to solve, e.g. one loaded from a maze file. When
+      omitted, the maze for (maze_size, seed, generator) is taken from the corpus.
+    - seed, generator: key of the maze in the corpus.
+    - corpus: maze cache to use; defaults to the corpus under DEFAULT_CORPUS_DIR.
+    - collect_stats: have the solver fill in its SearchStats or MDPStats.
+    - memory: a MemoryProfile to measure the solve with. It is stopped before
+      the solver is released, so allocation sites still show its data.
+    - junctions: solve on the maze's corridor-contracted junction graph; bfs
+      and bibfs then both run JunctionSearch's uniform-cost "bfs" strategy.
+    - open_list: open list of cell-based astar, "heap" or "bucket".
+    - landmarks: with a positive count, cell-based astar uses a
+      LandmarkHeuristic with that many landmarks instead of the Manhattan
+      distance. Its tables are per-maze preprocessing shared by every query,
+      so they are built (or taken from the maze's cache) before timing.
 
     Returns:
-    - A tuple of (execution_time, path), where path is a list of (row, col) coordinates.
+    - A tuple of (execution_time, path, stats), where path is a list of (row, col)
+      coordinates and stats the solver's counters (empty unless collect_stats).
     """
-    maze: Maze = Maze(maze_size)
-    maze.generate()
-    start_time: float = time.time()
+    if maze is None:
+        corpus = corpus or MazeCorpus(DEFAULT_CORPUS_DIR)
+        maze = corpus.get(maze_size, seed, generator)
     path: Optional[List[CoordinateType]] = None
+    stats = None
+    if collect_stats:
+        stats = MDPStats() if algorithm in ["vi", "pi"] else SearchStats()
+    heuristic = None
+    if algorithm == "astar" and landmarks > 0 and not junctions:
+        heuristic = LandmarkHeuristic.for_maze(maze, landmarks)
+    if memory is not None:
+        memory.start()
+    start_time: float = time.time()
 
-    if algorithm in ["bfs", "dfs", "astar"]:
-        if algorithm == "astar":
-            solver = AStar(maze)
+    if algorithm in ["bfs", "bibfs", "dfs", "astar"]:
+        if junctions:
+            strategy = "bfs" if algorithm == "bibfs" else algorithm
+            solver = JunctionSearch(maze, strategy, stats=stats)
+        elif algorithm == "astar":
+            solver = AStar(maze, stats=stats, open_list=open_list, heuristic=heuristic)
         elif algorithm == "bfs":
-            solver = BFS(maze)
+            solver = BFS(maze, stats=stats)
+        elif algorithm == "bibfs":
+            solver = BidirectionalBFS(maze, stats=stats)
         else:
-            solver = DFS(maze)
+            solver = DFS(maze, stats=stats)
         path = solver.solve()
     elif algorithm == "vi":
-        solver = VI_MDP(
-            maze,
-            gamma=mdp_args.get("gamma", 0.9),
-            move_cost=mdp_args.get("reward_step", -1),
-            goal_reward=mdp_args.get("reward_goal", 10) * maze_size,
-            max_iter=int(mdp_args.get("max_iter", 100000))
-        )
-        solver.value_iteration()
+        solver = solve_mdp(algorithm, maze, maze_size, mdp_args, stats, junctions)
         # For VI, obtain the policy and derive the path.
         policy: Dict[CoordinateType, Optional[CoordinateType]] = solver.get_policy()
-        path = get_path_from_policy(policy, (0, 0), solver.goal)
+        path = get_path_from_policy(policy, maze.start, solver.goal, len(solver.states))
     elif algorithm == "pi":
-        solver = PI_MDP(
-            maze,
-            gamma=mdp_args.get("gamma", 0.9),
-            move_cost=mdp_args.get("reward_step", -1),
-            goal_reward=mdp_args.get("reward_goal", 10)
-        )
-        solver.policy_iteration()
+        solver = solve_mdp(algorithm, maze, maze_size, mdp_args, stats, junctions)
         # For PI, obtain the policy and derive the path.
         policy: Dict[CoordinateType, Optional[CoordinateType]] = solver.get_policy()
-        path = get_path_from_policy(policy, (0, 0), solver.goal)
+        path = get_path_from_policy(policy, maze.start, solver.goal, len(solver.states))
     
     exec_time: float = time.time() - start_time
-    return exec_time, path
+    if memory is not None:
+        memory.stop()
+    return exec_time, path, stats.as_dict() if stats is not None else {}
+
+def run_job(job: Dict) -> Dict:
+    """
+    Run one (maze, algorithm, trial) job and return its CSV row.
+    Defined at module level so ProcessPoolExecutor workers can unpickle it;
+    each worker loads its maze from the shared corpus or maze file by key.
+
+    With profile_memory the maze is instead generated in memory from its key
+    (or loaded from its file) under a MemoryProfile, and the solve under a
+    second one, giving separate generation and solving peaks.
+    """
+    gen_memory = solve_memory = None
+    if job["profile_memory"]:
+        gen_memory = MemoryProfile()
+        solve_memory = MemoryProfile(top=job["top_allocations"])
+
+    if gen_memory is not None:
+        gen_memory.start()
+    if job["maze_file"]:
+        maze = Maze.load(job["maze_file"])
+    elif gen_memory is not None:
+        maze = generate(job["size"], job["seed"], job["generator"])
+    else:
+        corpus = MazeCorpus(job["cache_dir"], max_bytes=job["cache_bytes"])
+        maze = corpus.get(job["size"], job["seed"], job["generator"])
+    if gen_memory is not None:
+        gen_memory.stop()
+
+    exec_time, path, stats = run_experiment(
+        job["algorithm"], job["size"], job["mdp_args"], maze=maze,
+        collect_stats=job["collect_stats"], memory=solve_memory, junctions=job["junctions"],
+        open_list=job["open_list"], landmarks=job["landmarks"],
+    )
+    row = {
+        "Algorithm": job["label"],
+        "Maze_Size": job["size"],
+        "Execution_Time": f"{exec_time:.6f}",
+        "Path_Length": len(path) if path is not None else -1,
+        "Trial": job["trial"],
+        "Trials": job["trials"],
+        "Seed": maze.seed if maze.seed is not None else "",
+    }
+    if gen_memory is not None:
+        row.update({
+            "Gen_Peak_Traced_KB": f"{gen_memory.peak_traced_kb:.1f}",
+            "Gen_Peak_RSS_KB": gen_memory.peak_rss_kb,
+            "Solve_Peak_Traced_KB": f"{solve_memory.peak_traced_kb:.1f}",
+            "Solve_Peak_RSS_KB": solve_memory.peak_rss_kb,
+        })
+        if solve_memory.top_allocations:
+            row[TOP_ALLOCATIONS_KEY] = solve_memory.top_allocations
+    # Solver counters become extra columns, e.g. nodes_expanded -> Nodes_Expanded.
+    row.update({name.title(): value for name, value in stats.items()})
+    return row
+
+
+def run_batch(algorithm: str, mazes: List[Maze], mdp_args, collect_stats: bool = False) -> List[Dict]:
+    """
+    Solve same-size mazes together with MazeBatch ("bfs") or MazeBatchVI
+    ("vi") and return one row per maze, in the order given.
+
+    The timing covers stacking the mazes, solving and extracting every path,
+    and each row gets the per-maze share of it. With collect_stats, vi rows
+    carry each maze's own sweeps, backups and final delta.
+    """
+    size = mazes[0].width
+    start_time = time.time()
+    batch = MazeBatch(mazes)
+    if algorithm == "bfs":
+        paths = batch.paths()
+    else:
+        solver = MazeBatchVI(
+            batch,
+            gamma=mdp_args.get("gamma", 0.9),
+            move_cost=mdp_args.get("reward_step", -1),
+            goal_reward=mdp_args.get("reward_goal", 10) * size,
+            prune_dead_ends=mdp_args.get("prune_dead_ends", False),
+        )
+        solver.value_iteration(max_iter=int(mdp_args.get("max_iter", 100000)))
+        paths = [solver.get_path(k) for k in range(len(mazes))]
+    exec_time = (time.time() - start_time) / len(mazes)
+
+    rows = []
+    for k, (maze, path) in enumerate(zip(mazes, paths)):
+        row = {
+            "Algorithm": f"{algorithm}-batch",
+            "Maze_Size": size,
+            "Execution_Time": f"{exec_time:.6f}",
+            "Path_Length": len(path),
+            "Trial": k,
+            "Trials": len(mazes),
+            "Seed": maze.seed if maze.seed is not None else "",
+        }
+        if collect_stats and algorithm == "vi":
+            row.update({
+                "Sweeps": int(solver.iterations[k]),
+                "Backups": int(solver.backups()[k]),
+                "Final_Delta": float(solver.delta[k]),
+            })
+        rows.append(row)
+    return rows
+
+
+def toggle_walls(maze: Maze, count: int, rng: random.Random) -> None:
+    """Open or close `count` random interior walls through Maze.open_wall / close_wall."""
+    for _ in range(count):
+        if rng.random() < 0.5:
+            r, c, wall = rng.randrange(maze.height), rng.randrange(maze.width - 1), RIGHT
+        else:
+            r, c, wall = rng.randrange(maze.height - 1), rng.randrange(maze.width), BOTTOM
+        if maze.has_wall(r, c, wall):
+            maze.open_wall(r, c, wall)
+        else:
+            maze.close_wall(r, c, wall)
+
+
+def run_repair_benchmark(maze: Maze, edit_counts: List[int], seed: int) -> List[Dict]:
+    """
+    Time LPA* repairs against solving again from scratch as edits accumulate.
+
+    For each count the edits start from a fresh copy of the maze: LPAStar
+    solves it once (untimed), `count` random interior walls are toggled, and
+    the LPAStar repair is timed against new AStar and BFS solves of the edited
+    maze. Each of those gets its own copy of the edited walls, so both
+    rebuild the cached adjacency, as every re-solve after a wall change has to.
+    """
+    rows = []
+    for count in edit_counts:
+        edited = Maze(maze.width, height=maze.height, walls=bytearray(maze.walls))
+        planner = LPAStar(edited)
+        planner.solve()
+        toggle_walls(edited, count, random.Random(seed + count))
+
+        planner.stats = repair_stats = SearchStats()
+        start_time = time.time()
+        path = planner.solve()
+        repair_time = time.time() - start_time
+
+        astar_maze, bfs_maze = (
+            Maze(maze.width, height=maze.height, walls=bytearray(edited.walls)) for _ in range(2)
+        )
+        astar_stats = SearchStats()
+        start_time = time.time()
+        astar_path = AStar(astar_maze, stats=astar_stats).solve()
+        astar_time = time.time() - start_time
+
+        start_time = time.time()
+        BFS(bfs_maze).solve()
+        bfs_time = time.time() - start_time
+
+        if len(path) != len(astar_path):
+            raise RuntimeError(f"LPA* repair found a path of {len(path)} cells, A* {len(astar_path)}")
+        rows.append({
+            "Maze_Size": maze.width,
+            "Edits": count,
+            "Repair_Time": f"{repair_time:.6f}",
+            "Repair_Expanded": repair_stats.nodes_expanded,
+            "AStar_Time": f"{astar_time:.6f}",
+            "AStar_Expanded": astar_stats.nodes_expanded,
+            "BFS_Time": f"{bfs_time:.6f}",
+            "Path_Length": len(path),
+        })
+        print(
+            f"{count} edits on {maze.width} x {maze.height}: repair {repair_time:.4f}s, "
+            f"A* {astar_time:.4f}s, BFS {bfs_time:.4f}s"
+        )
+    return rows
+
+
+def run_warm_sweep(
+    maze: Maze,
+    algorithm: str,
+    mdp_args,
+    gammas: List[float],
+    edits: int,
+    seed: int,
+    junctions: bool = False,
+) -> List[Dict]:
+    """
+    Chain "vi" or "pi" solves over a gamma sweep, comparing warm and cold starts.
+
+    Every step solves the maze from zeros (cold) and from the policy of the
+    previous warm solve (warm); the first warm solve starts from the
+    shortest-path policy. Only the policy is carried over: warm_start then
+    starts from its exact values under the new gamma and walls. The previous
+    values themselves would be off by a lot after a gamma change, an error
+    that value iteration only shrinks by a factor of gamma per sweep.
+
+    With edits, that many random walls are toggled before every step after
+    the first, so the chain also covers re-solving after maze changes.
+    Iterations are value iteration sweeps for vi and improvement rounds for pi.
+    """
+    maze = Maze(maze.width, height=maze.height, walls=bytearray(maze.walls))
+    rng = random.Random(seed)
+    previous: Optional[Dict[CoordinateType, Optional[CoordinateType]]] = None
+    rows = []
+    for step, gamma in enumerate(gammas):
+        if step and edits:
+            toggle_walls(maze, edits, rng)
+        args = {**mdp_args, "gamma": gamma}
+        counts, times = [], []
+        for warm in (False, True):
+            stats = MDPStats()
+            start_time = time.time()
+            initial_policy = None
+            if warm:
+                initial_policy = previous if step else shortest_path_policy(maze)
+            solver = solve_mdp(
+                algorithm, maze, maze.width, args, stats, junctions, initial_policy=initial_policy
+            )
+            times.append(time.time() - start_time)
+            counts.append(stats.sweeps if algorithm == "vi" else stats.improvement_rounds)
+        previous = solver.get_policy()
+        rows.append({
+            "Algorithm": algorithm,
+            "Maze_Size": maze.width,
+            "Step": step,
+            "Gamma": gamma,
+            "Edits": edits if step else 0,
+            "Cold_Iterations": counts[0],
+            "Warm_Iterations": counts[1],
+            "Iterations_Saved": counts[0] - counts[1],
+            "Cold_Time": f"{times[0]:.6f}",
+            "Warm_Time": f"{times[1]:.6f}",
+        })
+        print(
+            f"{algorithm} on {maze.width} x {maze.height}, gamma {gamma}: "
+            f"{counts[0]} cold vs {counts[1]} warm iterations"
+        )
+    return rows
+
+
+def run_vi_grid(
+    maze: Maze,
+    gammas: List[float],
+    reward_steps: List[float],
+    reward_goals: List[float],
+    mdp_args,
+) -> List[Dict]:
+    """
+    Solve every (gamma, reward_step, reward_goal) combination with one
+    BatchedVI run and, for comparison, with one vectorized VI_MDP per
+    setting. Rows hold each setting's sweeps and path length; the batched
+    and separate total times are repeated on every row of the maze.
+    """
+    settings = list(itertools.product(gammas, reward_steps, reward_goals))
+    max_iter = int(mdp_args.get("max_iter", 100000))
+    prune = mdp_args.get("prune_dead_ends", False)
+
+    start_time = time.time()
+    batched = BatchedVI(maze, settings, prune_dead_ends=prune)
+    batched.value_iteration(max_iter=max_iter)
+    batched_time = time.time() - start_time
+
+    start_time = time.time()
+    for gamma, reward_step, reward_goal in settings:
+        solver = VI_MDP(
+            maze, gamma=gamma, move_cost=reward_step, goal_reward=reward_goal,
+            max_iter=max_iter, prune_dead_ends=prune,
+        )
+        solver.value_iteration(mode="vectorized")
+    separate_time = time.time() - start_time
+    print(
+        f"{len(settings)} settings on {maze.width} x {maze.height}: batched {batched_time:.4f}s, "
+        f"separate {separate_time:.4f}s"
+    )
+
+    rows = []
+    for index, (gamma, reward_step, reward_goal) in enumerate(settings):
+        path = batched.get_path(index)
+        rows.append({
+            "Maze_Size": maze.width,
+            "Gamma": gamma,
+            "Reward_Step": reward_step,
+            "Reward_Goal": reward_goal,
+            "Sweeps": int(batched.iterations[index]),
+            "Path_Length": len(path),
+            "Reaches_Goal": path[-1] == maze.goal,
+            "Batched_Time": f"{batched_time:.6f}",
+            "Separate_Time": f"{separate_time:.6f}",
+        })
+    return rows
+
+
+def result_key(job: Dict) -> str:
+    """
+    Manifest key of a job: its size, algorithm label, trial and seed, plus
+    every option that changes its result or its columns.
+    """
+    return job_key(
+        size=job["size"],
+        algorithm=job["label"],
+        trial=job["trial"],
+        seed=job["seed"],
+        params={
+            name: job[name]
+            for name in (
+                "generator", "maze_file", "mdp_args", "open_list", "landmarks",
+                "junctions", "collect_stats", "profile_memory",
+            )
+        },
+    )
+
+
+def write_results(log: ResultLog, jobs: List[Dict], results: Iterable[Dict]) -> Optional[Dict]:
+    """
+    Write result rows in job order as each job finishes; executor.map yields
+    them in that order too, so the rows on disk are always a prefix of the
+    jobs. Returns the slowest row that carries top allocation sites, if any.
+    """
+    slowest: Optional[Dict] = None
+    for job, row in zip(jobs, results):
+        if TOP_ALLOCATIONS_KEY in row:
+            if slowest is None or float(row["Execution_Time"]) > float(slowest["Execution_Time"]):
+                slowest = row
+            row = {key: value for key, value in row.items() if key != TOP_ALLOCATIONS_KEY}
+        log.write(result_key(job), row)
+        print(
+            f"Done: {job['label']} on a {job['size_name']} maze ({job['size']} x {job['size']}), "
+            f"trial {job['trial'] + 1}/{job['trials']} in {float(row['Execution_Time']):.4f}s, "
+            f"path length: {row['Path_Length']}"
+        )
+    return slowest
+
+
+def report_allocations(row: Dict, path: str) -> None:
+    """Write the top allocation sites of a profiled row to a text file."""
+    with open(path, "w") as f:
+        f.write(
+            f"Top allocation sites of {row['Algorithm']} on a {row['Maze_Size']} x {row['Maze_Size']} "
+            f"maze (trial {row['Trial'] + 1}), {float(row['Execution_Time']):.4f}s\n"
+        )
+        for line in row[TOP_ALLOCATIONS_KEY]:
+            f.write(line + "\n")
+    print(f"Top allocation sites of the slowest run saved to {path}")
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse an INDEX/COUNT shard argument."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected INDEX/COUNT, got {value!r}")
+    if not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be in 0..{count - 1}, got {index}")
+    return index, count
+
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Batch maze solving experiments")
+    parser.add_argument(
+        "--maze-file",
+        action="append",
+        default=[],
+        help="Run on this saved maze file instead of generated mazes (repeatable)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first trial's mazes")
+    parser.add_argument(
+        "--generator", choices=["kruskal", "eller"], default="kruskal", help="Maze generator"
+    )
+    parser.add_argument(
+        "--cache-dir", default=DEFAULT_CORPUS_DIR, help="Directory of the cached maze corpus"
+    )
+    parser.add_argument(
+        "--cache-size-mb", type=int, default=1024, help="Size cap of the maze corpus in MiB"
+    )
+    parser.add_argument(
+        "--trials", type=int, default=1, help="Repeated trials per (size, algorithm)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes; 1 runs every job in this process",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Collect per-solver search/MDP counters as extra CSV columns",
+    )
+    parser.add_argument(
+        "--junctions",
+        action="store_true",
+        help="Solve on the corridor-contracted junction graph instead of single cells",
+    )
+    parser.add_argument(
+        "--prune-dead-ends",
+        action="store_true",
+        help="MDP solvers only update cells left live by dead-end filling",
+    )
+    parser.add_argument(
+        "--open-list",
+        nargs="+",
+        choices=OPEN_LISTS,
+        default=["heap"],
+        help="Open lists to run A* with, each on the same mazes; "
+        "rows of non-heap runs are labelled e.g. astar-bucket",
+    )
+    parser.add_argument(
+        "--landmarks",
+        nargs="+",
+        type=int,
+        default=[0],
+        metavar="K",
+        help="Landmark counts to run A* with, 0 for the Manhattan heuristic; "
+        "rows of landmark runs are labelled e.g. astar-alt4",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Record peak traced and RSS memory of maze generation and of solving "
+        "(tracing inflates the timings)",
+    )
+    parser.add_argument(
+        "--dump-allocations",
+        type=int,
+        default=0,
+        metavar="N",
+        help="With --profile-memory, save the N largest allocation sites of the slowest run",
+    )
+    parser.add_argument(
+        "--repair-edits",
+        nargs="+",
+        type=int,
+        metavar="K",
+        help="Instead of the sweep, benchmark LPA* repairs after K random wall edits "
+        "against re-solving, on the first trial's maze of each size",
+    )
+    parser.add_argument(
+        "--warm-sweep",
+        nargs="+",
+        type=float,
+        metavar="GAMMA",
+        help="Instead of the sweep, chain vi and pi solves over these discount factors "
+        "on the first trial's maze of each size, comparing warm and cold starts",
+    )
+    parser.add_argument(
+        "--warm-edits",
+        type=int,
+        default=0,
+        metavar="K",
+        help="With --warm-sweep, toggle K random walls before every step after the first",
+    )
+    parser.add_argument(
+        "--vi-grid",
+        action="store_true",
+        help="Instead of the sweep, solve a grid of VI settings in one batched pass "
+        "on the first trial's maze of each size, timed against separate solves",
+    )
+    parser.add_argument(
+        "--grid-gamma", nargs="+", type=float, default=[0.8, 0.85, 0.9, 0.95, 0.99],
+        help="Discount factors of the --vi-grid grid",
+    )
+    parser.add_argument(
+        "--grid-reward-step", nargs="+", type=float, default=[-1, -2, -5, -10],
+        help="Step penalties of the --vi-grid grid",
+    )
+    parser.add_argument(
+        "--grid-reward-goal", nargs="+", type=float, default=[10, 100, 1000, 10000, 100000],
+        help="Goal rewards of the --vi-grid grid",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Solve bfs and vi for all trials of a size at once on stacked mazes; "
+        "rows are labelled bfs-batch and vi-batch and timed per maze",
+    )
+    parser.add_argument(
+        "--output", default=DEFAULT_OUTPUT, help="Results CSV of the sweep, or of --merge"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Keep the jobs already finished in --output (see its .manifest file) "
+        "and only run the rest",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=(0, 1),
+        metavar="INDEX/COUNT",
+        help="Only run every COUNT-th job starting at INDEX (0-based), e.g. 1/4, "
+        "to split a sweep over separate runs",
+    )
+    parser.add_argument(
+        "--merge",
+        nargs="+",
+        metavar="CSV",
+        help="Merge the results CSVs of separate runs into --output and exit",
+    )
+    args = parser.parse_args()
+    if args.merge:
+        count = merge_logs(args.merge, args.output)
+        print(f"Merged {count} results from {len(args.merge)} runs into {args.output}")
+        return
+    if args.batch and (args.junctions or args.profile_memory):
+        parser.error("--batch cannot be combined with --junctions or --profile-memory")
+    if args.dump_allocations and not args.profile_memory:
+        parser.error("--dump-allocations requires --profile-memory")
+    corpus = MazeCorpus(args.cache_dir, max_bytes=args.cache_size_mb << 20)
+
     # Define maze sizes: small, medium, and large.
     sizes: Dict[str, int] = {
         "small": 10,   # For example, a 10x10 maze.
@@ -77,40 +667,167 @@ def main() -> None:
         "large": 50   # For example, a 100x100 maze.
     }
     # List of algorithms to test.
-    algorithms: List[str] = ["bfs", "dfs", "astar", "vi", "pi"]
+    algorithms: List[str] = ["bfs", "bibfs", "dfs", "astar", "vi", "pi"]
 
     # Extra arguments for MDP algorithms.
     mdp_args: Dict[str, float] = {
         "gamma": 0.9,
         "reward_goal": 100,   # You may adjust these values as needed.
         "reward_step": -1,
-        "max_iter": 100000
+        "max_iter": 100000,
+        "prune_dead_ends": args.prune_dead_ends,
     }
 
-    # Open a CSV file to store the batch experiment results.
-    output_csv: str = "../data/batch_experiment_results.csv"
-    with open(output_csv, mode="w", newline="") as csvfile:
-        fieldnames: List[str] = ["Algorithm", "Maze_Size", "Execution_Time", "Path_Length"]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
+    # Every algorithm solves the same maze per (size, trial): either a loaded
+    # maze file or the corpus maze for (size, seed + trial, generator).
+    # Corpus mazes are generated here, before any job starts, so workers only
+    # load them and generation is never part of the timing.
+    maze_files: Dict[str, Optional[str]] = {name: None for name in sizes}
+    if args.maze_file:
+        maze_files = {path: path for path in args.maze_file}
+        sizes = {path: Maze.load(path).width for path in args.maze_file}
+    else:
+        for size in sizes.values():
+            for trial in range(args.trials):
+                corpus.get(size, args.seed + trial, args.generator)
+
+    if args.repair_edits or args.warm_sweep or args.vi_grid:
+        if args.repair_edits:
+            output_csv = "../data/repair_benchmark.csv"
+        elif args.warm_sweep:
+            output_csv = "../data/warm_start_results.csv"
+        else:
+            output_csv = "../data/vi_grid_results.csv"
+        with open(output_csv, mode="w", newline="") as csvfile:
+            writer = None
+            for size_name, size in sizes.items():
+                if maze_files[size_name]:
+                    maze = Maze.load(maze_files[size_name])
+                else:
+                    maze = corpus.get(size, args.seed, args.generator)
+                if args.repair_edits:
+                    rows = run_repair_benchmark(maze, args.repair_edits, args.seed)
+                elif args.vi_grid:
+                    rows = run_vi_grid(
+                        maze, args.grid_gamma, args.grid_reward_step, args.grid_reward_goal, mdp_args
+                    )
+                else:
+                    rows = [
+                        row
+                        for alg in ["vi", "pi"]
+                        for row in run_warm_sweep(
+                            maze, alg, mdp_args, args.warm_sweep, args.warm_edits,
+                            args.seed, args.junctions,
+                        )
+                    ]
+                for row in rows:
+                    if writer is None:
+                        writer = csv.DictWriter(csvfile, fieldnames=list(row))
+                        writer.writeheader()
+                    writer.writerow(row)
+        print(f"Results saved to {output_csv}")
+        return
+
+    # A* runs once per requested open list and landmark count; the others once.
+    variants: List[Tuple[str, str, int]] = [
+        (alg, open_list, landmarks)
+        for alg in algorithms
+        for open_list in (args.open_list if alg == "astar" else ["heap"])
+        for landmarks in (args.landmarks if alg == "astar" else [0])
+    ]
+    jobs: List[Dict] = [
+        {
+            "algorithm": alg,
+            "label": alg
+            + (f"-{open_list}" if open_list != "heap" else "")
+            + (f"-alt{landmarks}" if landmarks > 0 else ""),
+            "open_list": open_list,
+            "landmarks": landmarks,
+            "size": size,
+            "size_name": size_name,
+            "trial": trial,
+            "trials": args.trials,
+            "seed": args.seed + trial,
+            "generator": args.generator,
+            "maze_file": maze_files[size_name],
+            "cache_dir": args.cache_dir,
+            "cache_bytes": corpus.max_bytes,
+            "mdp_args": mdp_args,
+            "collect_stats": args.stats,
+            "junctions": args.junctions,
+            "profile_memory": args.profile_memory,
+            "top_allocations": args.dump_allocations,
+        }
+        for size_name, size in sizes.items()
+        for trial in range(args.trials)
+        for alg, open_list, landmarks in variants
+    ]
+    # A shard takes every COUNT-th job; --batch solves its trials of a size together.
+    shard, shard_count = args.shard
+    jobs = jobs[shard::shard_count]
+    batch_jobs: List[Dict] = []
+    if args.batch:
+        batch_jobs = [
+            {**job, "label": f"{job['algorithm']}-batch"}
+            for job in jobs
+            if job["algorithm"] in BATCHED_ALGORITHMS
+        ]
+        jobs = [job for job in jobs if job["algorithm"] not in BATCHED_ALGORITHMS]
+
+    output_csv: str = args.output
+    fieldnames: List[str] = ["Algorithm", "Maze_Size", "Execution_Time"]
+    if args.profile_memory:
+        fieldnames += MEMORY_COLUMNS
+    fieldnames += ["Path_Length", "Trial", "Trials", "Seed"]
+    if args.stats:
+        fieldnames += [
+            name.title() for name in [*vars(SearchStats()), *vars(MDPStats())]
+        ]
+    # Rows are streamed to disk as jobs finish. With --resume, jobs already in
+    # the manifest are skipped, so an interrupted sweep picks up where it stopped.
+    try:
+        log = ResultLog(output_csv, fieldnames, resume=args.resume)
+    except ValueError as error:
+        parser.error(str(error))
+    with log:
+        skipped = len(jobs) + len(batch_jobs)
+        jobs = [job for job in jobs if result_key(job) not in log.done]
+        batch_jobs = [job for job in batch_jobs if result_key(job) not in log.done]
+        skipped -= len(jobs) + len(batch_jobs)
+        if skipped:
+            print(f"Skipping {skipped} jobs already finished in {output_csv}")
+
+        print(f"Running {len(jobs)} jobs on {args.workers} worker(s)...")
+        if args.workers > 1:
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                slowest = write_results(log, jobs, executor.map(run_job, jobs))
+        else:
+            slowest = write_results(log, jobs, map(run_job, jobs))
 
-        # Loop over each maze size and algorithm.
         for size_name, size in sizes.items():
-            for alg in algorithms:
-                print(f"Running {alg} on a {size_name} maze ({size} x {size})...")
-                exec_time, path = run_experiment(alg, size, mdp_args)
-                path_length: int = len(path) if path is not None else -1
-
-                writer.writerow({
-                    "Algorithm": alg,
-                    "Maze_Size": size,
-                    "Execution_Time": f"{exec_time:.6f}",
-                    "Path_Length": path_length
-                })
-                print(f"Done: {alg} on {size} x {size} in {exec_time:.4f}s, path length: {path_length}")
+            for alg in BATCHED_ALGORITHMS:
+                group = [
+                    job for job in batch_jobs
+                    if job["size_name"] == size_name and job["algorithm"] == alg
+                ]
+                if not group:
+                    continue
+                if maze_files[size_name]:
+                    mazes = [Maze.load(maze_files[size_name]) for _ in group]
+                else:
+                    mazes = [corpus.get(size, job["seed"], args.generator) for job in group]
+                rows = run_batch(alg, mazes, mdp_args, args.stats)
+                for job, row in zip(group, rows):
+                    row.update({"Trial": job["trial"], "Trials": job["trials"]})
+                    log.write(result_key(job), row)
+                print(
+                    f"Done: {alg}-batch on {len(mazes)} {size_name} mazes ({size} x {size}) "
+                    f"in {float(rows[0]['Execution_Time']):.4f}s per maze"
+                )
 
     print(f"Batch experiment results saved to {output_csv}")
+    if slowest is not None:
+        report_allocations(slowest, "../data/top_allocations.txt")
 
 if __name__ == "__main__":
     main()
-
@@ -6,22 +6,53 @@ from typing import Dict, Optional
 from algorithm.mdp.policy_iteration import PI_MDP
 from algorithm.mdp.value_iteration import VI_MDP
 from algorithm.search.bfs import BFS
+from algorithm.search.bidirectional_bfs import BidirectionalBFS
+from algorithm.search.junction_search import JunctionSearch
 from maze import Maze
+from maze.distance_field import distance_field
 from algorithm.search.dfs import DFS
-from algorithm.search.astar import AStar
-from utils import Visualizer
+from algorithm.search.astar import OPEN_LISTS, AStar
+from utils import LandmarkHeuristic, Visualizer
+from utils.stats import SearchStats
 from utils.types import CoordinateType
 from utils.utils import get_path_from_policy
 
 
 def main():
     parser = argparse.ArgumentParser(description="Maze Solver AI")
-    parser.add_argument("--size", type=int, required=True, help="Maze size (N x N)")
+    parser.add_argument("--size", type=int, help="Maze size (N x N)")
+    parser.add_argument(
+        "--maze-file", type=str, help="Load the maze from a saved maze file instead of generating one"
+    )
+    parser.add_argument("--save-maze", type=str, help="Save the generated maze to this file")
     parser.add_argument("--visualize", action="store_true", help="Visualize the Maze")
+    parser.add_argument(
+        "--heatmap",
+        action="store_true",
+        help="With --visualize, shade every cell by its distance to the goal",
+    )
+    parser.add_argument(
+        "--junctions",
+        action="store_true",
+        help="Solve on the corridor-contracted junction graph instead of single cells",
+    )
+    parser.add_argument(
+        "--open-list",
+        choices=OPEN_LISTS,
+        default="heap",
+        help="Open list of A*: a binary heap or one bucket per f value",
+    )
+    parser.add_argument(
+        "--landmarks",
+        type=int,
+        default=0,
+        metavar="K",
+        help="Use the ALT heuristic with K landmarks for A* instead of the Manhattan distance",
+    )
     parser.add_argument(
         "--algorithm",
         type=str,
-        choices=["bfs", "dfs", "astar", "vi", "pi"],
+        choices=["bfs", "bibfs", "dfs", "astar", "vi", "pi"],
         required=True,
         help="Algorithm used to solve the maze",
     )
@@ -33,27 +64,49 @@ def main():
     parser.add_argument("--reward_step", type=int, help="Step penalty (MDP Only)")
     parser.add_argument("--gamma", type=float, help="Discount Factor (MDP Only)")
     parser.add_argument("--max_iter", type=float, help="Maximum Iterations (MDP Only)")
+    parser.add_argument(
+        "--prune-dead-ends",
+        action="store_true",
+        help="Only update cells left live by dead-end filling (MDP Only)",
+    )
 
     args = parser.parse_args()
-    maze = Maze(args.size)
-    maze.generate()
+    if args.maze_file:
+        maze = Maze.load(args.maze_file)
+        args.size = maze.width
+    elif args.size is None:
+        parser.error("either --size or --maze-file is required")
+    else:
+        maze = Maze(args.size)
+        maze.generate()
+    if args.save_maze:
+        maze.save(args.save_maze)
     path = []
 
-    if args.algorithm in ["dfs", "bfs", "astar"]:
+    if args.algorithm in ["dfs", "bfs", "bibfs", "astar"]:
+        stats = SearchStats()
         start_time = time.time()
 
-        if args.algorithm == "astar":
-            solver = AStar(maze)
-        if args.algorithm == "bfs":
-            solver = BFS(maze)
+        if args.junctions:
+            strategy = "bfs" if args.algorithm == "bibfs" else args.algorithm
+            solver = JunctionSearch(maze, strategy, stats=stats)
+        elif args.algorithm == "astar":
+            heuristic = LandmarkHeuristic.for_maze(maze, args.landmarks) if args.landmarks > 0 else None
+            solver = AStar(maze, stats=stats, open_list=args.open_list, heuristic=heuristic)
+        elif args.algorithm == "bfs":
+            solver = BFS(maze, stats=stats)
+        elif args.algorithm == "bibfs":
+            solver = BidirectionalBFS(maze, stats=stats)
         else:
-            solver = DFS(maze)  # add a default algorithm rather than this
+            solver = DFS(maze, stats=stats)
 
         path = solver.solve()
         exec_time = time.time() - start_time
         print(
             f"Execution time for ALGORITHM [{args.algorithm.capitalize()}] on SIZE: [{args.size} x {args.size}] : {exec_time}"
         )
+        searched = len(maze.junction_graph()) if args.junctions else maze.width * maze.height
+        print(f"Nodes expanded: {stats.nodes_expanded} of {searched}")
 
     # if mdp algo is chosen
     else:
@@ -65,12 +118,13 @@ def main():
                 args.gamma,
                 args.reward_step,
                 args.reward_goal,
-                args.max_iter
+                args.max_iter,
+                prune_dead_ends=args.prune_dead_ends,
             )
 
-            solver.value_iteration()
+            solver.value_iteration(mode="junction" if args.junctions else "loop")
             policy: Dict[CoordinateType, Optional[CoordinateType]] = solver.get_policy()
-            path = get_path_from_policy(policy, (0, 0), solver.goal)
+            path = get_path_from_policy(policy, maze.start, solver.goal, len(solver.states))
             exec_time = time.time() - start_time
             print(
                 f"Execution time for ALGORITHM [{args.algorithm.capitalize()}] on SIZE: [{args.size} x {args.size}] : {exec_time}"
@@ -82,10 +136,11 @@ def main():
                 args.gamma,
                 args.reward_step,
                 args.reward_goal,
+                prune_dead_ends=args.prune_dead_ends,
             )
-            solver.policy_iteration()            
+            solver.policy_iteration(mode="junction" if args.junctions else "loop")
             policy: Dict[CoordinateType, Optional[CoordinateType]] = solver.get_policy()
-            path = get_path_from_policy(policy, (0, 0), solver.goal)
+            path = get_path_from_policy(policy, maze.start, solver.goal, len(solver.states))
             exec_time = time.time() - start_time
             print(
                 f"Execution time for ALGORITHM [{args.algorithm.capitalize()}] on SIZE: [{args.size} x {args.size}] : {exec_time}"
@@ -93,7 +148,8 @@ def main():
 
     if args.visualize:
         visualizer = Visualizer(maze)
-        visualizer.visualize(path)
+        heatmap = distance_field(maze, [maze.goal])[0] if args.heatmap else None
+        visualizer.visualize(path, heatmap=heatmap)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 
 
-from .maze import Maze
-from .cell import Cell
+from .maze import Maze, WallChange
+from .batch import MazeBatch
+from .cell import Cell, TOP, RIGHT, BOTTOM, LEFT, ALL_WALLS, WALL_BITS
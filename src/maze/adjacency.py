@@ -0,0 +1,51 @@
+from array import array
+from itertools import accumulate
+
+from .walls import DEGREE, DIRECTIONS, bounded_walls, steps
+
+
+class Adjacency:
+    """
+    Compressed sparse row (CSR) adjacency of the open passages of a maze.
+
+    Cells are flat row-major ids. The open neighbours of cell i are
+    ``neighbours[offsets[i]:offsets[i + 1]]``, listed in the up, down, left,
+    right order the search solvers have always tried them in, so solvers
+    running on ids visit cells in the same order as on (row, col) pairs.
+    Build it with ``Maze.adjacency()``, which caches it on the maze.
+    """
+
+    def __init__(self, maze) -> None:
+        walls = bounded_walls(maze)
+        step = steps(maze.width)
+        typecode = "i" if maze.width * maze.height < 2**31 else "q"
+        # Offsets to the open neighbours for every possible wall byte.
+        moves = [tuple(step[d] for d in DIRECTIONS if not walls_byte & d) for walls_byte in range(256)]
+
+        self.width: int = maze.width
+        self.size: int = len(walls)
+        self.offsets = array(typecode, [0])
+        self.offsets.extend(accumulate(walls.translate(DEGREE)))
+        self.neighbours = array(typecode)
+        append = self.neighbours.append
+        for cell, walls_byte in enumerate(walls):
+            for move in moves[walls_byte]:
+                append(cell + move)
+
+    def distances(self, source: int) -> array:
+        """Moves from source to every cell by breadth-first search, -1 where unreachable."""
+        offsets, neighbours = self.offsets, self.neighbours
+        distance = array(offsets.typecode, [-1]) * self.size
+        distance[source] = 0
+        frontier = [source]
+        level = 0
+        while frontier:
+            level += 1
+            next_frontier = []
+            for cell in frontier:
+                for neighbour in neighbours[offsets[cell]:offsets[cell + 1]]:
+                    if distance[neighbour] < 0:
+                        distance[neighbour] = level
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        return distance
@@ -0,0 +1,85 @@
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .distance_field import MOVES, level_bfs
+from .walls import bounded_walls
+
+
+class MazeBatch:
+    """
+    K mazes of the same size stacked into arrays, to solve them together.
+
+    - walls: (K, height, width) uint8 wall bytes with every border wall
+      closed, so no move leaves its own maze.
+    - starts, goals: (K,) flat cell indices within each maze.
+
+    Running a solver per maze pays Python overhead on every call, which
+    dominates on corpora of many small mazes. Searches over a batch instead
+    do one set of array operations per BFS level or VI sweep for all K
+    mazes at once. See MazeBatchVI for value iteration over a batch.
+    """
+
+    def __init__(self, mazes: Sequence) -> None:
+        if not mazes:
+            raise ValueError("A maze batch needs at least one maze")
+        width, height = mazes[0].width, mazes[0].height
+        for maze in mazes:
+            if (maze.width, maze.height) != (width, height):
+                raise ValueError(
+                    f"Mazes of a batch must all be {width} x {height}, got {maze.width} x {maze.height}"
+                )
+        self.mazes: List = list(mazes)
+        self.width: int = width
+        self.height: int = height
+        self.walls = np.frombuffer(
+            b"".join(bounded_walls(maze) for maze in mazes), dtype=np.uint8
+        ).reshape(len(mazes), height, width)
+        self.starts = np.array([maze.index(*maze.start) for maze in mazes], dtype=np.int64)
+        self.goals = np.array([maze.index(*maze.goal) for maze in mazes], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.mazes)
+
+    def distance_fields(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        distance_field of every maze towards its own goal, from one
+        level-synchronous BFS over the whole stack.
+
+        Returns (K, height, width) int32 distances (-1 where the goal cannot
+        be reached) and uint8 wall-bit directions of a first shortest move.
+        """
+        n = self.width * self.height
+        sources = np.arange(len(self)) * n + self.goals
+        distance, direction = level_bfs(self.walls.ravel(), self.width, sources)
+        shape = self.walls.shape
+        return distance.reshape(shape), direction.reshape(shape)
+
+    def path_lengths(self) -> np.ndarray:
+        """
+        (K,) number of cells on a shortest start-to-goal path of every maze,
+        the len() of BFS(maze).solve(); 0 where the goal cannot be reached.
+        """
+        distance = self.distance_fields()[0].reshape(len(self), -1)
+        moves = distance[np.arange(len(self)), self.starts]
+        return np.where(moves >= 0, moves + 1, 0)
+
+    def paths(self) -> List[List[Tuple[int, int]]]:
+        """
+        A shortest start-to-goal path of every maze as (row, column) cells,
+        following the distance fields' directions; [] where there is none.
+        """
+        distance, direction = self.distance_fields()
+        result = []
+        for k, maze in enumerate(self.mazes):
+            r, c = maze.start
+            if distance[k, r, c] < 0:
+                result.append([])
+                continue
+            path = [(r, c)]
+            while distance[k, r, c] > 0:
+                dr, dc = MOVES[int(direction[k, r, c])]
+                r, c = r + dr, c + dc
+                path.append((r, c))
+            result.append(path)
+        return result
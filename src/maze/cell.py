@@ -1,10 +1,72 @@
+from typing import Iterator, MutableMapping
+
+# Wall bits packed into one byte per cell in ``Maze.walls``.
+TOP = 1
+RIGHT = 2
+BOTTOM = 4
+LEFT = 8
+ALL_WALLS = TOP | RIGHT | BOTTOM | LEFT
+
+WALL_BITS = {
+    "top": TOP,
+    "right": RIGHT,
+    "bottom": BOTTOM,
+    "left": LEFT,
+}
+
+
+class CellWalls(MutableMapping[str, bool]):
+    """
+    Dict-like view of one cell's walls, read from and written to the maze's
+    packed wall array. Keys are "top", "right", "bottom" and "left".
+    """
+
+    def __init__(self, maze, index: int) -> None:
+        self._maze = maze
+        self._index = index
+
+    def __getitem__(self, key: str) -> bool:
+        return bool(self._maze.walls[self._index] & WALL_BITS[key])
+
+    def __setitem__(self, key: str, closed: bool) -> None:
+        self._maze.set_wall(self._index, WALL_BITS[key], closed)
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError("Cell walls cannot be removed, only opened or closed")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(WALL_BITS)
+
+    def __len__(self) -> int:
+        return len(WALL_BITS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class _OwnWalls:
+    """One-cell wall store for a Cell built without a maze; all walls start closed."""
+
+    def __init__(self) -> None:
+        self.walls = bytearray([ALL_WALLS])
+
+    def set_wall(self, index: int, wall: int, closed: bool) -> None:
+        if closed:
+            self.walls[index] |= wall
+        else:
+            self.walls[index] &= ~wall
+
+
 class Cell:
-    def __init__(self, x, y) -> None:
+    """
+    Lazy view of a single maze cell; nothing is stored per cell.
+    Built without a maze, the cell holds its own walls, all closed.
+    """
+
+    def __init__(self, x, y, maze=None) -> None:
         self.x = x
         self.y = y
-        self.walls = {
-            "top": True,
-            "right": True,
-            "left": True,
-            "bottom": True,
-        }
+        if maze is None:
+            self.walls = CellWalls(_OwnWalls(), 0)
+        else:
+            self.walls = CellWalls(maze, x * maze.width + y)
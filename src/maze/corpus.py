@@ -0,0 +1,109 @@
+import hashlib
+import os
+import tempfile
+from typing import Union
+
+from . import eller
+from .maze import Maze
+
+GENERATORS = ("kruskal", "eller")
+SUFFIX = ".maze"
+
+
+def generate(size: int, seed: int, generator: str = "kruskal") -> Maze:
+    """Generate the maze for a corpus key in memory, without touching the cache."""
+    if generator == "eller":
+        maze = Maze(size, walls=bytearray(b"".join(eller.generate_rows(size, size, seed))))
+        maze.seed, maze.generator = seed, "eller"
+    elif generator == "kruskal":
+        maze = Maze(size)
+        maze.generate(seed)
+    else:
+        raise ValueError(f"Unknown maze generator: {generator}")
+    return maze
+
+
+def _umask() -> int:
+    """The process umask, which can only be read by setting it."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+class MazeCorpus:
+    """
+    On-disk cache of generated mazes keyed by (size, seed, generator).
+
+    Each maze is stored once in the binary maze format under a file name
+    derived from a hash of its key. A given key therefore always maps to the
+    same file, and any run asking for it gets the identical maze. Reading a
+    maze refreshes its modification time. When the files exceed ``max_bytes``,
+    the least recently used ones are deleted. Files are written to a temporary
+    name and renamed into place, so several processes can share one corpus.
+    """
+
+    def __init__(self, root: Union[str, os.PathLike], max_bytes: int = 1 << 30) -> None:
+        self.root = os.fspath(root)
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def key(size: int, seed: int, generator: str = "kruskal") -> str:
+        """Stable content key for a maze."""
+        return hashlib.sha256(f"{generator}:{size}:{seed}".encode()).hexdigest()[:32]
+
+    def path(self, size: int, seed: int, generator: str = "kruskal") -> str:
+        return os.path.join(self.root, self.key(size, seed, generator) + SUFFIX)
+
+    def get(self, size: int, seed: int, generator: str = "kruskal", use_mmap: bool = True) -> Maze:
+        """Load the maze for this key, generating and storing it on a miss."""
+        if generator not in GENERATORS:
+            raise ValueError(f"Unknown maze generator: {generator}")
+        path = self.path(size, seed, generator)
+        try:
+            os.utime(path)  # mark as most recently used
+            return Maze.load(path, use_mmap=use_mmap)
+        except FileNotFoundError:
+            pass  # a miss, or evicted by another process since the lookup
+        self._build(path, size, seed, generator)
+        self._evict(keep=path)
+        return Maze.load(path, use_mmap=use_mmap)
+
+    def _build(self, path: str, size: int, seed: int, generator: str) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        os.close(fd)
+        try:
+            if generator == "eller":
+                eller.write_file(tmp_path, size, size, seed)
+            else:
+                maze = Maze(size)
+                maze.generate(seed)
+                maze.save(tmp_path)
+            # mkstemp creates owner-only files; use the mode open() would give.
+            os.chmod(tmp_path, 0o666 & ~_umask())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def _evict(self, keep: str) -> None:
+        """Delete least recently used mazes until the corpus fits in max_bytes."""
+        entries = []
+        for entry in os.scandir(self.root):
+            if entry.name.endswith(SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # evicted by another process while listing
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # already evicted by another process
+            total -= size
@@ -0,0 +1,38 @@
+from collections import deque
+
+from .walls import DEGREE, DIRECTIONS, bounded_walls, steps
+
+
+def fill_dead_ends(maze) -> bytearray:
+    """
+    Dead-end filling: repeatedly wall off cells with at most one open
+    neighbour, other than the start and the goal, until none is left.
+
+    Returns a mask with one byte per cell in the layout of ``Maze.walls``:
+    1 for live cells, 0 for filled ones. No filled cell can be on a simple
+    path from start to goal, so in a perfect maze the live cells are exactly
+    the solution path, while loops and everything between them stay live.
+    Each cell is queued at most once, so the pass is linear in the maze size.
+    The maze itself is not modified.
+    """
+    n = maze.width * maze.height
+    walls = bounded_walls(maze)
+    step = steps(maze.width)
+    degree = bytearray(walls.translate(DEGREE))
+    keep = {maze.index(*maze.start), maze.index(*maze.goal)}
+
+    live = bytearray(b"\x01") * n
+    queue = deque(cell for cell in range(n) if degree[cell] <= 1 and cell not in keep)
+    while queue:
+        cell = queue.popleft()
+        live[cell] = 0
+        for direction in DIRECTIONS:
+            if walls[cell] & direction:
+                continue
+            neighbour = cell + step[direction]
+            if live[neighbour]:
+                degree[neighbour] -= 1
+                # Degrees only fall, so a cell reaches 1 at most once.
+                if degree[neighbour] == 1 and neighbour not in keep:
+                    queue.append(neighbour)
+    return live
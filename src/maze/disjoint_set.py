@@ -0,0 +1,37 @@
+from array import array
+
+
+class DisjointSet:
+    """
+    Union-find over the integer ids 0..n-1.
+
+    Parents and set sizes live in flat arrays, ``find`` is iterative with path
+    halving and ``union`` links the smaller set under the larger one, so the
+    trees stay shallow and no recursion is needed however large n gets.
+    """
+
+    def __init__(self, n: int) -> None:
+        typecode = "i" if n < 2**31 else "q"
+        self.parent = array(typecode, range(n))
+        self.size = array(typecode, [1]) * n
+
+    def find(self, x: int) -> int:
+        """Return the representative of the set containing x."""
+        parent = self.parent
+        while parent[x] != x:
+            # Path halving: point x at its grandparent while walking up.
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets containing a and b. Returns False if already joined."""
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return False
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return True
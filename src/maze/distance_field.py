@@ -0,0 +1,83 @@
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+from .cell import BOTTOM, LEFT, RIGHT, TOP
+from .walls import bounded_walls, steps
+
+# Moves tried from each cell, in the right, left, down, up order of the MDP
+# solvers' actions: among equally short routes the first of these wins.
+FIELD_WALLS = (RIGHT, LEFT, BOTTOM, TOP)
+MOVES = {TOP: (-1, 0), RIGHT: (0, 1), BOTTOM: (1, 0), LEFT: (0, -1)}
+
+
+def distance_field(maze, sources: Iterable[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Moves from every cell to the nearest of the source cells, by a
+    breadth-first search run backwards from the sources.
+
+    The search is level-synchronous: each BFS level is one set of array
+    operations over the packed wall bytes of the frontier cells, rather than
+    a Python loop over cells. A cell joins the next level when its own wall
+    towards a frontier cell is open, so distances follow the moves the
+    solvers can make.
+
+    Returns two (height, width) arrays:
+    - int32 distances, -1 for cells that cannot reach a source.
+    - uint8 directions: the wall bit (TOP, RIGHT, BOTTOM or LEFT) of the first
+      move of a shortest route towards the sources, 0 for the sources and
+      unreachable cells. Ties go to the first move in right, left, down, up
+      order, like the MDP solvers' greedy policies.
+    """
+    width, height = maze.width, maze.height
+    walls = np.frombuffer(bounded_walls(maze), dtype=np.uint8)
+    sources = np.array([r * width + c for r, c in sources], dtype=np.int64)
+    distance, direction = level_bfs(walls, width, sources)
+    return distance.reshape(height, width), direction.reshape(height, width)
+
+
+def level_bfs(walls: np.ndarray, width: int, sources: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The level-synchronous search behind distance_field, on flat arrays.
+
+    walls holds the wall bytes of rows of the given width with every border
+    wall closed (see bounded_walls), and sources the flat indices to search
+    from. The closed borders are all that keeps a move inside its maze, so
+    several mazes stacked row after row are searched at once, each from the
+    sources inside it. Returns flat distance and direction arrays.
+    """
+    n = walls.size
+    step = steps(width)
+    distance = np.full(n, -1, dtype=np.int32)
+    direction = np.zeros(n, dtype=np.uint8)
+    frontier = np.unique(sources)
+    distance[frontier] = 0
+    level = 0
+    while frontier.size:
+        level += 1
+        found, moves = [], []
+        for wall in FIELD_WALLS:
+            # Cells whose move through this wall lands on a frontier cell.
+            cells = frontier - step[wall]
+            cells = cells[(cells >= 0) & (cells < n)]
+            cells = cells[(walls[cells] & wall) == 0]
+            found.append(cells[distance[cells] < 0])
+            moves.append(np.full(found[-1].size, wall, dtype=np.uint8))
+        found, moves = np.concatenate(found), np.concatenate(moves)
+        # A cell reached through several walls keeps the first in FIELD_WALLS order.
+        frontier, first = np.unique(found, return_index=True)
+        distance[frontier] = level
+        direction[frontier] = moves[first]
+    return distance, direction
+
+
+def policy_from_field(directions: np.ndarray) -> Dict[Tuple[int, int], Tuple[int, int]]:
+    """
+    {(r, c): (dr, dc)} policy following a distance field's directions, in the
+    form get_path_from_policy expects. Cells without a direction are left out.
+    """
+    rows, cols = np.nonzero(directions)
+    return {
+        (r, c): MOVES[wall]
+        for r, c, wall in zip(rows.tolist(), cols.tolist(), directions[rows, cols].tolist())
+    }
@@ -0,0 +1,101 @@
+import os
+import random
+from typing import BinaryIO, Callable, Iterator, Optional, Union
+
+from .cell import ALL_WALLS, BOTTOM, LEFT, RIGHT, TOP
+from .disjoint_set import DisjointSet
+from .maze import Maze
+from .storage import MazeHeader, write_header
+
+RowSink = Union[BinaryIO, Callable[[bytes], object]]
+
+
+def generate_rows(width: int, height: int, seed: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Generate a perfect maze one row at a time with Eller's algorithm.
+
+    Yields ``height`` rows of ``width`` wall bytes in the same layout as
+    ``Maze.walls``. Only the set membership of the current row is kept, so
+    memory is O(width) however many rows are produced.
+    """
+    rng = random.Random(seed)
+    # Set label of each column in the current row, always in range(width).
+    labels = list(range(width))
+    open_top = [False] * width
+
+    for r in range(height):
+        last_row = r == height - 1
+        row = bytearray([ALL_WALLS]) * width
+        for c in range(width):
+            if open_top[c]:
+                row[c] &= ~TOP
+
+        # Randomly join neighbours from different sets; the last row joins all of them.
+        sets = DisjointSet(width)
+        for c in range(width - 1):
+            left, right = sets.find(labels[c]), sets.find(labels[c + 1])
+            if left != right and (last_row or rng.random() < 0.5):
+                row[c] &= ~RIGHT
+                row[c + 1] &= ~LEFT
+                sets.union(left, right)
+        labels = [sets.find(label) for label in labels]
+
+        if last_row:
+            yield bytes(row)
+            break
+
+        # Open at least one wall downwards from every set. Each column opens
+        # with probability 1/2; a set that drew none opens one random member,
+        # picked by reservoir sampling while scanning.
+        open_top = [False] * width
+        members = {}  # label -> (members seen, candidate column, opened any)
+        for c in range(width):
+            label = labels[c]
+            seen, candidate, opened = members.get(label, (0, c, False))
+            seen += 1
+            if rng.randrange(seen) == 0:
+                candidate = c
+            if rng.random() < 0.5:
+                open_top[c] = True
+                opened = True
+            members[label] = (seen, candidate, opened)
+        for seen, candidate, opened in members.values():
+            if not opened:
+                open_top[candidate] = True
+        for c in range(width):
+            if open_top[c]:
+                row[c] &= ~BOTTOM
+        yield bytes(row)
+
+        # Cells below an opening keep their set; the rest start new ones.
+        # Relabel into range(width) so the next row's union-find stays small.
+        kept = {labels[c] for c in range(width) if open_top[c]}
+        free = iter(label for label in range(width) if label not in kept)
+        labels = [labels[c] if open_top[c] else next(free) for c in range(width)]
+
+
+def write_rows(
+    sink: RowSink, width: int, height: int, seed: Optional[int] = None
+) -> None:
+    """
+    Stream an Eller maze row by row into a binary file object (anything with
+    ``write``) or a callable that receives each row's bytes.
+    """
+    emit = sink.write if hasattr(sink, "write") else sink
+    for row in generate_rows(width, height, seed):
+        emit(row)
+
+
+def read_rows(source: BinaryIO, width: int, height: int) -> Maze:
+    """Load a maze streamed by ``write_rows`` back into a Maze."""
+    walls = bytearray(source.read(width * height))
+    return Maze(width, height, walls=walls)
+
+
+def write_file(
+    path: Union[str, os.PathLike], width: int, height: int, seed: Optional[int] = None
+) -> None:
+    """Stream an Eller maze straight into a file readable with ``Maze.load``."""
+    with open(path, "wb") as f:
+        write_header(f, MazeHeader(width, height, seed, "eller", (0, 0), (height - 1, width - 1)))
+        write_rows(f, width, height, seed)
@@ -0,0 +1,130 @@
+import re
+from array import array
+from typing import Iterator, List, Tuple
+
+from .walls import DEGREE, DIRECTIONS, OPPOSITE, bounded_walls, steps
+
+
+class JunctionGraph:
+    """
+    Corridor-contracted form of a maze.
+
+    Nodes are the cells that are not plain corridor cells: junctions, dead
+    ends and other cells without exactly two open walls, plus the start and
+    the goal. Every corridor between two nodes becomes one edge weighted by
+    its length in moves, and keeps its cells so results on the graph can be
+    expanded back to cells. Cells on a closed loop without any node are not
+    reachable from a node and belong to no edge.
+
+    Walls are assumed to agree between neighbours, as ``Maze.generate`` and
+    the wall setters keep them. Build it with ``Maze.junction_graph()``, which
+    caches the graph on the maze.
+    """
+
+    def __init__(self, maze) -> None:
+        width, height = maze.width, maze.height
+        n = width * height
+        self.width: int = width
+        self.height: int = height
+        self.start_cell: int = maze.index(*maze.start)
+        self.goal_cell: int = maze.index(*maze.goal)
+
+        # Border walls count as closed even if the wall array says otherwise.
+        walls = bounded_walls(maze)
+        step = steps(width)
+
+        # Node cells are found with a regex over the per-cell degrees, which
+        # skips the corridor cells in C rather than one by one in Python.
+        degree = walls.translate(DEGREE)
+        cells = [match.start() for match in re.finditer(rb"[^\x02]", degree)]
+        for cell in (self.start_cell, self.goal_cell):
+            if degree[cell] == 2:
+                cells.append(cell)
+        cells.sort()
+
+        # Graph nodes in row-major order of their cells; node_of maps a cell
+        # to its node, or -1 for corridor cells.
+        self.cells: List[int] = cells
+        self.node_of = array("i" if n < 2**31 else "q", [-1]) * n
+        node_of = self.node_of
+        for node, cell in enumerate(cells):
+            node_of[cell] = node
+        self.start: int = node_of[self.start_cell]
+        self.goal: int = node_of[self.goal_cell]
+
+        # Neighbours of node u sit in slots 4u..4u+3, one per direction of
+        # the first move in up/down/left/right order; -1 marks a wall.
+        slots = array("i" if 4 * len(cells) < 2**31 else "q", [-1]) * (4 * len(cells))
+        self.neighbour = slots
+        self.length = array(slots.typecode, slots)
+        self.edge = array(slots.typecode, slots)
+        # Edge e joins edge_ends[e] through the corridor cells
+        # corridor_cells[corridor_offsets[e]:corridor_offsets[e + 1]], which
+        # run from its first end to its second.
+        self.edge_ends: List[Tuple[int, int]] = []
+        self.corridor_cells = array("I" if n < 2**32 else "Q")
+        self.corridor_offsets = array("Q", [0])
+        # Directions out of each node cell whose corridor is already known.
+        walked = bytearray(n)
+        rank = {direction: i for i, direction in enumerate(DIRECTIONS)}
+
+        corridor_cells = self.corridor_cells
+        for node, cell in enumerate(cells):
+            for direction in DIRECTIONS:
+                if (walls[cell] | walked[cell]) & direction:
+                    continue
+                current, entry = cell + step[direction], OPPOSITE[direction]
+                while node_of[current] < 0:
+                    corridor_cells.append(current)
+                    # A corridor cell has exactly one open wall besides the one we came in by.
+                    leave = ~walls[current] & 15 & ~entry
+                    if leave not in step:
+                        raise ValueError("Walls of neighbouring cells disagree")
+                    current, entry = current + step[leave], OPPOSITE[leave]
+                walked[cell] |= direction
+                walked[current] |= entry
+
+                edge = len(self.edge_ends)
+                other = node_of[current]
+                length = len(corridor_cells) - self.corridor_offsets[-1] + 1
+                self.corridor_offsets.append(len(corridor_cells))
+                self.edge_ends.append((node, other))
+                for slot, target in ((4 * node + rank[direction], other), (4 * other + rank[entry], node)):
+                    slots[slot] = target
+                    self.length[slot] = length
+                    self.edge[slot] = edge
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def coordinate(self, node: int) -> Tuple[int, int]:
+        """(row, column) of a node's cell."""
+        return divmod(self.cells[node], self.width)
+
+    def neighbours(self, node: int) -> Iterator[Tuple[int, int, int]]:
+        """(neighbour node, corridor length, edge) for each open direction of a node."""
+        for slot in range(4 * node, 4 * node + 4):
+            if self.neighbour[slot] >= 0:
+                yield self.neighbour[slot], self.length[slot], self.edge[slot]
+
+    def corridor(self, edge: int, from_node: int) -> List[int]:
+        """Cells of an edge, both ends included, walked away from from_node."""
+        first, second = self.edge_ends[edge]
+        interior = self.corridor_cells[self.corridor_offsets[edge]:self.corridor_offsets[edge + 1]]
+        cells = [self.cells[first], *interior, self.cells[second]]
+        if first != from_node:
+            cells.reverse()
+        return cells
+
+    def expand_path(self, nodes: List[int], edges: List[int]) -> List[Tuple[int, int]]:
+        """
+        Expand a node path into cells. ``edges[i]`` is the edge taken from
+        ``nodes[i]`` to ``nodes[i + 1]``.
+        """
+        if not nodes:
+            return []
+        path = [self.cells[nodes[0]]]
+        for node, edge in zip(nodes, edges):
+            path.extend(self.corridor(edge, node)[1:])
+        width = self.width
+        return [divmod(cell, width) for cell in path]
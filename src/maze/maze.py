@@ -1,57 +1,281 @@
-from .cell import Cell
+import mmap
+import os
+from typing import Any, Callable, List, NamedTuple, Optional, Union
+from .adjacency import Adjacency
+from .cell import Cell, ALL_WALLS, BOTTOM, LEFT, RIGHT, TOP, WALL_BITS
+from .disjoint_set import DisjointSet
+from .junction_graph import JunctionGraph
+from .storage import HEADER_SIZE, MazeHeader, read_header, write_header
 import random
+import numpy as np
+
+
+class WallChange(NamedTuple):
+    """One wall opened or closed through Maze.open_wall / Maze.close_wall."""
+
+    cell: int  # flat index of the cell the call named
+    neighbour: int  # flat index of the cell on the other side of the wall
+    closed: bool
+
+
+# Shuffled wall ids converted to Python ints at a time while carving.
+_EDGE_CHUNK = 1 << 16
+
+# (row, column) offset of the neighbour behind each wall, and its own bit for that wall.
+_ACROSS = {
+    TOP: (-1, 0, BOTTOM),
+    BOTTOM: (1, 0, TOP),
+    LEFT: (0, -1, RIGHT),
+    RIGHT: (0, 1, LEFT),
+}
+
+
+class _GridRow:
+    """Read access to one row of cells, created on demand."""
+
+    def __init__(self, maze: "Maze", r: int) -> None:
+        self._maze = maze
+        self._r = r
+
+    def __len__(self) -> int:
+        return self._maze.width
+
+    def __getitem__(self, c: int) -> Cell:
+        if c < 0:
+            c += self._maze.width
+        if not 0 <= c < self._maze.width:
+            raise IndexError("column index out of range")
+        return Cell(self._r, c, self._maze)
+
+    def __iter__(self):
+        for c in range(self._maze.width):
+            yield Cell(self._r, c, self._maze)
+
+
+class _GridView:
+    """
+    ``grid[r][c]`` compatibility view over the packed wall array.
+    Cells are built lazily, so the view costs nothing per cell.
+    """
+
+    def __init__(self, maze: "Maze") -> None:
+        self._maze = maze
+
+    def __len__(self) -> int:
+        return self._maze.height
+
+    def __getitem__(self, r: int) -> _GridRow:
+        if r < 0:
+            r += self._maze.height
+        if not 0 <= r < self._maze.height:
+            raise IndexError("row index out of range")
+        return _GridRow(self._maze, r)
+
+    def __iter__(self):
+        for r in range(self._maze.height):
+            yield _GridRow(self._maze, r)
 
 
 class Maze:
-    def __init__(self, size: int) -> None:
+    def __init__(self, size: int, height: Optional[int] = None, walls=None) -> None:
+        """
+        Parameters:
+        - size: number of columns, and of rows unless height is given.
+        - height: number of rows for a rectangular maze.
+        - walls: existing row-major wall buffer (one byte per cell) to wrap
+          instead of allocating a closed grid, e.g. a maze read from disk.
+        """
         self.width: int = size
-        self.height: int = size
-
-        # Create grid with (row, column) coordinates.
-        self.grid = [
-            [Cell(r, c) for c in range(self.width)] for r in range(self.height)
-        ]
-        # Each cell's parent is keyed by (row, col)
-        self.parent = {
-            (r, c): (r, c) for r in range(self.height) for c in range(self.width)
-        }
-
-    def find(self, cell_coord):
-        if self.parent[cell_coord] != cell_coord:
-            self.parent[cell_coord] = self.find(self.parent[cell_coord])
-        return self.parent[cell_coord]
-
-    def union(self, cell_coord1, cell_coord2):
-        root1 = self.find(cell_coord1)
-        root2 = self.find(cell_coord2)
-        if root1 != root2:
-            self.parent[root2] = root1
-
-    def generate(self):
-        # Build list of potential walls between adjacent cells.
-        # Each wall: ((row, col), (neighbor_row, neighbor_col), wall_in_cell, wall_in_neighbor)
-        walls = []
-        for r in range(self.height):
-            for c in range(self.width):
-                # Right neighbor: (r, c) → (r, c+1)
-                if c < self.width - 1:
-                    walls.append(((r, c), (r, c + 1), "right", "left"))
-                # Bottom neighbor: (r, c) → (r+1, c)
-                if r < self.height - 1:
-                    walls.append(((r, c), (r + 1, c), "bottom", "top"))
-
-        random.shuffle(walls)
-
-        for cell_coord1, cell_coord2, wall1, wall2 in walls:
-            if self.find(cell_coord1) != self.find(cell_coord2):
-                cell1 = self.grid[cell_coord1[0]][cell_coord1[1]]
-                cell2 = self.grid[cell_coord2[0]][cell_coord2[1]]
-                cell1.walls[wall1] = False
-                cell2.walls[wall2] = False
-                self.union(cell_coord1, cell_coord2)
+        self.height: int = size if height is None else height
+
+        # Walls of every cell packed into one byte per cell, row-major.
+        # Each byte holds the TOP/RIGHT/BOTTOM/LEFT bits; all walls start closed.
+        if walls is None:
+            walls = bytearray([ALL_WALLS]) * (self.width * self.height)
+        elif len(walls) != self.width * self.height:
+            raise ValueError(
+                f"Wall buffer holds {len(walls)} cells, expected {self.width * self.height}"
+            )
+        self.walls = walls
+        # Cell-based view with (row, column) coordinates.
+        self.grid = _GridView(self)
+
+        self.start = (0, 0)
+        self.goal = (self.height - 1, self.width - 1)
+        # How the walls were produced, recorded when saving.
+        self.seed: Optional[int] = None
+        self.generator: Optional[str] = None
+        # Structures derived from the walls, shared by solvers. Cleared
+        # whenever walls change through set_wall or generate.
+        self._cache: dict = {}
+        # Every open_wall / close_wall since the walls were last generated.
+        # generate() starts a new list, so holders of the old one can tell
+        # that the whole layout changed.
+        self.changes: List[WallChange] = []
 
+    def index(self, r: int, c: int) -> int:
+        """Return the flat index of cell (r, c) in the wall array."""
+        return r * self.width + c
+
+    def has_wall(self, r: int, c: int, wall: int) -> bool:
+        """Check whether cell (r, c) has the given wall bit closed."""
+        return bool(self.walls[r * self.width + c] & wall)
+
+    def set_wall(self, index: int, wall: int, closed: bool) -> None:
+        """Open or close a single wall bit of the cell at a flat index."""
+        self._cache.clear()
+        if closed:
+            self.walls[index] |= wall
+        else:
+            self.walls[index] &= ~wall
+
+    def open_wall(self, r: int, c: int, wall: Union[int, str]) -> None:
+        """
+        Open the wall between cell (r, c) and its neighbour on the given side,
+        on both cells, and record the change in ``self.changes``. The wall is a
+        bit (TOP, RIGHT, BOTTOM, LEFT) or its name ("top", ...).
+        """
+        self._change_wall(r, c, wall, False)
+
+    def close_wall(self, r: int, c: int, wall: Union[int, str]) -> None:
+        """Close a wall on both of its cells; the counterpart of ``open_wall``."""
+        self._change_wall(r, c, wall, True)
+
+    def _change_wall(self, r: int, c: int, wall: Union[int, str], closed: bool) -> None:
+        if isinstance(wall, str):
+            wall = WALL_BITS[wall]
+        dr, dc, neighbour_wall = _ACROSS[wall]
+        if not (0 <= r < self.height and 0 <= c < self.width):
+            raise IndexError(f"Cell {(r, c)} is outside the maze")
+        if not (0 <= r + dr < self.height and 0 <= c + dc < self.width):
+            raise ValueError(f"Cell {(r, c)} has no neighbour behind that wall")
+        cell, neighbour = self.index(r, c), self.index(r + dr, c + dc)
+        self.set_wall(cell, wall, closed)
+        self.set_wall(neighbour, neighbour_wall, closed)
+        self.changes.append(WallChange(cell, neighbour, closed))
+
+    def generate(self, seed: Optional[int] = None):
+        """
+        Carve a perfect maze with randomized Kruskal's algorithm.
+
+        The shuffle uses its own RNG seeded with ``seed``, so the same seed
+        always gives the same maze. Without a seed one is drawn from the global
+        ``random`` state. Either way it is recorded in ``self.seed``.
+
+        Every interior wall is an integer edge id ``cell * 2 + kind``, where
+        kind 0 is the wall to the right neighbour and 1 the wall to the bottom
+        neighbour. The ids sit in one flat array that is shuffled in place.
+
+        All walls are closed first, so calling it again on a generated or
+        loaded maze carves a fresh layout rather than opening more walls.
+        """
+        n = self.width * self.height
+        width = self.width
+        cells = np.arange(n, dtype=np.int64).reshape(self.height, width)
+        edges = np.concatenate((
+            # Right walls of every cell except the last column.
+            (cells[:, :-1] * 2).ravel(),
+            # Bottom walls of every cell except the last row.
+            (cells[:-1, :] * 2 + 1).ravel(),
+        ))
+
+        if seed is None:
+            seed = random.getrandbits(63)
+        # NumPy wants a non-negative seed; two's complement keeps negative
+        # seeds in the signed 64-bit range distinct from positive ones.
+        np.random.default_rng(seed if seed >= 0 else seed & (2**64 - 1)).shuffle(edges)
+
+        self._cache.clear()
+        self.changes = []
+        sets = DisjointSet(n)
+        walls = self.walls
+        walls[:] = bytes([ALL_WALLS]) * n
+        remaining = n - 1  # a spanning tree has exactly n - 1 passages
+        # Walk the shuffled ids in chunks of plain ints, which are much faster
+        # to loop over than NumPy scalars without a full list of every edge.
+        for start in range(0, len(edges), _EDGE_CHUNK):
+            if remaining <= 0:
+                break
+            for edge in edges[start:start + _EDGE_CHUNK].tolist():
+                cell = edge >> 1
+                if edge & 1:
+                    neighbour, wall, neighbour_wall = cell + width, BOTTOM, TOP
+                else:
+                    neighbour, wall, neighbour_wall = cell + 1, RIGHT, LEFT
+                if sets.union(cell, neighbour):
+                    walls[cell] &= ~wall
+                    walls[neighbour] &= ~neighbour_wall
+                    remaining -= 1
+                    if remaining <= 0:
+                        break
+
+        self.seed = seed
+        self.generator = "kruskal"
         return self.grid
 
+    def cached(self, name: str, build: Callable[[], Any]) -> Any:
+        """
+        Return the structure cached under name, calling build() to create it
+        on first use. The cache is cleared whenever the walls change.
+        """
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    def adjacency(self) -> Adjacency:
+        """
+        CSR adjacency of the open passages (see maze/adjacency.py), built on
+        first use and cached until the walls change.
+        """
+        return self.cached("adjacency", lambda: Adjacency(self))
+
+    def junction_graph(self) -> JunctionGraph:
+        """
+        The corridor-contracted graph of this maze (see maze/junction_graph.py),
+        built on first use and cached until the walls, start or goal change.
+        """
+        graph = self._cache.get("junction_graph")
+        if graph is None or (graph.start_cell, graph.goal_cell) != (
+            self.index(*self.start), self.index(*self.goal)
+        ):
+            graph = self._cache["junction_graph"] = JunctionGraph(self)
+        return graph
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Write the maze in the binary format described in maze/storage.py."""
+        with open(path, "wb") as f:
+            write_header(f, MazeHeader(
+                self.width, self.height, self.seed, self.generator, self.start, self.goal
+            ))
+            f.write(self.walls)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike], use_mmap: bool = True) -> "Maze":
+        """
+        Open a maze saved with ``save``.
+
+        With use_mmap the wall array is a copy-on-write memory map of the file,
+        so opening takes constant time and pages are read on first access.
+        Wall edits stay in memory and never reach the file.
+        """
+        with open(path, "rb") as f:
+            header = read_header(f)
+            n = header.width * header.height
+            if use_mmap and n > 0:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+                walls = memoryview(mapped)[HEADER_SIZE:HEADER_SIZE + n]
+            else:
+                walls = bytearray(f.read(n))
+        if len(walls) != n:
+            raise ValueError("Truncated maze file")
+
+        maze = cls(header.width, header.height, walls=walls)
+        maze.start = header.start
+        maze.goal = header.goal
+        maze.seed = header.seed
+        maze.generator = header.generator
+        return maze
+
     def display(self):
         # Simple text-based maze visualization.
         # Top border
@@ -61,14 +285,14 @@ class Maze:
         for y in range(self.height):
             row = "|"
             for x in range(self.width):
-                cell = self.grid[y][x]
+                cell_walls = self.walls[y * self.width + x]
                 # If the bottom wall is present, use '_' otherwise a space.
-                if cell.walls["bottom"]:
+                if cell_walls & BOTTOM:
                     floor = "_"
                 else:
                     floor = " "
                 # If the right wall is present, use '|' otherwise a space.
-                if cell.walls["right"]:
+                if cell_walls & RIGHT:
                     wall = "|"
                 else:
                     wall = " "
@@ -0,0 +1,79 @@
+"""
+Binary maze file format.
+
+A file is a fixed 64-byte little-endian header followed by the wall bytes of
+every cell in row-major order, exactly as held in ``Maze.walls`` (TOP, RIGHT,
+BOTTOM and LEFT bits in the low nibble of each byte). Keeping the on-disk
+layout identical to the in-memory one lets a file be memory-mapped and used
+as the maze's wall array directly, without decoding.
+
+Header fields: magic ``b"MAZE"``, format version, flags (bit 0 set when a
+seed is recorded), generator name (up to 16 ASCII bytes, NUL padded), width,
+height, seed (signed 64-bit), start row/column and goal row/column.
+"""
+import struct
+from typing import BinaryIO, NamedTuple, Optional, Tuple
+
+MAGIC = b"MAZE"
+VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<4sBB16sIIqIIII")
+_GENERATOR_BYTES = 16
+_SEED_RANGE = range(-2**63, 2**63)
+_HAS_SEED = 1
+
+
+class MazeHeader(NamedTuple):
+    width: int
+    height: int
+    seed: Optional[int]
+    generator: Optional[str]
+    start: Tuple[int, int]
+    goal: Tuple[int, int]
+
+
+def write_header(stream: BinaryIO, header: MazeHeader) -> None:
+    """Write the 64-byte header; the caller writes width * height wall bytes after it."""
+    if header.seed is not None and header.seed not in _SEED_RANGE:
+        raise ValueError(f"Seed {header.seed} does not fit in a signed 64-bit header field")
+    try:
+        generator = (header.generator or "").encode("ascii")
+    except UnicodeEncodeError:
+        raise ValueError(f"Generator name {header.generator!r} is not ASCII") from None
+    if len(generator) > _GENERATOR_BYTES:
+        raise ValueError(
+            f"Generator name {header.generator!r} is longer than {_GENERATOR_BYTES} bytes"
+        )
+    flags = _HAS_SEED if header.seed is not None else 0
+    packed = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        flags,
+        generator,
+        header.width,
+        header.height,
+        header.seed or 0,
+        *header.start,
+        *header.goal,
+    )
+    stream.write(packed.ljust(HEADER_SIZE, b"\0"))
+
+
+def read_header(stream: BinaryIO) -> MazeHeader:
+    """Read and validate the header, leaving the stream at the first wall byte."""
+    data = stream.read(HEADER_SIZE)
+    if len(data) < HEADER_SIZE:
+        raise ValueError("Truncated maze file header")
+    magic, version, flags, generator, width, height, seed, *corners = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a maze file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported maze file version {version}")
+    return MazeHeader(
+        width=width,
+        height=height,
+        seed=seed if flags & _HAS_SEED else None,
+        generator=generator.rstrip(b"\0").decode("ascii") or None,
+        start=(corners[0], corners[1]),
+        goal=(corners[2], corners[3]),
+    )
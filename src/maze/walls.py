@@ -0,0 +1,28 @@
+"""Wall-bit helpers shared by the maze structures and solvers."""
+from .cell import BOTTOM, LEFT, RIGHT, TOP
+
+# Directions in the order the search solvers try them: up, down, left, right.
+DIRECTIONS = (TOP, BOTTOM, LEFT, RIGHT)
+OPPOSITE = {TOP: BOTTOM, BOTTOM: TOP, LEFT: RIGHT, RIGHT: LEFT}
+
+# Number of open walls for every possible wall byte.
+DEGREE = bytes(bin(~walls & 15).count("1") for walls in range(256))
+
+
+def bounded_walls(maze) -> bytearray:
+    """Copy of the maze's wall array with every border wall closed."""
+    width, height = maze.width, maze.height
+    n = width * height
+    walls = bytearray(maze.walls)
+    for c in range(width):
+        walls[c] |= TOP
+        walls[n - width + c] |= BOTTOM
+    for r in range(height):
+        walls[r * width] |= LEFT
+        walls[r * width + width - 1] |= RIGHT
+    return walls
+
+
+def steps(width: int) -> dict:
+    """Flat index offset of a move through each wall bit."""
+    return {TOP: -width, BOTTOM: width, LEFT: -1, RIGHT: 1}
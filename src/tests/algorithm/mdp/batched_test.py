@@ -0,0 +1,58 @@
+import itertools
+
+import numpy as np
+
+from maze import MazeBatch
+from algorithm.mdp.batched import BatchedVI, MazeBatchVI
+from algorithm.mdp.value_iteration import VI_MDP
+
+
+def test_batched_matches_separate_vectorized_runs(make_maze):
+    """Every setting gets the sweeps, policy and values of its own VI_MDP run."""
+    maze = make_maze(10, 4)
+    settings = list(itertools.product([0.0, 0.8, 0.95], [-1, -5], [10, 1000]))
+    batched = BatchedVI(maze, settings)
+    batched.value_iteration()
+
+    for index, (gamma, move_cost, goal_reward) in enumerate(settings):
+        solver = VI_MDP(maze, gamma=gamma, move_cost=move_cost, goal_reward=goal_reward)
+        solver.value_iteration(mode="vectorized")
+        assert batched.iterations[index] == solver.iterations
+        assert batched.get_policy(index) == solver.get_policy()
+        expected = solver.get_value_function()
+        values = batched.get_value_function(index)
+        assert np.allclose([values[cell] for cell in expected], list(expected.values()))
+
+
+def test_batched_with_pruning_reaches_goal(make_maze):
+    """With dead ends pruned, large-reward settings still lead from start to goal."""
+    maze = make_maze(12, 2)
+    settings = [(0.99, -1, 1000), (0.9, -2, 10000)]
+    batched = BatchedVI(maze, settings, prune_dead_ends=True)
+    batched.value_iteration()
+
+    for index, (gamma, move_cost, goal_reward) in enumerate(settings):
+        path = batched.get_path(index)
+        assert path[0] == maze.start and path[-1] == maze.goal
+        solver = VI_MDP(
+            maze, gamma=gamma, move_cost=move_cost, goal_reward=goal_reward, prune_dead_ends=True
+        )
+        solver.value_iteration(mode="vectorized")
+        assert batched.get_policy(index) == solver.get_policy()
+
+
+def test_maze_batch_matches_separate_vectorized_runs(make_maze):
+    """Every maze of a batch gets the sweeps, policy and values of its own VI_MDP run."""
+    mazes = [make_maze(9, seed) for seed in range(4)]
+    mazes[1].generate()  # carving again opens loops
+    for prune in (False, True):
+        batched = MazeBatchVI(MazeBatch(mazes), gamma=0.9, goal_reward=100, prune_dead_ends=prune)
+        batched.value_iteration()
+        for k, maze in enumerate(mazes):
+            solver = VI_MDP(maze, gamma=0.9, goal_reward=100, prune_dead_ends=prune)
+            solver.value_iteration(mode="vectorized")
+            assert batched.iterations[k] == solver.iterations
+            assert batched.backups()[k] == solver.backups
+            assert batched.get_policy(k) == solver.get_policy()
+            assert batched.get_value_function(k) == solver.get_value_function()
+            assert batched.get_path(k)[-1] == maze.goal
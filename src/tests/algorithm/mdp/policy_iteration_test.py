@@ -0,0 +1,131 @@
+import pytest
+
+from maze import Maze
+from algorithm.mdp.policy_iteration import PI_MDP
+from algorithm.mdp.tabular import shortest_path_policy
+from utils.stats import MDPStats
+from utils.utils import get_path_from_policy
+
+
+def test_pi_loop_reaches_goal(make_maze):
+    """Policy iteration finds a policy that leads from the start to the goal."""
+    maze = make_maze(8, 1)
+    solver = PI_MDP(maze, goal_reward=80)
+    solver.policy_iteration()
+    path = get_path_from_policy(solver.get_policy(), (0, 0), solver.goal)
+    assert path[-1] == solver.goal
+
+
+def test_pi_exact_matches_iteration(make_maze):
+    """The goal-rooted closed form agrees with policy iteration."""
+    maze = make_maze(12, 3)
+    iterative = PI_MDP(maze, gamma=0.9, goal_reward=200)
+    iterative.policy_iteration()
+    exact = PI_MDP(maze, gamma=0.9, goal_reward=200)
+    exact.policy_iteration(mode="exact")
+
+    assert exact.get_policy() == iterative.get_policy()
+    assert exact.get_value_function() == pytest.approx(iterative.get_value_function(), abs=1e-3)
+
+
+def test_direct_evaluation_matches_iterative_on_cyclic_policy():
+    """Direct evaluation solves policy cycles and the trees hanging off them."""
+    maze = Maze(3)
+    maze.walls[:] = bytes(9)  # open every interior wall
+    policy = {
+        (0, 0): (0, 1), (0, 1): (0, -1),  # two-state cycle
+        (1, 0): (-1, 0), (2, 0): (-1, 0),  # chain draining into the cycle
+        (0, 2): (1, 0), (1, 2): (1, 0),  # chain into the goal
+        (1, 1): (0, 1), (2, 1): None,  # (2, 1) keeps its value
+        (2, 2): None,
+    }
+    iterative = PI_MDP(maze, gamma=0.9, goal_reward=20)
+    iterative.policy = dict(policy)
+    iterative.values[(2, 1)] = 3.0
+    iterative.policy_evaluation(threshold=1e-12, method="iterative")
+
+    direct = PI_MDP(maze, gamma=0.9, goal_reward=20)
+    direct.policy = dict(policy)
+    direct.values[(2, 1)] = 3.0
+    direct.policy_evaluation()
+
+    assert direct.values[(0, 0)] == pytest.approx(-1 / (1 - 0.9))
+    assert direct.values[(2, 1)] == 3.0
+    assert direct.values[(2, 2)] == 0.0
+    assert direct.get_value_function() == pytest.approx(iterative.get_value_function(), abs=1e-9)
+
+
+def test_pi_direct_and_iterative_evaluation_agree(make_maze):
+    maze = make_maze(10, 2)
+    iterative = PI_MDP(maze, gamma=0.9, goal_reward=100)
+    iterative.policy_iteration(evaluation="iterative")
+    direct = PI_MDP(maze, gamma=0.9, goal_reward=100)
+    direct.policy_iteration(evaluation="direct")
+
+    assert direct.get_policy() == iterative.get_policy()
+    assert direct.get_value_function() == pytest.approx(iterative.get_value_function(), abs=1e-3)
+
+
+def test_pi_junction_matches_exact(make_maze):
+    """Policy iteration on the junction graph expands to the exact per-cell solution."""
+    maze = make_maze(12, 6)
+    exact = PI_MDP(maze, gamma=0.9, goal_reward=50)
+    exact.policy_iteration(mode="exact")
+    junctions = PI_MDP(maze, gamma=0.9, goal_reward=50)
+    junctions.policy_iteration(mode="junction")
+
+    assert junctions.get_value_function() == pytest.approx(exact.get_value_function())
+    assert junctions.get_policy() == exact.get_policy()
+
+
+def test_pi_junction_falls_back_when_pacing_wins(make_loopy_maze):
+    """With a goal reward below the cost of never arriving, junction mode solves the cells."""
+    maze = make_loopy_maze(8, 3)
+    cells = PI_MDP(maze, gamma=0.9, goal_reward=-50)
+    cells.policy_iteration()
+    junctions = PI_MDP(maze, gamma=0.9, goal_reward=-50)
+    junctions.policy_iteration(mode="junction")
+
+    assert junctions.get_value_function() == pytest.approx(cells.get_value_function())
+    assert junctions.get_value_function()[maze.start] == pytest.approx(-10)
+
+
+def test_pi_pruned_dead_ends(make_maze):
+    maze = make_maze(12, 8)
+    full = PI_MDP(maze, gamma=0.9, goal_reward=50)
+    full.policy_iteration()
+    pruned = PI_MDP(maze, gamma=0.9, goal_reward=50, prune_dead_ends=True)
+    pruned.policy_iteration(evaluation="iterative")
+
+    path = get_path_from_policy(pruned.get_policy(), maze.start, pruned.goal, len(pruned.states))
+    assert path == get_path_from_policy(full.get_policy(), maze.start, full.goal)
+    assert all(pruned.get_policy()[state] is None for state in full.values if state not in path)
+
+
+def test_pi_warm_start_from_shortest_path_policy(make_maze):
+    """The shortest-path policy is already optimal, so one improvement round confirms it."""
+    maze = make_maze(12, 4)
+    cold_stats, warm_stats = MDPStats(), MDPStats()
+    cold = PI_MDP(maze, gamma=0.9, goal_reward=100, stats=cold_stats)
+    cold.policy_iteration()
+    warm = PI_MDP(
+        maze, gamma=0.9, goal_reward=100, stats=warm_stats,
+        initial_policy=shortest_path_policy(maze),
+    )
+    warm.policy_iteration()
+    assert warm_stats.improvement_rounds == 1 < cold_stats.improvement_rounds
+    assert warm.get_policy() == cold.get_policy()
+
+
+def test_pi_warm_start_ignores_blocked_and_pruned_moves(make_maze):
+    """Moves the walls no longer allow, and moves of filled cells, are not seeded."""
+    maze = make_maze(8, 9)
+    policy = shortest_path_policy(maze)
+    r, c = next(state for state, action in policy.items() if action == (0, 1))
+    maze.close_wall(r, c, "right")
+    solver = PI_MDP(maze, prune_dead_ends=True, initial_policy=policy)
+    assert solver.policy[(r, c)] is None
+    live_states = set(solver.states)
+    assert all(action is None for state, action in solver.policy.items() if state not in live_states)
+    seeded = [state for state in live_states if solver.policy[state] is not None]
+    assert seeded and all(solver.policy[state] in solver.get_actions(state) for state in seeded)
@@ -0,0 +1,190 @@
+import pytest
+
+from maze import Maze, RIGHT
+from algorithm.mdp.tabular import shortest_path_policy
+from algorithm.mdp.value_iteration import VI_MDP
+from utils.stats import MDPStats
+from utils.utils import get_path_from_policy
+
+
+def test_vi_loop_reaches_goal(make_maze):
+    """Value iteration finds a policy that leads from the start to the goal."""
+    maze = make_maze(8, 1)
+    solver = VI_MDP(maze, goal_reward=80, max_iter=10000)
+    solver.value_iteration()
+    path = get_path_from_policy(solver.get_policy(), (0, 0), solver.goal)
+    assert path[-1] == solver.goal
+
+
+@pytest.mark.parametrize("size, seed", [(1, 0), (2, 1), (15, 2)])
+def test_vi_vectorized_matches_loop(size, seed, make_maze):
+    """The vectorized engine reproduces the loop's values, policy and iteration count."""
+    maze = make_maze(size, seed)
+    loop = VI_MDP(maze, gamma=0.95, goal_reward=150, max_iter=10000)
+    loop.value_iteration()
+    vectorized = VI_MDP(maze, gamma=0.95, goal_reward=150, max_iter=10000)
+    vectorized.value_iteration(mode="vectorized")
+
+    assert vectorized.iterations == loop.iterations
+    assert vectorized.get_policy() == loop.get_policy()
+    assert vectorized.get_value_function() == pytest.approx(loop.get_value_function())
+
+
+def test_vi_unknown_mode():
+    with pytest.raises(ValueError):
+        VI_MDP(Maze(2)).value_iteration(mode="bogus")
+
+
+@pytest.mark.parametrize("gamma, goal_reward", [(0.9, 200), (0.99, 10)])
+def test_vi_exact_matches_iteration(gamma, goal_reward, make_maze):
+    """The goal-rooted closed form agrees with converged value iteration."""
+    maze = make_maze(12, 3)
+    iterative = VI_MDP(maze, gamma=gamma, goal_reward=goal_reward, max_iter=100000)
+    iterative.value_iteration(epsilon=1e-9, mode="vectorized")
+    exact = VI_MDP(maze, gamma=gamma, goal_reward=goal_reward, max_iter=100000)
+    exact.value_iteration(mode="exact")
+
+    assert exact.iterations == 0
+    assert exact.get_policy() == iterative.get_policy()
+    assert exact.get_value_function() == pytest.approx(iterative.get_value_function(), abs=1e-6)
+
+
+def test_vi_exact_falls_back_when_shortcut_invalid(make_maze):
+    """A positive step reward makes wandering optimal, so exact mode iterates instead."""
+    maze = make_maze(6, 4)
+    iterative = VI_MDP(maze, gamma=0.9, move_cost=1, goal_reward=5, max_iter=10000)
+    iterative.value_iteration(mode="vectorized")
+    exact = VI_MDP(maze, gamma=0.9, move_cost=1, goal_reward=5, max_iter=10000)
+    exact.value_iteration(mode="exact")
+
+    assert exact.iterations == iterative.iterations > 0
+    assert exact.get_value_function() == iterative.get_value_function()
+
+
+@pytest.mark.parametrize("mode, order", [
+    ("gauss_seidel", "row_major"),
+    ("gauss_seidel", "goal_bfs"),
+    ("prioritized", "row_major"),
+])
+def test_vi_asynchronous_modes_converge_to_same_solution(mode, order, make_maze):
+    """In-place and prioritized schedules reach the synchronous fixed point with fewer backups."""
+    maze = make_maze(15, 5)
+    synchronous = VI_MDP(maze, gamma=0.95, goal_reward=150, max_iter=10000)
+    synchronous.value_iteration(epsilon=1e-6)
+    asynchronous = VI_MDP(maze, gamma=0.95, goal_reward=150, max_iter=10000)
+    asynchronous.value_iteration(epsilon=1e-6, mode=mode, order=order)
+
+    assert asynchronous.get_policy() == synchronous.get_policy()
+    assert asynchronous.get_value_function() == pytest.approx(synchronous.get_value_function(), abs=1e-4)
+    assert 0 < asynchronous.backups < synchronous.backups
+
+
+def test_vi_gauss_seidel_explicit_order(make_maze):
+    maze = make_maze(5, 6)
+    order = [(r, c) for r in reversed(range(5)) for c in reversed(range(5))]
+    solver = VI_MDP(maze, goal_reward=50, max_iter=10000)
+    solver.value_iteration(mode="gauss_seidel", order=order)
+    path = get_path_from_policy(solver.get_policy(), (0, 0), solver.goal)
+    assert path[-1] == solver.goal
+
+
+def test_vi_collects_stats(make_maze):
+    maze = make_maze(6, 8)
+    stats = MDPStats()
+    solver = VI_MDP(maze, goal_reward=60, max_iter=10000, stats=stats)
+    solver.value_iteration()
+    assert stats.sweeps == solver.iterations > 0
+    assert stats.backups == solver.iterations * (6 * 6 - 1)
+    assert stats.final_delta < 0.001
+
+
+@pytest.mark.parametrize("size, seed", [(1, 0), (2, 1), (12, 5)])
+def test_vi_junction_matches_cells(size, seed, make_maze):
+    """Iterating on the junction graph gives the per-cell values of the full MDP."""
+    maze = make_maze(size, seed)
+    cells = VI_MDP(maze, goal_reward=100, max_iter=10000)
+    cells.value_iteration(epsilon=1e-9, mode="vectorized")
+    junctions = VI_MDP(maze, goal_reward=100, max_iter=10000)
+    junctions.value_iteration(epsilon=1e-9, mode="junction")
+
+    assert junctions.get_value_function() == pytest.approx(cells.get_value_function())
+    path = get_path_from_policy(junctions.get_policy(), maze.start, junctions.goal)
+    assert path[-1] == junctions.goal
+    assert junctions.backups < cells.backups or size == 1
+
+
+def test_vi_junction_falls_back_when_pacing_wins(make_loopy_maze):
+    """With a goal reward below the cost of never arriving, corridors cannot match the cell MDP."""
+    maze = make_loopy_maze(8, 3)
+    cells = VI_MDP(maze, gamma=0.9, goal_reward=-50, max_iter=10000)
+    cells.value_iteration(epsilon=1e-9, mode="vectorized")
+    junctions = VI_MDP(maze, gamma=0.9, goal_reward=-50, max_iter=10000)
+    junctions.value_iteration(epsilon=1e-9, mode="junction")
+
+    assert junctions.get_value_function() == pytest.approx(cells.get_value_function())
+    assert junctions.get_value_function()[maze.start] == pytest.approx(-10)
+    assert junctions.get_policy() == cells.get_policy()
+
+
+@pytest.mark.parametrize("mode", ["loop", "vectorized", "gauss_seidel", "prioritized"])
+def test_vi_pruned_dead_ends(mode, make_maze):
+    """With dead ends filled only the solution path is backed up, and it is still found."""
+    maze = make_maze(15, 7)
+    full = VI_MDP(maze, goal_reward=150, max_iter=10000)
+    full.value_iteration()
+    pruned = VI_MDP(maze, goal_reward=150, max_iter=10000, prune_dead_ends=True)
+    pruned.value_iteration(mode=mode)
+
+    path = get_path_from_policy(pruned.get_policy(), maze.start, pruned.goal, len(pruned.states))
+    assert path == get_path_from_policy(full.get_policy(), maze.start, full.goal)
+    assert len(pruned.states) == len(path)
+    for state in path:
+        assert pruned.get_value_function()[state] == pytest.approx(full.get_value_function()[state])
+    if mode == "loop":
+        assert pruned.backups == pruned.iterations * (len(path) - 1)
+
+
+def test_policy_path_longer_than_a_thousand_steps():
+    """get_path_from_policy follows paths as long as the maze allows."""
+    maze = Maze(1500, height=1)
+    for c in range(1499):
+        maze.grid[0][c].walls["right"] = False
+        maze.grid[0][c + 1].walls["left"] = False
+    solver = VI_MDP(maze, gamma=0.999, goal_reward=10000)
+    solver.value_iteration(mode="exact")
+    path = get_path_from_policy(solver.get_policy(), maze.start, solver.goal)
+    assert len(path) == 1500 and path[-1] == solver.goal
+
+
+def test_vi_warm_start_after_wall_edit(make_maze):
+    """Starting from the previous values, a re-solve after an edit needs fewer sweeps."""
+    maze = make_maze(12, 6)
+    before = VI_MDP(maze, gamma=0.95, goal_reward=150, max_iter=10000)
+    before.value_iteration(mode="vectorized")
+    maze.open_wall(5, 5, "right" if maze.has_wall(5, 5, RIGHT) else "bottom")
+
+    cold = VI_MDP(maze, gamma=0.95, goal_reward=150, max_iter=10000)
+    cold.value_iteration(mode="vectorized")
+    warm = VI_MDP(
+        maze, gamma=0.95, goal_reward=150, max_iter=10000,
+        initial_values=before.get_value_function(),
+    )
+    warm.value_iteration(mode="vectorized")
+    assert warm.iterations < cold.iterations
+    assert warm.get_policy() == cold.get_policy()
+    assert warm.get_value_function() == pytest.approx(cold.get_value_function(), abs=0.01)
+
+
+def test_vi_warm_start_from_shortest_path_policy(make_maze):
+    """Given only a policy, VI starts from its exact values and converges at once."""
+    maze = make_maze(10, 3)
+    cold = VI_MDP(maze, gamma=0.9, goal_reward=100, max_iter=10000)
+    cold.value_iteration(mode="vectorized")
+    warm = VI_MDP(
+        maze, gamma=0.9, goal_reward=100, max_iter=10000,
+        initial_policy=shortest_path_policy(maze),
+    )
+    warm.value_iteration(mode="vectorized")
+    assert warm.iterations == 1
+    assert warm.get_policy() == cold.get_policy()
+    assert warm.get_value_function() == pytest.approx(cold.get_value_function(), abs=0.01)
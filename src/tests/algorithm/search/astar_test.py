@@ -1,5 +1,9 @@
+import pytest
+
 from maze import Maze
 from algorithm.search.astar import AStar
+from utils.heuristics import LandmarkHeuristic
+from utils.stats import SearchStats
 
 
 def test_astar_simple_path():
@@ -94,3 +98,53 @@ def test_astar_single_cell():
     path = solver.solve()
     expected_path = [(0, 0)]
     assert path == expected_path, f"Expected path {expected_path}, got {path}"
+
+
+def test_astar_bucket_matches_heap():
+    """The bucket queue finds paths as short as the heap, expanding no more nodes."""
+    for seed in range(5):
+        maze = Maze(15)
+        maze.generate(seed=seed)
+        # Open a few extra walls so there are several routes to the goal.
+        for r in range(2, 13, 5):
+            maze.grid[r][7].walls["right"] = False
+            maze.grid[r][8].walls["left"] = False
+        heap_stats, bucket_stats = SearchStats(), SearchStats()
+        heap_path = AStar(maze, stats=heap_stats).solve()
+        bucket_path = AStar(maze, stats=bucket_stats, open_list="bucket").solve()
+        assert len(bucket_path) == len(heap_path)
+        assert bucket_path[0] == maze.start and bucket_path[-1] == maze.goal
+        assert bucket_stats.nodes_expanded <= heap_stats.nodes_expanded
+
+
+def test_astar_bucket_no_path():
+    """The bucket queue returns an empty path when the goal is walled off."""
+    assert AStar(Maze(3), open_list="bucket").solve() == []
+    assert AStar(Maze(1), open_list="bucket").solve() == [(0, 0)]
+
+
+def test_astar_unknown_open_list():
+    with pytest.raises(ValueError):
+        AStar(Maze(2), open_list="fibonacci")
+
+
+def test_astar_landmarks_expand_fewer_nodes():
+    """
+    The ALT heuristic keeps paths shortest. It is not tighter than Manhattan
+    on every cell, so fewer expansions are only checked over several mazes.
+    """
+    for open_list in ("heap", "bucket"):
+        manhattan_expanded = landmark_expanded = 0
+        for seed in range(5):
+            maze = Maze(30)
+            maze.generate(seed=seed)
+            landmarks = LandmarkHeuristic.for_maze(maze, 4)
+            manhattan_stats, landmark_stats = SearchStats(), SearchStats()
+            manhattan_path = AStar(maze, stats=manhattan_stats, open_list=open_list).solve()
+            landmark_path = AStar(
+                maze, stats=landmark_stats, open_list=open_list, heuristic=landmarks
+            ).solve()
+            assert landmark_path == manhattan_path  # a perfect maze has one path
+            manhattan_expanded += manhattan_stats.nodes_expanded
+            landmark_expanded += landmark_stats.nodes_expanded
+        assert landmark_expanded < manhattan_expanded
@@ -1,6 +1,7 @@
 import pytest
 from maze import Maze
 from algorithm.search.bfs import BFS
+from utils.stats import SearchStats
 
 
 def test_bfs_simple_path():
@@ -97,3 +98,23 @@ def test_bfs_single_cell():
     expected_path = [(0, 0)]
     assert path == expected_path, f"Expected path {expected_path}, got {path}"
 
+
+
+def test_bfs_collects_stats():
+    """BFS fills in SearchStats when one is passed in."""
+    maze = Maze(3)
+    maze.grid[0][0].walls["right"] = False
+    maze.grid[0][1].walls["left"] = False
+    maze.grid[0][1].walls["bottom"] = False
+    maze.grid[1][1].walls["top"] = False
+    maze.grid[1][1].walls["right"] = False
+    maze.grid[1][2].walls["left"] = False
+    maze.grid[1][2].walls["bottom"] = False
+    maze.grid[2][2].walls["top"] = False
+
+    stats = SearchStats()
+    path = BFS(maze, stats=stats).solve()
+    assert len(path) == 5
+    assert stats.nodes_expanded == 4
+    assert stats.nodes_generated == stats.peak_came_from == 5
+    assert stats.peak_frontier == 1
@@ -0,0 +1,60 @@
+import random
+
+from maze import Maze, RIGHT, LEFT, BOTTOM, TOP
+from algorithm.search.bfs import BFS
+from algorithm.search.bidirectional_bfs import BidirectionalBFS
+from utils.stats import SearchStats
+
+
+def assert_valid_path(maze: Maze, path) -> None:
+    """Consecutive cells must be neighbours without a wall between them."""
+    assert path[0] == maze.start and path[-1] == maze.goal
+    for (r, c), (nr, nc) in zip(path, path[1:]):
+        assert abs(r - nr) + abs(c - nc) == 1
+        wall = {(0, 1): RIGHT, (0, -1): LEFT, (1, 0): BOTTOM, (-1, 0): TOP}[(nr - r, nc - c)]
+        assert not maze.has_wall(r, c, wall)
+
+
+def test_bidirectional_bfs_simple_path():
+    maze = Maze(2)
+    maze.grid[0][0].walls["right"] = False
+    maze.grid[0][1].walls["left"] = False
+    maze.grid[0][1].walls["bottom"] = False
+    maze.grid[1][1].walls["top"] = False
+
+    path = BidirectionalBFS(maze).solve()
+    assert path == [(0, 0), (0, 1), (1, 1)]
+
+
+def test_bidirectional_bfs_no_path():
+    assert BidirectionalBFS(Maze(2)).solve() == []
+
+
+def test_bidirectional_bfs_single_cell():
+    assert BidirectionalBFS(Maze(1)).solve() == [(0, 0)]
+
+
+def test_bidirectional_bfs_matches_bfs_length():
+    random.seed(13)
+    for size in [5, 12, 25]:
+        maze = Maze(size)
+        maze.generate()
+        # Knock out extra walls so there are several routes to choose from.
+        for _ in range(size * 2):
+            r, c = random.randrange(size), random.randrange(size - 1)
+            maze.grid[r][c].walls["right"] = False
+            maze.grid[r][c + 1].walls["left"] = False
+
+        path = BidirectionalBFS(maze).solve()
+        assert_valid_path(maze, path)
+        assert len(path) == len(BFS(maze).solve())
+
+
+def test_bidirectional_bfs_expands_fewer_nodes():
+    maze = Maze(40)
+    maze.generate(seed=7)
+    bfs_stats, bidirectional_stats = SearchStats(), SearchStats()
+    BFS(maze, stats=bfs_stats).solve()
+    BidirectionalBFS(maze, stats=bidirectional_stats).solve()
+    assert bidirectional_stats.nodes_expanded < bfs_stats.nodes_expanded
+    assert bidirectional_stats.nodes_generated == bidirectional_stats.peak_came_from
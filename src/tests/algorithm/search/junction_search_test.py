@@ -0,0 +1,39 @@
+import pytest
+
+from maze import Maze
+from algorithm.search.bfs import BFS
+from algorithm.search.junction_search import JunctionSearch
+from utils.stats import SearchStats
+
+
+@pytest.mark.parametrize("strategy", ["bfs", "dfs", "astar"])
+def test_junction_search_reaches_goal(strategy, make_maze):
+    maze = make_maze(15, 1)
+    path = JunctionSearch(maze, strategy).solve()
+    assert path[0] == maze.start and path[-1] == maze.goal
+    # A perfect maze has a single route.
+    assert path == BFS(maze).solve()
+
+
+@pytest.mark.parametrize("strategy", ["bfs", "astar"])
+def test_junction_search_finds_shortest_path_with_loops(strategy, make_loopy_maze):
+    maze = make_loopy_maze(20, 2, shortcuts=40)
+    path = JunctionSearch(maze, strategy).solve()
+    assert len(path) == len(BFS(maze).solve())
+    for (r, c), (nr, nc) in zip(path, path[1:]):
+        assert abs(r - nr) + abs(c - nc) == 1
+
+
+def test_junction_search_edge_cases():
+    assert JunctionSearch(Maze(1)).solve() == [(0, 0)]
+    assert JunctionSearch(Maze(2)).solve() == []
+    with pytest.raises(ValueError):
+        JunctionSearch(Maze(2), "greedy")
+
+
+def test_junction_search_expands_fewer_nodes(make_maze):
+    maze = make_maze(30, 3)
+    cells, junctions = SearchStats(), SearchStats()
+    BFS(maze, stats=cells).solve()
+    JunctionSearch(maze, stats=junctions).solve()
+    assert junctions.nodes_expanded < cells.nodes_expanded
@@ -0,0 +1,89 @@
+import random
+
+from maze import Maze, RIGHT, BOTTOM
+from algorithm.search.bfs import BFS
+from algorithm.search.lpa_star import LPAStar
+from utils.stats import SearchStats
+
+
+def toggle_random_walls(maze: Maze, count: int, rng: random.Random) -> None:
+    for _ in range(count):
+        if rng.random() < 0.5:
+            r, c, wall = rng.randrange(maze.height), rng.randrange(maze.width - 1), RIGHT
+        else:
+            r, c, wall = rng.randrange(maze.height - 1), rng.randrange(maze.width), BOTTOM
+        if maze.has_wall(r, c, wall):
+            maze.open_wall(r, c, wall)
+        else:
+            maze.close_wall(r, c, wall)
+
+
+def assert_valid_path(maze: Maze, path) -> None:
+    assert path[0] == maze.start and path[-1] == maze.goal
+    for (r, c), (nr, nc) in zip(path, path[1:]):
+        assert abs(r - nr) + abs(c - nc) == 1
+        wall = {(0, 1): RIGHT, (1, 0): BOTTOM}.get((nr - r, nc - c))
+        if wall is not None:
+            assert not maze.has_wall(r, c, wall)
+        else:
+            assert not maze.has_wall(nr, nc, {(0, -1): RIGHT, (-1, 0): BOTTOM}[(nr - r, nc - c)])
+
+
+def test_lpa_star_matches_bfs_after_each_batch_of_edits():
+    rng = random.Random(8)
+    for seed in range(10):
+        maze = Maze(11, height=8)
+        maze.generate(seed=seed)
+        planner = LPAStar(maze)
+        assert planner.solve() == BFS(maze).solve()
+        for _ in range(6):
+            toggle_random_walls(maze, rng.randint(1, 5), rng)
+            path = planner.solve()
+            expected = BFS(maze).solve()
+            assert len(path) == len(expected)
+            if path:
+                assert_valid_path(maze, path)
+
+
+def test_repair_expands_fewer_nodes_than_first_solve():
+    maze = Maze(30)
+    maze.generate(seed=0)
+    stats = SearchStats()
+    planner = LPAStar(maze, stats=stats)
+    path = planner.solve()
+    first = stats.nodes_expanded
+    # Open a shortcut between two side-by-side cells far apart along the path.
+    position = {cell: i for i, cell in enumerate(path)}
+    r, c, wall = next(
+        (r, c, wall) for (r, c), i in position.items()
+        for (dr, dc), wall in (((0, 1), RIGHT), ((1, 0), BOTTOM))
+        if abs(position.get((r + dr, c + dc), i) - i) > 5
+    )
+    maze.open_wall(r, c, wall)
+    repaired = planner.solve()
+    assert len(repaired) == len(BFS(maze).solve()) < len(path)
+    assert stats.nodes_expanded - first < first
+
+
+def test_regenerating_the_maze_restarts_the_planner():
+    maze = Maze(9)
+    maze.generate(seed=4)
+    planner = LPAStar(maze)
+    planner.solve()
+    maze.generate(seed=5)
+    assert len(planner.solve()) == len(BFS(maze).solve())
+    maze.goal = (4, 4)
+    assert len(planner.solve()) == len(BFS(maze).solve())
+
+
+def test_unreachable_goal():
+    maze = Maze(3)
+    planner = LPAStar(maze)
+    assert planner.solve() == []
+    maze.open_wall(0, 0, RIGHT)
+    maze.open_wall(0, 1, RIGHT)
+    maze.open_wall(0, 2, BOTTOM)
+    maze.open_wall(1, 2, BOTTOM)
+    assert planner.solve() == [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2)]
+    maze.close_wall(1, 2, BOTTOM)
+    assert planner.solve() == []
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from maze import Maze
+from algorithm.search.bfs import BFS
+from algorithm.search.path_oracle import PathOracle
+
+
+def bfs_path(maze: Maze, start, goal):
+    maze.start, maze.goal = start, goal
+    return BFS(maze).solve()
+
+
+def test_oracle_matches_bfs_on_random_queries():
+    maze = Maze(17, height=11)
+    maze.generate(seed=16)
+    oracle = PathOracle(maze)
+    random.seed(16)
+    pairs = [
+        ((random.randrange(11), random.randrange(17)), (random.randrange(11), random.randrange(17)))
+        for _ in range(200)
+    ]
+    distances = oracle.distances([a for a, _ in pairs], [b for _, b in pairs])
+    for (start, goal), distance in zip(pairs, distances):
+        path = bfs_path(maze, start, goal)
+        assert oracle.path(start, goal) == path
+        assert oracle.distance(start, goal) == distance == len(path) - 1
+    assert oracle.paths(pairs[:3]) == [oracle.path(a, b) for a, b in pairs[:3]]
+
+
+def test_oracle_single_cell_and_same_cell():
+    oracle = PathOracle(Maze(1))
+    assert oracle.path((0, 0), (0, 0)) == [(0, 0)]
+    assert oracle.distance((0, 0), (0, 0)) == 0
+
+
+def test_oracle_rejects_non_tree_mazes():
+    with pytest.raises(ValueError):
+        PathOracle(Maze(2))  # no passages at all
+    maze = Maze(2)
+    maze.generate(seed=1)
+    for r, c, side in [(0, 0, "right"), (0, 1, "left"), (0, 0, "bottom"), (1, 0, "top"),
+                       (0, 1, "bottom"), (1, 1, "top"), (1, 0, "right"), (1, 1, "left")]:
+        maze.grid[r][c].walls[side] = False
+    with pytest.raises(ValueError):
+        PathOracle(maze)
+
+
+def test_oracle_cached_per_maze():
+    maze = Maze(8)
+    maze.generate(seed=2)
+    oracle = PathOracle.for_maze(maze)
+    assert PathOracle.for_maze(maze) is oracle
+    maze.grid[0][0].walls["top"] = True  # any wall write clears the cache
+    assert PathOracle.for_maze(maze) is not oracle
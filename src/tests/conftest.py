@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+from maze import Maze
+
+
+@pytest.fixture
+def make_maze():
+    """Factory for a perfect maze generated from a seed."""
+
+    def make(size: int, seed: int, height=None) -> Maze:
+        maze = Maze(size, height=height)
+        maze.generate(seed=seed)
+        return maze
+
+    return make
+
+
+@pytest.fixture
+def make_loopy_maze(make_maze):
+    """
+    Factory for a seeded maze with extra right walls opened, so it has loops.
+    Opens ``size`` random walls unless ``shortcuts`` says otherwise.
+    """
+
+    def make(size: int, seed: int, height=None, shortcuts=None) -> Maze:
+        maze = make_maze(size, seed, height=height)
+        rng = random.Random(seed)
+        for _ in range(size if shortcuts is None else shortcuts):
+            r, c = rng.randrange(maze.height), rng.randrange(size - 1)
+            maze.open_wall(r, c, "right")
+        return maze
+
+    return make
@@ -0,0 +1,63 @@
+import csv
+from concurrent.futures import ProcessPoolExecutor
+
+from experiment import run_batch, run_job, write_results
+from maze.corpus import MazeCorpus
+from utils.results import ResultLog
+
+FIELDS = ["Algorithm", "Maze_Size", "Execution_Time", "Path_Length", "Trial", "Trials", "Seed"]
+
+
+def _job(algorithm: str, trial: int, cache_dir) -> dict:
+    return {
+        "algorithm": algorithm,
+        "label": algorithm,
+        "open_list": "heap",
+        "landmarks": 0,
+        "size": 8,
+        "size_name": "small",
+        "trial": trial,
+        "trials": 2,
+        "seed": 3 + trial,
+        "generator": "kruskal",
+        "maze_file": None,
+        "cache_dir": str(cache_dir),
+        "cache_bytes": 1 << 20,
+        "mdp_args": {"gamma": 0.9, "reward_goal": 10, "reward_step": -1, "max_iter": 1000},
+        "collect_stats": False,
+        "junctions": False,
+        "profile_memory": False,
+        "top_allocations": 0,
+    }
+
+
+def _rows(path):
+    with open(path, newline="") as f:
+        return [
+            {key: value for key, value in row.items() if key != "Execution_Time"}
+            for row in csv.DictReader(f)
+        ]
+
+
+def test_pool_sweep_matches_serial_run(tmp_path):
+    jobs = [_job("bfs", 0, tmp_path / "corpus"), _job("vi", 1, tmp_path / "corpus")]
+
+    with ResultLog(str(tmp_path / "serial.csv"), FIELDS) as log:
+        write_results(log, jobs, map(run_job, jobs))
+    with ResultLog(str(tmp_path / "pool.csv"), FIELDS) as log:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            write_results(log, jobs, executor.map(run_job, jobs))
+
+    serial = _rows(tmp_path / "serial.csv")
+    assert [(row["Algorithm"], row["Trial"]) for row in serial] == [("bfs", "0"), ("vi", "1")]
+    assert _rows(tmp_path / "pool.csv") == serial
+
+
+def test_batch_rows_match_separate_jobs(tmp_path):
+    jobs = [_job("bfs", trial, tmp_path / "corpus") for trial in range(2)]
+    corpus = MazeCorpus(tmp_path / "corpus")
+    mazes = [corpus.get(job["size"], job["seed"]) for job in jobs]
+    rows = run_batch("bfs", mazes, jobs[0]["mdp_args"])
+    assert [row["Algorithm"] for row in rows] == ["bfs-batch"] * 2
+    assert [row["Path_Length"] for row in rows] == [run_job(job)["Path_Length"] for job in jobs]
+    assert [row["Seed"] for row in rows] == [3, 4]
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from maze import Maze, MazeBatch
+from maze.distance_field import distance_field
+from algorithm.search.bfs import BFS
+
+
+def test_distance_fields_match_each_maze(make_loopy_maze):
+    """Searching the stack gives every maze its own distance field, without leaking across borders."""
+    mazes = [make_loopy_maze(9, seed, height=6) for seed in range(5)]
+    mazes[2].goal = (3, 4)
+    distances, directions = MazeBatch(mazes).distance_fields()
+    assert distances.shape == directions.shape == (5, 6, 9)
+    for k, maze in enumerate(mazes):
+        expected_distances, expected_directions = distance_field(maze, [maze.goal])
+        assert np.array_equal(distances[k], expected_distances)
+        assert np.array_equal(directions[k], expected_directions)
+
+
+def test_path_lengths_and_paths_match_bfs(make_loopy_maze):
+    mazes = [make_loopy_maze(11, seed) for seed in range(6)]
+    maze = Maze(11)  # every wall closed, so the goal is out of reach
+    mazes.append(maze)
+    batch = MazeBatch(mazes)
+    expected = [BFS(maze).solve() for maze in mazes]
+    assert batch.path_lengths().tolist() == [len(path) for path in expected]
+    for path, maze in zip(batch.paths(), mazes):
+        if path:
+            assert path[0] == maze.start and path[-1] == maze.goal
+    assert [len(path) for path in batch.paths()] == [len(path) for path in expected]
+
+
+def test_sizes_must_match():
+    with pytest.raises(ValueError):
+        MazeBatch([Maze(5), Maze(6)])
+    with pytest.raises(ValueError):
+        MazeBatch([])
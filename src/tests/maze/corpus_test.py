@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from maze import Maze
+from maze.corpus import MazeCorpus, generate
+
+
+def test_same_key_gives_identical_maze(tmp_path):
+    corpus = MazeCorpus(tmp_path)
+    first = corpus.get(10, seed=42)
+    second = corpus.get(10, seed=42)
+    assert bytes(first.walls) == bytes(second.walls)
+    assert first.seed == 42
+
+    direct = Maze(10)
+    direct.generate(seed=42)
+    assert bytes(direct.walls) == bytes(first.walls)
+    assert bytes(corpus.get(10, seed=43).walls) != bytes(first.walls)
+
+
+def test_eller_mazes_are_cached_separately(tmp_path):
+    corpus = MazeCorpus(tmp_path)
+    maze = corpus.get(8, seed=1, generator="eller")
+    assert maze.generator == "eller"
+    assert corpus.path(8, 1, "eller") != corpus.path(8, 1, "kruskal")
+    with pytest.raises(ValueError):
+        corpus.get(8, seed=1, generator="prim")
+
+
+def test_generate_matches_cached_maze(tmp_path):
+    corpus = MazeCorpus(tmp_path)
+    for generator in ("kruskal", "eller"):
+        maze = generate(12, 5, generator)
+        assert maze.generator == generator and maze.seed == 5
+        assert bytes(maze.walls) == bytes(corpus.get(12, 5, generator).walls)
+
+
+def test_least_recently_used_mazes_are_evicted(tmp_path):
+    # Each 10x10 maze file is 64 header bytes + 100 wall bytes.
+    corpus = MazeCorpus(tmp_path, max_bytes=2 * 164)
+    corpus.get(10, seed=1)
+    corpus.get(10, seed=2)
+    os.utime(corpus.path(10, 1), (1, 1))
+    os.utime(corpus.path(10, 2), (2, 2))
+    corpus.get(10, seed=1)  # touch: seed 2 is now the least recently used
+    corpus.get(10, seed=3)
+
+    assert os.path.exists(corpus.path(10, 1))
+    assert not os.path.exists(corpus.path(10, 2))
+    assert os.path.exists(corpus.path(10, 3))
+
+
+def test_file_evicted_during_lookup_is_rebuilt(tmp_path, monkeypatch):
+    corpus = MazeCorpus(tmp_path)
+    expected = bytes(corpus.get(10, seed=4).walls)
+    utime = os.utime
+
+    def evict_then_touch(path, *args):
+        os.remove(path)  # another process evicts the file just before the touch
+        utime(path, *args)
+
+    monkeypatch.setattr("maze.corpus.os.utime", evict_then_touch)
+    assert bytes(corpus.get(10, seed=4).walls) == expected
+    assert os.path.exists(corpus.path(10, 4))
+
+
+@pytest.mark.parametrize("umask, mode", [(0o022, 0o644), (0o077, 0o600)])
+def test_cached_files_follow_the_umask(tmp_path, umask, mode):
+    previous = os.umask(umask)
+    try:
+        corpus = MazeCorpus(tmp_path)
+        corpus.get(6, seed=1)
+    finally:
+        os.umask(previous)
+    assert os.stat(corpus.path(6, 1)).st_mode & 0o777 == mode
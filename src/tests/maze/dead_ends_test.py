@@ -0,0 +1,34 @@
+import random
+
+from maze import Maze
+from maze.dead_ends import fill_dead_ends
+from algorithm.search.bfs import BFS
+
+
+def test_perfect_maze_keeps_only_solution_path():
+    maze = Maze(25)
+    maze.generate(seed=4)
+    live = fill_dead_ends(maze)
+    path = BFS(maze).solve()
+    assert {maze.index(r, c) for r, c in path} == {i for i, alive in enumerate(live) if alive}
+
+
+def test_loops_stay_live():
+    random.seed(5)
+    maze = Maze(15)
+    maze.generate()
+    for _ in range(20):
+        r, c = random.randrange(15), random.randrange(14)
+        maze.grid[r][c].walls["right"] = False
+        maze.grid[r][c + 1].walls["left"] = False
+    live = fill_dead_ends(maze)
+    # The shortest route never enters a filled cell.
+    assert all(live[maze.index(r, c)] for r, c in BFS(maze).solve())
+    assert sum(live) > len(BFS(maze).solve())
+
+
+def test_closed_maze_fills_all_but_start_and_goal():
+    maze = Maze(3)
+    live = fill_dead_ends(maze)
+    assert [i for i, alive in enumerate(live) if alive] == [0, 8]
+    assert list(maze.walls) == [15] * 9
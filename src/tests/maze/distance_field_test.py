@@ -0,0 +1,52 @@
+import numpy as np
+
+from maze import Maze, TOP, BOTTOM, LEFT, RIGHT
+from maze.distance_field import distance_field, policy_from_field
+from algorithm.search.bfs import BFS
+from utils.utils import get_path_from_policy
+
+
+def test_distances_match_breadth_first_search(make_loopy_maze):
+    maze = make_loopy_maze(14, 2, height=11)
+    distances, directions = distance_field(maze, [maze.goal])
+    assert distances.shape == directions.shape == (maze.height, maze.width)
+    assert distances.dtype == np.int32
+    expected = maze.adjacency().distances(maze.index(*maze.goal))
+    assert distances.ravel().tolist() == list(expected)
+
+    moves = {TOP: (-1, 0), BOTTOM: (1, 0), LEFT: (0, -1), RIGHT: (0, 1)}
+    for r in range(maze.height):
+        for c in range(maze.width):
+            if (r, c) == maze.goal:
+                assert directions[r, c] == 0
+                continue
+            # Every direction is an open move one step closer to the goal.
+            wall = int(directions[r, c])
+            assert not maze.has_wall(r, c, wall)
+            dr, dc = moves[wall]
+            assert distances[r + dr, c + dc] == distances[r, c] - 1
+
+
+def test_nearest_of_several_sources(make_loopy_maze):
+    maze = make_loopy_maze(12, 7, height=9)
+    sources = [(0, 0), maze.goal, (4, 6)]
+    distances, _ = distance_field(maze, sources)
+    singles = [distance_field(maze, [source])[0] for source in sources]
+    assert np.array_equal(distances, np.minimum.reduce(singles))
+
+
+def test_unreachable_cells():
+    maze = Maze(3)
+    maze.grid[0][0].walls["right"] = False
+    maze.grid[0][1].walls["left"] = False
+    distances, directions = distance_field(maze, [(0, 1)])
+    assert distances[0, 0] == 1 and directions[0, 0] == RIGHT
+    assert (distances[1:] == -1).all() and (directions[1:] == 0).all()
+
+
+def test_policy_from_field_gives_shortest_path(make_loopy_maze):
+    maze = make_loopy_maze(15, 11, height=12)
+    _, directions = distance_field(maze, [maze.goal])
+    path = get_path_from_policy(policy_from_field(directions), maze.start, maze.goal)
+    assert path[-1] == maze.goal
+    assert len(path) == len(BFS(maze).solve())
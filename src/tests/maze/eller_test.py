@@ -0,0 +1,30 @@
+import io
+
+from maze import eller, RIGHT, BOTTOM
+from algorithm.search.bfs import BFS
+
+
+def test_eller_rows_form_perfect_maze():
+    """The streamed rows join every cell with exactly n - 1 passages."""
+    width, height = 17, 9
+    buffer = io.BytesIO()
+    eller.write_rows(buffer, width, height, seed=7)
+    buffer.seek(0)
+    maze = eller.read_rows(buffer, width, height)
+
+    passages = sum(
+        (c < width - 1 and not maze.has_wall(r, c, RIGHT))
+        + (r < height - 1 and not maze.has_wall(r, c, BOTTOM))
+        for r in range(height)
+        for c in range(width)
+    )
+    assert passages == width * height - 1
+    path = BFS(maze).solve()
+    assert path[0] == (0, 0) and path[-1] == (height - 1, width - 1)
+
+
+def test_eller_is_reproducible_and_streams_to_callables():
+    rows = []
+    eller.write_rows(rows.append, 12, 5, seed=3)
+    assert len(rows) == 5 and all(len(row) == 12 for row in rows)
+    assert rows == list(eller.generate_rows(12, 5, seed=3))
@@ -0,0 +1,63 @@
+from maze import Maze
+
+
+def make_corridor_maze() -> Maze:
+    """
+    3x3 maze with one junction at (1, 1):
+
+    (0,0) - (0,1) - (0,2)
+              |
+    (1,0) - (1,1) - (1,2)
+              |
+    (2,0)   (2,1) - (2,2)
+    """
+    maze = Maze(3)
+    for (r, c), side, (nr, nc), other in [
+        ((0, 0), "right", (0, 1), "left"),
+        ((0, 1), "right", (0, 2), "left"),
+        ((0, 1), "bottom", (1, 1), "top"),
+        ((1, 0), "right", (1, 1), "left"),
+        ((1, 1), "right", (1, 2), "left"),
+        ((1, 1), "bottom", (2, 1), "top"),
+        ((2, 1), "right", (2, 2), "left"),
+        ((2, 0), "top", (1, 0), "bottom"),
+    ]:
+        maze.grid[r][c].walls[side] = False
+        maze.grid[nr][nc].walls[other] = False
+    return maze
+
+
+def test_junction_graph_contracts_corridors():
+    maze = make_corridor_maze()
+    graph = maze.junction_graph()
+    # Junctions and dead ends are nodes; (1, 0) and (2, 1) are corridor cells.
+    nodes = {graph.coordinate(node) for node in range(len(graph))}
+    assert nodes == {(0, 0), (0, 1), (0, 2), (1, 1), (1, 2), (2, 0), (2, 2)}
+
+    # Every cell lies on exactly one edge or is a node.
+    covered = set(graph.cells) | set(graph.corridor_cells)
+    assert covered == set(range(9))
+    for node in range(len(graph)):
+        for other, length, edge in graph.neighbours(node):
+            corridor = graph.corridor(edge, node)
+            assert corridor[0] == graph.cells[node] and corridor[-1] == graph.cells[other]
+            assert len(corridor) == length + 1
+
+    path = graph.expand_path([graph.node_of[4], graph.goal], [
+        edge for other, _, edge in graph.neighbours(graph.node_of[4]) if other == graph.goal
+    ])
+    assert path == [(1, 1), (2, 1), (2, 2)]
+
+
+def test_junction_graph_is_cached_until_walls_change():
+    maze = Maze(10)
+    maze.generate(seed=3)
+    graph = maze.junction_graph()
+    assert maze.junction_graph() is graph
+
+    maze.grid[0][0].walls["right"] = not maze.grid[0][0].walls["right"]
+    assert maze.junction_graph() is not graph
+
+    graph = maze.junction_graph()
+    maze.goal = (5, 5)
+    assert maze.junction_graph().goal_cell == 55
@@ -0,0 +1,135 @@
+import pytest
+
+from maze import Cell, Maze, WallChange, TOP, RIGHT, BOTTOM, LEFT, ALL_WALLS
+from maze.disjoint_set import DisjointSet
+from algorithm.search.bfs import BFS
+
+
+def count_passages(maze: Maze) -> int:
+    """Count open passages, each shared wall counted once."""
+    passages = 0
+    for r in range(maze.height):
+        for c in range(maze.width):
+            if c < maze.width - 1 and not maze.has_wall(r, c, RIGHT):
+                passages += 1
+            if r < maze.height - 1 and not maze.has_wall(r, c, BOTTOM):
+                passages += 1
+    return passages
+
+
+def test_new_maze_has_all_walls():
+    """Every cell of a fresh maze starts with all four walls closed."""
+    maze = Maze(3)
+    assert len(maze.walls) == 9
+    assert all(cell_walls == ALL_WALLS for cell_walls in maze.walls)
+
+
+def test_grid_view_reads_and_writes_packed_walls():
+    """grid[r][c].walls is a live view over the packed wall array."""
+    maze = Maze(2)
+    maze.grid[0][1].walls["left"] = False
+    assert maze.walls[1] == ALL_WALLS & ~LEFT
+    assert maze.grid[0][1].walls == {"top": True, "right": True, "bottom": True, "left": False}
+    maze.set_wall(maze.index(1, 1), TOP, False)
+    assert maze.grid[-1][-1].walls["top"] is False
+
+
+def test_cell_without_maze_keeps_its_own_walls():
+    cell = Cell(2, 3)
+    assert (cell.x, cell.y) == (2, 3)
+    assert cell.walls == {"top": True, "right": True, "bottom": True, "left": True}
+    cell.walls["left"] = False
+    assert cell.walls["left"] is False and Cell(2, 3).walls["left"] is True
+
+
+def test_generate_builds_perfect_maze():
+    """Kruskal's algorithm yields a spanning tree with consistent shared walls."""
+    maze = Maze(12)
+    maze.generate()
+    assert count_passages(maze) == maze.width * maze.height - 1
+    for r in range(maze.height):
+        for c in range(maze.width - 1):
+            assert maze.has_wall(r, c, RIGHT) == maze.has_wall(r, c + 1, LEFT)
+    for r in range(maze.height - 1):
+        for c in range(maze.width):
+            assert maze.has_wall(r, c, BOTTOM) == maze.has_wall(r + 1, c, TOP)
+    path = BFS(maze).solve()
+    assert path[0] == (0, 0) and path[-1] == (11, 11)
+
+
+def test_disjoint_set_handles_long_chains():
+    """find stays iterative, so a long parent chain cannot hit the recursion limit."""
+    n = 50_000
+    sets = DisjointSet(n)
+    # Build the worst case by hand: a single chain 0 -> 1 -> ... -> n-1.
+    for i in range(n - 1):
+        sets.parent[i] = i + 1
+    assert sets.find(0) == n - 1
+    assert sets.union(0, n - 1) is False
+
+    other = DisjointSet(3)
+    assert other.union(0, 1) is True
+    assert other.find(1) == other.find(0) != other.find(2)
+
+
+def test_adjacency_lists_open_neighbours_in_search_order():
+    maze = Maze(9, height=6)
+    maze.generate(seed=17)
+    adjacency = maze.adjacency()
+    assert maze.adjacency() is adjacency
+    moves = [(-1, 0, TOP), (1, 0, BOTTOM), (0, -1, LEFT), (0, 1, RIGHT)]
+    for r in range(maze.height):
+        for c in range(maze.width):
+            cell = maze.index(r, c)
+            expected = [
+                maze.index(r + dr, c + dc) for dr, dc, wall in moves
+                if 0 <= r + dr < maze.height and 0 <= c + dc < maze.width and not maze.has_wall(r, c, wall)
+            ]
+            assert list(adjacency.neighbours[adjacency.offsets[cell]:adjacency.offsets[cell + 1]]) == expected
+
+    maze.grid[0][0].walls["right"] = not maze.grid[0][0].walls["right"]
+    assert maze.adjacency() is not adjacency
+
+
+def test_open_and_close_wall_update_both_cells_and_log_changes():
+    maze = Maze(3)
+    maze.generate(seed=2)
+    adjacency = maze.adjacency()
+    maze.close_wall(1, 1, "right")
+    assert maze.has_wall(1, 1, RIGHT) and maze.has_wall(1, 2, LEFT)
+    assert maze.adjacency() is not adjacency
+    maze.open_wall(1, 1, TOP)
+    assert not maze.has_wall(1, 1, TOP) and not maze.has_wall(0, 1, BOTTOM)
+    assert maze.changes == [
+        WallChange(maze.index(1, 1), maze.index(1, 2), True),
+        WallChange(maze.index(1, 1), maze.index(0, 1), False),
+    ]
+    with pytest.raises(ValueError):
+        maze.open_wall(0, 0, "left")
+    changes = maze.changes
+    maze.generate(seed=3)
+    assert maze.changes == [] and maze.changes is not changes
+
+
+def test_generate_twice_matches_generating_once(tmp_path):
+    """generate() closes every wall first, so regenerating never leaves loops."""
+    once = Maze(10)
+    once.generate(seed=5)
+    twice = Maze(10)
+    twice.generate(seed=9)
+    twice.generate(seed=5)
+    assert bytes(twice.walls) == bytes(once.walls)
+
+    once.save(tmp_path / "maze.bin")
+    loaded = Maze.load(tmp_path / "maze.bin")
+    loaded.generate(seed=9)
+    assert count_passages(loaded) == loaded.width * loaded.height - 1
+
+
+def test_negative_seed_is_deterministic_and_distinct():
+    a, b, c = Maze(8), Maze(8), Maze(8)
+    a.generate(seed=-3)
+    b.generate(seed=-3)
+    c.generate(seed=3)
+    assert bytes(a.walls) == bytes(b.walls) != bytes(c.walls)
+    assert count_passages(a) == 63
@@ -0,0 +1,57 @@
+import pytest
+
+from maze import Maze, eller, RIGHT
+from algorithm.search.bfs import BFS
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_save_and_load_round_trip(tmp_path, use_mmap):
+    maze = Maze(9)
+    maze.generate()
+    maze.seed = 1234
+    maze.save(tmp_path / "maze.bin")
+
+    loaded = Maze.load(tmp_path / "maze.bin", use_mmap=use_mmap)
+    assert (loaded.width, loaded.height) == (9, 9)
+    assert bytes(loaded.walls) == bytes(maze.walls)
+    assert (loaded.seed, loaded.generator) == (1234, "kruskal")
+    assert (loaded.start, loaded.goal) == ((0, 0), (8, 8))
+    assert BFS(loaded).solve() == BFS(maze).solve()
+
+
+def test_mapped_maze_edits_stay_in_memory(tmp_path):
+    """Mazes are mapped copy-on-write, so editing walls never rewrites the file."""
+    eller.write_file(tmp_path / "eller.bin", 6, 4, seed=2)
+    maze = Maze.load(tmp_path / "eller.bin")
+    assert (maze.width, maze.height, maze.generator, maze.seed) == (6, 4, "eller", 2)
+
+    original = maze.has_wall(0, 0, RIGHT)
+    maze.set_wall(0, RIGHT, not original)
+    assert maze.has_wall(0, 0, RIGHT) is not original
+    assert Maze.load(tmp_path / "eller.bin").has_wall(0, 0, RIGHT) is original
+
+
+def test_load_rejects_other_files(tmp_path):
+    (tmp_path / "bogus.bin").write_bytes(b"not a maze" * 10)
+    with pytest.raises(ValueError):
+        Maze.load(tmp_path / "bogus.bin")
+
+
+def test_negative_seed_round_trips(tmp_path):
+    maze = Maze(4)
+    maze.generate(seed=-7)
+    maze.save(tmp_path / "maze.bin")
+    assert Maze.load(tmp_path / "maze.bin").seed == -7
+
+
+@pytest.mark.parametrize("seed, generator", [
+    (2**63, "kruskal"),
+    (-2**63 - 1, "kruskal"),
+    (1, "a-generator-name-too-long"),
+    (1, "krüskal"),
+])
+def test_save_rejects_header_fields_that_do_not_fit(tmp_path, seed, generator):
+    maze = Maze(3)
+    maze.seed, maze.generator = seed, generator
+    with pytest.raises(ValueError):
+        maze.save(tmp_path / "maze.bin")
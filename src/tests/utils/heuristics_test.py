@@ -0,0 +1,51 @@
+from maze import Maze
+from utils.heuristics import Heuristic, LandmarkHeuristic
+
+
+def _open_loops(maze: Maze) -> None:
+    """Open a few extra walls so the maze has several routes between cells."""
+    for r in range(1, maze.height - 1, 4):
+        maze.grid[r][3].walls["right"] = False
+        maze.grid[r][4].walls["left"] = False
+
+
+def test_manhattan_estimates_match_manhattan_heuristic():
+    maze = Maze(5, height=3)
+    goal = maze.index(1, 3)
+    estimates = Heuristic().estimates(maze, goal)
+    for r in range(maze.height):
+        for c in range(maze.width):
+            assert estimates[maze.index(r, c)] == abs(r - 1) + abs(c - 3)
+
+
+def test_landmark_estimates_are_admissible_and_consistent():
+    maze = Maze(12, height=9)
+    maze.generate(seed=4)
+    _open_loops(maze)
+    landmarks = LandmarkHeuristic(maze, count=3)
+    assert len(landmarks.landmarks) == len(set(landmarks.landmarks)) == 3
+    assert landmarks.landmarks[0] == 0
+
+    adjacency = maze.adjacency()
+    goal = maze.index(5, 7)
+    exact = adjacency.distances(goal)
+    estimates = landmarks.estimates(maze, goal)
+    for cell in range(adjacency.size):
+        assert 0 <= estimates[cell] <= exact[cell]
+        assert estimates[cell] == landmarks.estimate(cell, goal)
+        for neighbour in adjacency.neighbours[adjacency.offsets[cell]:adjacency.offsets[cell + 1]]:
+            assert estimates[cell] <= estimates[neighbour] + 1
+    assert estimates[goal] == 0
+    # The distances from a landmark to every cell are exact.
+    for landmark in landmarks.landmarks:
+        assert estimates[landmark] == exact[landmark]
+
+
+def test_landmarks_are_cached_per_maze():
+    maze = Maze(6)
+    maze.generate(seed=1)
+    landmarks = LandmarkHeuristic.for_maze(maze, 2)
+    assert LandmarkHeuristic.for_maze(maze, 2) is landmarks
+    assert LandmarkHeuristic.for_maze(maze, 3) is not landmarks
+    maze.grid[0][0].walls["right"] = not maze.grid[0][0].walls["right"]
+    assert LandmarkHeuristic.for_maze(maze, 2) is not landmarks
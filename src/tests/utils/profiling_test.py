@@ -0,0 +1,50 @@
+import resource
+import tracemalloc
+
+from utils import profiling
+from utils.profiling import MemoryProfile, peak_rss_kb, reset_peak_rss
+
+
+def test_traced_peak_grows_with_a_known_allocation():
+    with MemoryProfile() as small:
+        pass
+    with MemoryProfile() as large:
+        block = bytearray(4 * 1024 * 1024)
+        del block
+    assert large.peak_traced_kb >= 4096
+    assert large.peak_traced_kb > small.peak_traced_kb
+    assert large.peak_rss_kb > 0
+    # The profile started tracing, so it stops it again.
+    assert not tracemalloc.is_tracing()
+
+
+def test_top_allocations_only_filled_when_requested():
+    with MemoryProfile() as plain:
+        kept = [bytearray(1024) for _ in range(100)]
+    assert plain.top_allocations == []
+
+    with MemoryProfile(top=3) as profile:
+        kept = [bytearray(1024) for _ in range(100)]
+    assert 0 < len(profile.top_allocations) <= 3
+    assert any("profiling_test.py" in line for line in profile.top_allocations)
+    del kept
+
+
+def test_profile_leaves_outer_tracing_running():
+    tracemalloc.start()
+    try:
+        with MemoryProfile():
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_peak_rss_falls_back_to_getrusage_without_proc(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "_STATUS", str(tmp_path / "missing" / "status"))
+    monkeypatch.setattr(profiling, "_CLEAR_REFS", str(tmp_path / "missing" / "clear_refs"))
+    assert peak_rss_kb() == resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    assert reset_peak_rss() is False
+    with MemoryProfile() as profile:
+        pass
+    assert profile.peak_rss_kb > 0
@@ -0,0 +1,73 @@
+import csv
+import json
+
+import pytest
+
+from utils.results import ResultLog, job_key, manifest_path, merge_logs, read_log
+
+FIELDS = ["Algorithm", "Trial", "Execution_Time"]
+
+
+def _rows(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_resume_skips_finished_jobs_and_drops_unrecorded_rows(tmp_path):
+    path = str(tmp_path / "results.csv")
+    with ResultLog(path, FIELDS) as log:
+        log.write("a", {"Algorithm": "bfs", "Trial": 0, "Execution_Time": "0.1"})
+        log.write("b", {"Algorithm": "dfs", "Trial": 0, "Execution_Time": "0.2"})
+    # A crash after a row was written but before its manifest line was complete.
+    with open(path, "a", newline="") as f:
+        f.write("astar,0,0.3\r\n")
+    with open(manifest_path(path), "a") as f:
+        f.write('{"key": "c", "en')
+
+    with ResultLog(path, FIELDS, resume=True) as log:
+        assert log.done == {"a", "b"}
+        log.write("c", {"Algorithm": "astar", "Trial": 0, "Execution_Time": "0.4"})
+
+    assert [row["Execution_Time"] for row in _rows(path)] == ["0.1", "0.2", "0.4"]
+    assert [key for key, _ in read_log(path)[1]] == ["a", "b", "c"]
+
+
+def test_without_resume_starts_afresh(tmp_path):
+    path = str(tmp_path / "results.csv")
+    with ResultLog(path, FIELDS) as log:
+        log.write("a", {"Algorithm": "bfs", "Trial": 0, "Execution_Time": "0.1"})
+    with ResultLog(path, FIELDS) as log:
+        assert not log.done
+    assert _rows(path) == []
+
+
+def test_resume_rejects_other_columns(tmp_path):
+    path = str(tmp_path / "results.csv")
+    with ResultLog(path, FIELDS) as log:
+        log.write("a", {"Algorithm": "bfs", "Trial": 0, "Execution_Time": "0.1"})
+    with pytest.raises(ValueError):
+        ResultLog(path, FIELDS + ["Sweeps"], resume=True)
+
+
+def test_merge_keeps_first_row_per_job_and_all_columns(tmp_path):
+    first, second, merged = (str(tmp_path / name) for name in ("a.csv", "b.csv", "merged.csv"))
+    with ResultLog(first, FIELDS) as log:
+        log.write("a", {"Algorithm": "bfs", "Trial": 0, "Execution_Time": "0.1"})
+        log.write("b", {"Algorithm": "dfs", "Trial": 0, "Execution_Time": "0.2"})
+    with ResultLog(second, FIELDS + ["Sweeps"]) as log:
+        log.write("b", {"Algorithm": "dfs", "Trial": 0, "Execution_Time": "9.9"})
+        log.write("c", {"Algorithm": "vi", "Trial": 0, "Execution_Time": "0.3", "Sweeps": 12})
+
+    assert merge_logs([first, second], merged) == 3
+    columns, rows = read_log(merged)
+    assert columns == FIELDS + ["Sweeps"]
+    assert [(key, row["Execution_Time"], row["Sweeps"]) for key, row in rows] == [
+        ("a", "0.1", ""), ("b", "0.2", ""), ("c", "0.3", "12"),
+    ]
+
+
+def test_job_key_ignores_argument_order():
+    assert job_key(size=10, params={"gamma": 0.9, "max_iter": 5}) == job_key(
+        params={"max_iter": 5, "gamma": 0.9}, size=10
+    )
+    assert json.loads(job_key(size=10))["size"] == 10
@@ -1,3 +1,4 @@
 
 from .visualizer import Visualizer
-from .heuristics import Heuristic 
+from .heuristics import Heuristic, LandmarkHeuristic
+from .stats import SearchStats, MDPStats
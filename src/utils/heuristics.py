@@ -1,5 +1,9 @@
-from typing import Tuple
+from array import array
+from typing import List, Tuple
 
+import numpy as np
+
+from maze.distance_field import distance_field
 from utils.types import CoordinateType
 
 
@@ -18,3 +22,68 @@ class Heuristic:
         a, b: coordinates of the maze
         """
         return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def estimates(self, maze, goal: int) -> array:
+        """Manhattan distance from every cell (flat row-major id) to the goal cell."""
+        goal_r, goal_c = divmod(goal, maze.width)
+        rows = np.abs(np.arange(maze.height, dtype=np.int32) - goal_r)
+        cols = np.abs(np.arange(maze.width, dtype=np.int32) - goal_c)
+        return array("i", (rows[:, None] + cols[None, :]).tobytes())
+
+
+class LandmarkHeuristic:
+    """
+    ALT heuristic (A*, landmarks, triangle inequality) for one maze.
+
+    Exact distances (see maze/distance_field.py) from a few landmark cells are computed once. For any
+    landmark L, |d(L, goal) - d(L, v)| is a lower bound on d(v, goal), so the
+    largest bound over the landmarks is an admissible and consistent estimate.
+    In a maze it is far tighter than the Manhattan distance, which ignores
+    the walls.
+
+    The first landmark is the top-left corner; every further one is the cell
+    farthest from the landmarks chosen so far (farthest-point selection),
+    which spreads them over the ends of the maze's long corridors. The tables
+    take count * N int32 values. Use ``LandmarkHeuristic.for_maze`` to share
+    them between every A* query on the same maze.
+    """
+
+    def __init__(self, maze, count: int = 4) -> None:
+        if count < 1:
+            raise ValueError("At least one landmark is needed")
+        size = maze.width * maze.height
+        self.landmarks: List[int] = []
+        rows = []
+        # Distance to the nearest chosen landmark, -1 where none reaches.
+        nearest = None
+        landmark = 0
+        while len(self.landmarks) < min(count, size):
+            self.landmarks.append(landmark)
+            distance = distance_field(maze, [divmod(landmark, maze.width)])[0].ravel()
+            rows.append(distance)
+            nearest = distance if nearest is None else np.where(
+                (nearest < 0) | ((distance >= 0) & (distance < nearest)), distance, nearest
+            )
+            # Cells no landmark reaches come first, so every component gets one.
+            landmark = int(np.argmax(np.where(nearest < 0, size, nearest)))
+        self.distances: np.ndarray = np.stack(rows)
+
+    @classmethod
+    def for_maze(cls, maze, count: int = 4) -> "LandmarkHeuristic":
+        """The landmarks of a maze, built on first use and cached until its walls change."""
+        return maze.cached(f"landmarks_{count}", lambda: cls(maze, count))
+
+    def estimate(self, cell: int, goal: int) -> int:
+        """Lower bound on the moves from cell to goal (flat row-major ids)."""
+        return int(self._bounds(self.distances[:, cell], self.distances[:, goal]).max())
+
+    def estimates(self, maze, goal: int) -> array:
+        """Lower bound on the moves from every cell to the goal cell."""
+        bounds = self._bounds(self.distances, self.distances[:, goal, None])
+        return array("i", bounds.max(axis=0).astype(np.int32).tobytes())
+
+    @staticmethod
+    def _bounds(cell_distances: np.ndarray, goal_distances: np.ndarray) -> np.ndarray:
+        # A landmark that misses the cell or the goal gives no bound.
+        known = (cell_distances >= 0) & (goal_distances >= 0)
+        return np.where(known, np.abs(cell_distances - goal_distances), 0)
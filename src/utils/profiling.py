@@ -0,0 +1,83 @@
+import resource
+import tracemalloc
+from typing import List, Optional
+
+_STATUS = "/proc/self/status"
+_CLEAR_REFS = "/proc/self/clear_refs"
+
+
+def peak_rss_kb() -> int:
+    """
+    Peak resident set size of this process in KiB.
+    Reads VmHWM on Linux, which reset_peak_rss can lower again; elsewhere
+    falls back to getrusage, which only ever grows.
+    """
+    try:
+        with open(_STATUS) as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the peak RSS to the current RSS so the next reading covers only
+    what runs afterwards. Best effort: returns False where the kernel does
+    not allow it, and peak_rss_kb then reports the peak since process start.
+    """
+    try:
+        with open(_CLEAR_REFS, "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class MemoryProfile:
+    """
+    Context manager measuring the peak memory of the code it wraps.
+
+    - peak_traced_kb: peak of Python allocations traced by tracemalloc.
+    - peak_rss_kb: peak resident set size of the whole process.
+    - top_allocations: with top > 0, the largest allocation sites (by line)
+      still alive when the block exits, formatted by tracemalloc.
+
+    Tracing slows allocation-heavy code down, so timings taken inside a
+    profiled block are inflated.
+    """
+
+    def __init__(self, top: int = 0) -> None:
+        self.top = top
+        self.peak_traced_kb: float = 0.0
+        self.peak_rss_kb: int = 0
+        self.top_allocations: List[str] = []
+        self._started: bool = False
+
+    def __enter__(self) -> "MemoryProfile":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> Optional[bool]:
+        self.stop()
+        return None
+
+    def start(self) -> None:
+        reset_peak_rss()
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+    def stop(self) -> None:
+        self.peak_traced_kb = tracemalloc.get_traced_memory()[1] / 1024
+        self.peak_rss_kb = peak_rss_kb()
+        if self.top > 0:
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__)]
+            )
+            self.top_allocations = [str(stat) for stat in snapshot.statistics("lineno")[: self.top]]
+        if self._started:
+            tracemalloc.stop()
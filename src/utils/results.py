@@ -0,0 +1,142 @@
+import csv
+import json
+import os
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+MANIFEST_SUFFIX = ".manifest"
+
+
+def manifest_path(path: str) -> str:
+    """Path of the manifest kept next to a results CSV."""
+    return path + MANIFEST_SUFFIX
+
+
+def read_manifest(path: str) -> List[Tuple[str, int]]:
+    """
+    (key, end offset) of every finished job recorded for a results CSV, in
+    the order they were written; [] when there is no manifest. A last line
+    cut short by a crash is ignored.
+    """
+    entries = []
+    try:
+        with open(manifest_path(path)) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                entries.append((entry["key"], entry["end"]))
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+class ResultLog:
+    """
+    Results CSV that survives crashes, written one finished job at a time.
+
+    Each row is flushed and fsynced as soon as it is written, and then the
+    job's key and the CSV's length after its row are appended to a manifest
+    next to the CSV (``<path>.manifest``, one JSON object per line), also
+    fsynced. A job counts as finished once its manifest line is on disk.
+
+    With resume, an existing CSV is cut back to the end of the last finished
+    job, dropping a row whose manifest line never made it, and new rows are
+    appended; ``done`` holds the keys to skip. Without it both files are
+    started afresh. Use it as a context manager to close both files.
+    """
+
+    def __init__(self, path: str, fieldnames: Sequence[str], resume: bool = False) -> None:
+        self.path = path
+        self.fieldnames: List[str] = list(fieldnames)
+        entries = read_manifest(path) if resume and os.path.exists(path) else []
+        self.done: Set[str] = {key for key, _ in entries}
+
+        if entries:
+            with open(path, newline="") as f:
+                header = next(csv.reader(f), [])
+            if header != self.fieldnames:
+                raise ValueError(
+                    f"{path} has columns {header}, not {self.fieldnames}; "
+                    "resume with the options of the original run"
+                )
+            self._file = open(path, "r+", newline="")
+            self._file.truncate(entries[-1][1])
+            self._file.seek(entries[-1][1])
+            self._manifest = open(manifest_path(path), "r+")
+            self._manifest.truncate(sum(len(self._manifest_line(*entry)) for entry in entries))
+            self._manifest.seek(0, os.SEEK_END)
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, restval="")
+        else:
+            self._file = open(path, "w", newline="")
+            self._manifest = open(manifest_path(path), "w")
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, restval="")
+            self._writer.writeheader()
+            self._sync(self._file)
+
+    @staticmethod
+    def _manifest_line(key: str, end: int) -> str:
+        return json.dumps({"key": key, "end": end}) + "\n"
+
+    @staticmethod
+    def _sync(f) -> None:
+        f.flush()
+        os.fsync(f.fileno())
+
+    def write(self, key: str, row: Dict) -> None:
+        """Durably append one finished job's row and record it as done."""
+        self._writer.writerow(row)
+        self._sync(self._file)
+        self._manifest.write(self._manifest_line(key, self._file.tell()))
+        self._sync(self._manifest)
+        self.done.add(key)
+
+    def close(self) -> None:
+        self._file.close()
+        self._manifest.close()
+
+    def __enter__(self) -> "ResultLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_log(path: str) -> Tuple[List[str], List[Tuple[str, Dict]]]:
+    """
+    Columns and (key, row) pairs of the finished jobs of a results CSV. Rows
+    after the last manifest entry belong to no finished job and are left out.
+    """
+    entries = read_manifest(path)
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        rows = [row for row, _ in zip(reader, entries)]
+        fieldnames = list(reader.fieldnames or [])
+    return fieldnames, [(key, row) for (key, _), row in zip(entries, rows)]
+
+
+def merge_logs(paths: Iterable[str], output: str) -> int:
+    """
+    Merge the results CSVs of separate runs (e.g. --shard runs) into a new
+    results CSV with its own manifest. Shards are taken in the given order
+    and a job finished in several of them keeps its first row. The columns
+    are those of all shards, in order of first appearance. Returns the
+    number of rows written.
+    """
+    fieldnames: List[str] = []
+    merged: Dict[str, Dict] = {}
+    for path in paths:
+        columns, rows = read_log(path)
+        fieldnames += [name for name in columns if name not in fieldnames]
+        for key, row in rows:
+            merged.setdefault(key, row)
+    with ResultLog(output, fieldnames) as log:
+        for key, row in merged.items():
+            log.write(key, row)
+    return len(merged)
+
+
+def job_key(**fields) -> str:
+    """Canonical JSON key of a job from the fields that determine its result."""
+    return json.dumps(fields, sort_keys=True, default=str)
+
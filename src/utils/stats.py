@@ -0,0 +1,43 @@
+from typing import Dict
+
+
+class SearchStats:
+    """
+    Counters filled in by the search solvers when passed as ``stats``.
+
+    - nodes_expanded: nodes popped from the frontier whose neighbours were examined.
+    - nodes_generated: nodes added to the frontier, the start included.
+    - peak_frontier: largest frontier (queue, stack or open list) size.
+    - peak_came_from: largest number of predecessor entries kept.
+    """
+
+    def __init__(self) -> None:
+        self.nodes_expanded: int = 0
+        self.nodes_generated: int = 0
+        self.peak_frontier: int = 0
+        self.peak_came_from: int = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(vars(self))
+
+
+class MDPStats:
+    """
+    Counters filled in by the MDP solvers when passed as ``stats``.
+
+    - sweeps: passes over the state space (value iteration sweeps, or policy
+      evaluation passes for policy iteration).
+    - backups: Bellman backups of single states, policy improvement included.
+    - evaluation_rounds / improvement_rounds: policy iteration phases run.
+    - final_delta: largest value change in the last sweep.
+    """
+
+    def __init__(self) -> None:
+        self.sweeps: int = 0
+        self.backups: int = 0
+        self.evaluation_rounds: int = 0
+        self.improvement_rounds: int = 0
+        self.final_delta: float = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(vars(self))
@@ -1,5 +1,5 @@
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from utils.types import CoordinateType
 
@@ -17,17 +17,41 @@ def reconstruct_path(
     path.reverse()
     return path
 
+def reconstruct_index_path(
+    came_from: Sequence[int],
+    start: int,
+    goal: int,
+    width: int,
+) -> List[Tuple[int, int]]:
+    """
+    Build the (row, col) path from flat cell ids, where came_from[i] is the
+    predecessor id of cell i. Ids are only converted here, once per path cell.
+    """
+    path = [goal]
+    current = goal
+    while current != start:
+        current = came_from[current]
+        path.append(current)
+    path.reverse()
+    return [divmod(cell, width) for cell in path]
+
 def get_path_from_policy(
     policy: Dict[CoordinateType, Optional[CoordinateType]],
     start: CoordinateType,
     goal: CoordinateType,
+    max_steps: Optional[int] = None,
 ) -> List[CoordinateType]:
     """
     Given a policy, return the path from start to goal, avoiding cycles.
+
+    A cycle-free path visits each state at most once, so by default at most
+    len(policy) steps are followed. Pass the number of states the solver
+    updated (e.g. the live cells after dead-end filling) for a tighter bound.
     """
     path = [start]
     current = start
-    max_steps = 1000  # Increased for larger mazes
+    if max_steps is None:
+        max_steps = len(policy)
     steps = 0
     visited = set()  # Track visited states to detect cycles
 
@@ -1,6 +1,7 @@
 from typing import Optional, List, Tuple
 import matplotlib.pyplot as plt
-from maze import Maze
+import numpy as np
+from maze import Maze, TOP, BOTTOM, LEFT, RIGHT
 
 class Visualizer:
     def __init__(self, maze: Maze) -> None:
@@ -8,48 +9,59 @@ class Visualizer:
         Initialize the visualizer with a maze.
         The maze should have:
           - maze.height and maze.width for dimensions.
-          - maze.grid as a 2D list of cells, where each cell has a 'walls' dict.
-            The walls dict should have keys: 'top', 'right', 'bottom', 'left'
-            with a Boolean indicating whether the wall is closed (True) or open (False).
+          - maze.walls as a flat row-major array with one byte per cell, where the
+            TOP, RIGHT, BOTTOM and LEFT bits are set when that wall is closed.
           - This is basically an instance of the Maze class in maze/maze.py
         """
         self.maze: Maze = maze
 
-    def visualize(self, path: Optional[List[Tuple[int, int]]] = None) -> None:
+    def visualize(
+        self,
+        path: Optional[List[Tuple[int, int]]] = None,
+        heatmap: Optional[np.ndarray] = None,
+    ) -> None:
         """
         Draws the maze using matplotlib.
         
         Parameters:
             path (optional): A list of (row, col) tuples representing the solution
                              path. If provided, the path is drawn in red.
+            heatmap (optional): A (height, width) array shading every cell, e.g.
+                             the distances from maze.distance_field. Negative
+                             entries (unreachable cells) are left blank.
         """
         _, ax = plt.subplots(figsize=(6, 6))
         height: int = self.maze.height
         width: int = self.maze.width
 
+        if heatmap is not None:
+            shades = np.ma.masked_less(np.asarray(heatmap), 0)
+            image = ax.imshow(shades, cmap="viridis", extent=(0, width, height, 0), interpolation="nearest")
+            plt.colorbar(image, ax=ax, fraction=0.046, pad=0.04)
+
         # Iterate over each cell in the maze grid.
         for r in range(height):
             for c in range(width):
-                cell = self.maze.grid[r][c]
+                cell_walls: int = self.maze.walls[r * width + c]
                 x: int = c
                 y: int = r
 
                 # Draw walls
-                if cell.walls.get("top", True):
+                if cell_walls & TOP:
                     ax.plot([x, x + 1], [y, y], color="black")
-                if cell.walls.get("bottom", True):
+                if cell_walls & BOTTOM:
                     ax.plot([x, x + 1], [y + 1, y + 1], color="black")
-                if cell.walls.get("left", True):
+                if cell_walls & LEFT:
                     ax.plot([x, x], [y, y + 1], color="black")
-                if cell.walls.get("right", True):
+                if cell_walls & RIGHT:
                     ax.plot([x + 1, x + 1], [y, y + 1], color="black")
 
         # Mark the entry (start) in green
-        start_x, start_y = 0, 0
+        start_y, start_x = self.maze.start
         ax.scatter(start_x + 0.5, start_y + 0.5, color="green", s=200, label="Entry (Start)")
 
         # Mark the exit (goal) in blue
-        goal_x, goal_y = width - 1, height - 1
+        goal_y, goal_x = self.maze.goal
         ax.scatter(goal_x + 0.5, goal_y + 0.5, color="blue", s=200, label="Exit (Goal)")
 
         # Optionally draw the solution path, if provided.